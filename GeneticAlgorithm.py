@@ -1,13 +1,28 @@
 from traits import GeneticTraits
 from config import GameConfig
-from mafia import MafiaGame
-from modules import random,copy
+from evaluation import create_game,play_games,timed_play_games,make_executor
+from modules import random,copy,time
+from concurrent.futures import wait,FIRST_COMPLETED,TimeoutError as FuturesTimeout
+from scheduler import RoleStratifiedScheduler
+from surrogate import SurrogateModel
+from diversity import population_diversity,EarlyStopping
+from opponent_pool import OpponentPool,EvaluationStore,evaluate_against_pool
+from ratings import RatingSystem
+from archive import GenomeArchive
+from telemetry import RunTelemetry
+from budget import TimeBudget
+from mafia import DeadlineExceeded
 
 
 class GeneticAlgorithm:
     """Handles the evolution of player strategies using genetic algorithms"""
     def __init__(self, population_size=40, num_players=8, elitism_rate=0.2,
-                 mutation_rate=0.1, mutation_strength=0.2, tournament_size=3):
+                 mutation_rate=0.1, mutation_strength=0.2, tournament_size=3,
+                 scheduler: RoleStratifiedScheduler = None, surrogate: SurrogateModel = None,
+                 early_stopping: EarlyStopping = None, opponent_pool: OpponentPool = None,
+                 evaluation_store: EvaluationStore = None, rating_system: RatingSystem = None,
+                 backend='serial', workers=None, archive: GenomeArchive = None,
+                 telemetry: RunTelemetry = None, time_budget: TimeBudget = None, verbose=True):
         self.population_size = population_size
         self.num_players = num_players
         self.elitism_rate = elitism_rate
@@ -15,44 +30,366 @@ class GeneticAlgorithm:
         self.mutation_strength = mutation_strength
         self.tournament_size = tournament_size
         
+        # Print per-generation progress
+        self.verbose = verbose
+        
+        # Optional seating scheduler - None keeps fixed contiguous tables
+        self.scheduler = scheduler
+        
+        # Optional surrogate model used to pre-screen offspring
+        self.surrogate = surrogate
+        self.surrogate_predictions = {}
+        self.surrogate_history = []
+        
+        # Optional convergence policy checked after every generation
+        self.early_stopping = early_stopping
+        
+        # Optional fixed opponents to score against instead of each other, with a result store
+        self.opponent_pool = opponent_pool
+        self.evaluation_store = evaluation_store
+        
+        # Optional skill ratings updated after every game and kept across generations
+        self.rating_system = rating_system
+        
+        # How table games are run: 'serial' in this thread on the global random stream,
+        # or seeded batches on a 'threads' or 'processes' pool of workers
+        if backend not in ('serial', 'threads', 'processes'):
+            raise ValueError(f"Unknown evaluation backend: {backend}")
+        # Pool, rated and scheduled evaluation always play serially
+        if backend != 'serial' and (opponent_pool or rating_system or scheduler):
+            raise ValueError(f"The {backend} backend only plays contiguous tables, not opponent pool, "
+                             f"rated or scheduled evaluation")
+        self.backend = backend
+        self.workers = workers
+        self._executor = None
+        
+        # Optional archive every evaluated generation is appended to
+        self.archive = archive
+        
+        # Optional live exporter of games played, throughput and progress
+        self.telemetry = telemetry
+        
+        # Optional wall-clock budget that sets games per individual and ends the run in time
+        self.time_budget = time_budget
+        self._deadline = None
+        
         # Initialize population
         self.population = [GeneticTraits() for _ in range(population_size)]
         
+        # Lineage of the current population: parent indices in the previous one, and elite copies
+        self.parents = [(-1, -1)] * population_size
+        self.elites = [False] * population_size
+        
         # Track generations and fitness
         self.generation = 0
         self.best_fitness_history = []
         self.avg_fitness_history = []
+        self.evaluation_rate_history = []
+        self.diversity_history = []
         
     def evolve(self, num_generations=50, games_per_individual=5, game_config=None):
-        """Run the genetic algorithm for a specified number of generations"""
+        """
+        Run the genetic algorithm for a specified number of generations.
+        
+        With a time budget, num_generations and games_per_individual are upper
+        bounds the budget chooses within. A generation cut off by the deadline
+        is discarded, and a run the budget ends returns the last evaluated
+        population, ordered best first, instead of its unevaluated offspring,
+        with the histories of the completed generations.
+        """
         if not game_config:
             game_config = GameConfig(num_players=self.num_players)
+        if self.early_stopping:
+            self.early_stopping.reset(len(self.best_fitness_history))
+        if self.time_budget:
+            self.time_budget.start()
+            self._deadline = self.time_budget.deadline
+        cut_off = False
+        evaluated = None   # Last evaluated population, lineage and fitness, returned if the budget ends the run
             
-        for gen in range(num_generations):
-            self.generation = gen + 1
-            print(f"Generation {self.generation}...")
-            
-            # Evaluate population
-            fitness_scores = self._evaluate_population(game_config, games_per_individual)
-            
-            # Record stats
-            best_fitness = max(fitness_scores.values())
-            avg_fitness = sum(fitness_scores.values()) / len(fitness_scores)
-            self.best_fitness_history.append(best_fitness)
-            self.avg_fitness_history.append(avg_fitness)
+        if self.backend != 'serial':
+            self._executor = make_executor(self.workers, backend=self.backend)
+        if self.telemetry:
+            self.telemetry.workers = self.workers if self._executor else 1
             
-            print(f"  Best fitness: {best_fitness:.2f}")
-            print(f"  Average fitness: {avg_fitness:.2f}")
-            
-            # Generate new population
-            self._generate_new_population(fitness_scores)
+        try:
+            for gen in range(num_generations):
+                self.generation = gen + 1
+                self._log(f"Generation {self.generation}...")
+                generation_start = time.perf_counter()
+                
+                games = games_per_individual
+                if self.time_budget:
+                    games = self.time_budget.plan(num_generations - gen, games_per_individual)
+                    if games is None:
+                        self.generation = gen
+                        self._log(f"Time budget spent after generation {gen}")
+                        self._restore_evaluated(evaluated)
+                        break
+                    self._log(f"  Games per individual: {games}")
+                
+                # Evaluate population
+                try:
+                    fitness_scores = self._evaluate_population(game_config, games)
+                except DeadlineExceeded:
+                    cut_off = True
+                    self.generation = gen
+                    self._log(f"Deadline reached during generation {gen + 1}, which is discarded")
+                    self._restore_evaluated(evaluated)
+                    break
+                evaluation_seconds = time.perf_counter() - generation_start
+                if self.telemetry and self.backend == 'serial':
+                    # Serial games run in this thread, so evaluation time is the worker's busy time
+                    self.telemetry.record_busy(evaluation_seconds)
+                
+                # Record stats
+                best_fitness = max(fitness_scores.values())
+                avg_fitness = sum(fitness_scores.values()) / len(fitness_scores)
+                self.best_fitness_history.append(best_fitness)
+                self.avg_fitness_history.append(avg_fitness)
+                
+                self._log(f"  Best fitness: {best_fitness:.2f}")
+                self._log(f"  Average fitness: {avg_fitness:.2f}")
+                
+                diversity = population_diversity(self.population)
+                self.diversity_history.append(diversity)
+                self._log(f"  Diversity: mean distance {diversity['mean_distance']:.3f}, "
+                          f"{diversity['unique_genomes']}/{self.population_size} unique genomes")
+                
+                if self.archive:
+                    self._archive_generation(fitness_scores)
+                
+                if self.surrogate:
+                    self._update_surrogate(fitness_scores, games)
+                
+                decision = self.early_stopping.check(self.best_fitness_history, diversity) if self.early_stopping else None
+                if decision == 'stop':
+                    self._log(f"Early stopping after generation {self.generation}")
+                    # No new population is bred, so order this one best first as elitism would
+                    self._order_best_first(fitness_scores)
+                    if self.telemetry:
+                        self.telemetry.record_progress(self.generation, self.generation, best_fitness, avg_fitness,
+                                                       time.perf_counter() - generation_start)
+                    break
+                
+                # Generate new population
+                evaluated = (self.population, self.parents, self.elites, fitness_scores)
+                self._generate_new_population(fitness_scores)
+                
+                if decision == 'inject':
+                    self._inject_diversity()
+                    
+                if self.time_budget:
+                    self.time_budget.observe(games, evaluation_seconds,
+                                             time.perf_counter() - generation_start - evaluation_seconds)
+                    
+                if self.telemetry:
+                    self.telemetry.record_progress(self.generation, num_generations, best_fitness, avg_fitness,
+                                                   time.perf_counter() - generation_start)
+        finally:
+            if self._executor:
+                # Batches still running at the deadline are not waited for
+                self._executor.shutdown(wait=not cut_off, cancel_futures=cut_off)
+                self._executor = None
+            self._deadline = None
+            if self.archive:
+                self.archive.flush()
+            if self.telemetry:
+                self.telemetry.publish()
+                
+        return self.population, self.best_fitness_history, self.avg_fitness_history
+    
+    def _order_best_first(self, fitness_scores):
+        """Reorder the population and its lineage by fitness, best first"""
+        order = sorted(range(self.population_size), key=lambda i: fitness_scores[i], reverse=True)
+        self.population = [self.population[i] for i in order]
+        self.parents = [self.parents[i] for i in order]
+        self.elites = [self.elites[i] for i in order]
+    
+    def _restore_evaluated(self, evaluated):
+        """Go back to the last evaluated population, if any, in place of its unevaluated offspring"""
+        if evaluated is None:
+            return
+        self.population, self.parents, self.elites, fitness_scores = evaluated
+        self.surrogate_predictions = {}
+        self._order_best_first(fitness_scores)
+    
+    def evolve_async(self, num_evaluations=1000, games_per_individual=5, game_config=None,
+                     workers=None, report_every=None):
+        """
+        Steady-state evolution that keeps every worker busy.
+        
+        Each evaluation seats one individual at a table of opponents sampled
+        from the current population and plays games_per_individual games.
+        Whenever an evaluation finishes, its result is applied and a new child
+        is bred by tournament selection over the evaluated individuals and
+        dispatched, so there is no generation barrier. A child replaces the
+        worst individual if it scores at least as well. Best and average
+        fitness are recorded every report_every evaluations (one population's
+        worth by default) along with the evaluation rate. Only telemetry is
+        supported of the optional hooks; the others only work with evolve and
+        are rejected with ValueError.
+        """
+        unsupported = [name for name, hook in (('time_budget', self.time_budget),
+                                               ('early_stopping', self.early_stopping),
+                                               ('surrogate', self.surrogate),
+                                               ('opponent_pool', self.opponent_pool),
+                                               ('evaluation_store', self.evaluation_store),
+                                               ('rating_system', self.rating_system),
+                                               ('scheduler', self.scheduler),
+                                               ('archive', self.archive)) if hook]
+        if unsupported:
+            raise ValueError(f"Steady-state evolution does not support {', '.join(unsupported)}")
+        if not game_config:
+            game_config = GameConfig(num_players=self.num_players)
+        if report_every is None:
+            report_every = self.population_size
             
+        fitness_scores = {}
+        # Initial individuals are evaluated first, then children are bred on demand
+        unevaluated = list(range(self.population_size))
+        executor = make_executor(workers, backend='threads' if self.backend == 'threads' else 'processes')
+        slots = workers if executor else 1
+        # Maps each in-flight future to the (population index or None, individual) it evaluates
+        pending = {}
+        evaluations = 0
+        self.evaluation_rate_history = []
+        start_time = time.perf_counter()
+        # With telemetry, batches also return the time their worker spent playing
+        task = timed_play_games if self.telemetry else play_games
+        if self.telemetry:
+            self.telemetry.workers = slots
+        
+        try:
+            while evaluations < num_evaluations:
+                finished = []
+                # Children need evaluated parents, so breeding waits for the first result
+                while (len(pending) + len(finished) < slots and (unevaluated or fitness_scores)
+                       and evaluations + len(pending) + len(finished) < num_evaluations):
+                    if unevaluated:
+                        idx = unevaluated.pop(0)
+                        individual = self.population[idx]
+                    else:
+                        idx = None
+                        individual = self._breed_child(fitness_scores, list(fitness_scores))
+                    args = self._evaluation_args(individual, game_config, games_per_individual)
+                    if executor:
+                        pending[executor.submit(task, *args)] = (idx, individual)
+                    else:
+                        finished.append(((idx, individual), task(*args)))
+                        
+                if pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    finished += [(pending.pop(future), future.result()) for future in done]
+                    
+                for (idx, individual), games in finished:
+                    if self.telemetry:
+                        games = self._record_timed_games(games)
+                    score = sum(fitness[0] for _, _, fitness in games) / len(games)
+                    evaluations += 1
+                    if idx is not None:
+                        fitness_scores[idx] = score
+                    else:
+                        self._replace_worst(individual, score, fitness_scores)
+                        
+                    if evaluations % report_every == 0 or evaluations == num_evaluations:
+                        self._record_async_progress(evaluations, num_evaluations, fitness_scores,
+                                                    time.perf_counter() - start_time)
+        finally:
+            if executor:
+                executor.shutdown(cancel_futures=True)
+            if self.telemetry:
+                self.telemetry.publish()
+                
+        # Order the population best first, matching the elitism order of evolve
+        order = sorted(fitness_scores, key=lambda i: fitness_scores[i], reverse=True)
+        order += [i for i in range(self.population_size) if i not in fitness_scores]
+        self.population = [self.population[i] for i in order]
+        
         return self.population, self.best_fitness_history, self.avg_fitness_history
     
+    def _evaluation_args(self, individual, game_config, games_per_individual):
+        """play_games arguments for one individual at seat 0 against sampled opponents"""
+        opponents = random.sample(self.population, min(self.num_players - 1, self.population_size))
+        while len(opponents) < self.num_players - 1:
+            opponents.append(GeneticTraits())
+        return game_config, [individual] + opponents, games_per_individual, random.randrange(2**32)
+    
+    def _replace_worst(self, child, score, fitness_scores):
+        """Put child in place of the worst evaluated individual if it does at least as well"""
+        worst = min(fitness_scores, key=lambda i: fitness_scores[i])
+        if score >= fitness_scores[worst]:
+            self.population[worst] = child
+            fitness_scores[worst] = score
+            
+    def _record_async_progress(self, evaluations, num_evaluations, fitness_scores, elapsed):
+        """Record fitness stats and the evaluation rate of a steady-state run"""
+        self.generation = evaluations // self.population_size
+        best_fitness = max(fitness_scores.values())
+        avg_fitness = sum(fitness_scores.values()) / len(fitness_scores)
+        rate = evaluations / elapsed if elapsed > 0 else float('inf')
+        self.best_fitness_history.append(best_fitness)
+        self.avg_fitness_history.append(avg_fitness)
+        self.evaluation_rate_history.append(rate)
+        self.diversity_history.append(population_diversity(self.population))
+        
+        if self.telemetry:
+            self.telemetry.record_progress(evaluations, num_evaluations, best_fitness, avg_fitness)
+        
+        self._log(f"Evaluations {evaluations}/{num_evaluations} ({rate:.1f} evals/s)")
+        self._log(f"  Best fitness: {best_fitness:.2f}")
+        self._log(f"  Average fitness: {avg_fitness:.2f}")
+    
+    def _record_timed_games(self, result):
+        """Report a timed_play_games batch to telemetry and return its games"""
+        seconds, games = result
+        self.telemetry.record_games(len(games), sum(days for _, days, _ in games), seconds)
+        return games
+    
+    def _create_game(self, game_config):
+        """A game for in-process evaluation, reporting to telemetry and stopping at the deadline"""
+        game = create_game(game_config)
+        game.telemetry = self.telemetry
+        game.deadline = self._deadline
+        return game
+    
+    def _until_deadline(self, results):
+        """Pass worker results through until the deadline, then raise DeadlineExceeded"""
+        try:
+            for result in results:
+                if self._deadline is not None and time.perf_counter() >= self._deadline:
+                    raise DeadlineExceeded
+                yield result
+        except FuturesTimeout:
+            raise DeadlineExceeded from None
+    
+    def _archive_generation(self, fitness_scores):
+        """Append the evaluated population, its fitness and lineage to the archive"""
+        self.archive.append([genome.to_vector() for genome in self.population],
+                            [fitness_scores[i] for i in range(self.population_size)],
+                            self.parents, self.elites)
+        
+    def _log(self, message):
+        """Print a progress message when running verbosely"""
+        if self.verbose:
+            print(message)
+    
     def _evaluate_population(self, game_config, games_per_individual):
         """Evaluate the fitness of all individuals in the population"""
+        if self.opponent_pool:
+            return self._evaluate_against_pool(game_config, games_per_individual)
+        if self.rating_system:
+            return self._evaluate_rated(game_config, games_per_individual)
+        if self.scheduler:
+            return self._evaluate_scheduled(game_config, games_per_individual)
+        if self.backend != 'serial':
+            return self._evaluate_parallel(game_config, games_per_individual)
+            
         fitness_scores = {}
         
+        # One game object is reused so its players are pooled across games
+        game = self._create_game(game_config)
+        
         # Group population into self.num_players sized groups for games
         for i in range(0, self.population_size, self.num_players):
             group = self.population[i:i+self.num_players]
@@ -66,7 +403,6 @@ class GeneticAlgorithm:
             
             for _ in range(games_per_individual):
                 # Initialize game
-                game = MafiaGame(game_config)
                 game.initialize_game(group)
                 
                 # Run game
@@ -90,10 +426,109 @@ class GeneticAlgorithm:
                 
         return fitness_scores
     
-    def _tournament_selection(self, fitness_scores):
+    def _evaluate_parallel(self, game_config, games_per_individual):
+        """
+        Evaluate the same contiguous tables as _evaluate_population, one seeded
+        play_games batch per table on the backend's workers
+        """
+        groups = []
+        for i in range(0, self.population_size, self.num_players):
+            group = self.population[i:i+self.num_players]
+            while len(group) < self.num_players:
+                group.append(GeneticTraits())
+            groups.append(group)
+        seeds = [random.randrange(2**32) for _ in groups]
+        
+        args = ([game_config] * len(groups), groups, [games_per_individual] * len(groups), seeds)
+        task = timed_play_games if self.telemetry else play_games
+        if self._executor:
+            timeout = self._deadline - time.perf_counter() if self._deadline is not None else None
+            batches = self._executor.map(task, *args, timeout=timeout)
+        else:
+            batches = map(task, *args)
+        if self._deadline is not None:
+            batches = self._until_deadline(batches)
+        if self.telemetry:
+            batches = map(self._record_timed_games, batches)
+        
+        fitness_scores = {}
+        for i, games in zip(range(0, self.population_size, self.num_players), batches):
+            for seat in range(min(self.num_players, self.population_size - i)):
+                fitness_scores[i + seat] = sum(fitness[seat] for _, _, fitness in games) / games_per_individual
+        return fitness_scores
+    
+    def _evaluate_scheduled(self, game_config, games_per_individual):
+        """Evaluate the population on the seating plans produced by the scheduler"""
+        plans = self.scheduler.schedule(self.population_size, game_config, games_per_individual)
+        results = []
+        game = self._create_game(game_config)
+        
+        for tables in plans:
+            for table in tables:
+                # Empty seats are filled with random individuals
+                group = [self.population[i] if i is not None else GeneticTraits() for i, _ in table]
+                roles = [role for _, role in table]
+                
+                game.initialize_game(group, roles=roles)
+                game.run_game()
+                
+                for seat, score in game.get_player_fitness().items():
+                    individual = table[seat][0]
+                    if individual is not None:
+                        results.append((individual, roles[seat], score))
+                        
+        return self.scheduler.aggregate(results, self.population_size)
+    
+    def _evaluate_rated(self, game_config, games_per_individual):
+        """
+        Play rounds of rating-matchmade tables, updating skill ratings after every
+        game. Returns conservative rating estimates when the rating system selects
+        on ratings, otherwise the mean game fitness.
+        """
+        ratings = self.rating_system
+        game = self._create_game(game_config)
+        totals = [0.0] * self.population_size
+        counts = [0] * self.population_size
+        
+        for _ in range(games_per_individual):
+            for table in ratings.matchmake(self.population, game_config):
+                # Empty seats are filled with random individuals, which are not rated
+                group = [self.population[i] if i is not None else GeneticTraits() for i, _ in table]
+                roles = [role for _, role in table]
+                
+                game.initialize_game(group, roles=roles)
+                winning_team, _ = game.run_game()
+                ratings.update(group, roles, winning_team,
+                               rated_seats=[seat for seat, (i, _) in enumerate(table) if i is not None])
+                
+                for seat, score in game.get_player_fitness().items():
+                    individual = table[seat][0]
+                    if individual is not None:
+                        totals[individual] += score
+                        counts[individual] += 1
+                        
+        if ratings.select_on_rating:
+            weights = ratings.role_weights(game_config)
+            return {i: ratings.conservative(genome, weights) for i, genome in enumerate(self.population)}
+        return {i: totals[i] / max(counts[i], 1) for i in range(self.population_size)}
+    
+    def _evaluate_against_pool(self, game_config, games_per_individual):
+        """Score every individual against the fixed opponent pool, reusing stored results"""
+        store = self.evaluation_store
+        hits, misses = (store.hits, store.misses) if store else (0, 0)
+        fitness_scores = evaluate_against_pool(self.population, self.opponent_pool, game_config,
+                                               games_per_individual, store, self.telemetry, self._deadline)
+        if store:
+            self._log(f"  Pool evaluations: {store.hits - hits} stored, {store.misses - misses} simulated")
+        return fitness_scores
+    
+    def _tournament_selection(self, fitness_scores, candidates=None):
         """Select an individual using tournament selection"""
+        if candidates is None:
+            candidates = range(self.population_size)
+            
         # Randomly select tournament_size individuals
-        tournament = random.sample(range(self.population_size), min(self.tournament_size, self.population_size))
+        tournament = random.sample(candidates, min(self.tournament_size, len(candidates)))
         
         # Find the one with highest fitness
         winner = tournament[0]
@@ -106,6 +541,7 @@ class GeneticAlgorithm:
     def _generate_new_population(self, fitness_scores):
         """Generate a new population using selection, crossover, and mutation"""
         new_population = []
+        parents = []
         
         # Elitism - keep best individuals
         elite_count = int(self.population_size * self.elitism_rate)
@@ -113,22 +549,82 @@ class GeneticAlgorithm:
         
         for idx in elite_indices:
             new_population.append(copy.deepcopy(self.population[idx]))
+            parents.append((idx, -1))
             
         # Fill rest with crossover and mutation
-        while len(new_population) < self.population_size:
-            # Select parents
-            parent1_idx = self._tournament_selection(fitness_scores)
-            parent2_idx = self._tournament_selection(fitness_scores)
+        num_children = self.population_size - len(new_population)
+        self.surrogate_predictions = {}
+        
+        if self.surrogate and self.surrogate.ready and num_children > 0:
+            # Breed an oversampled pool and only keep the most promising children
+            pool = [self._breed(fitness_scores) for _ in range(num_children * self.surrogate.oversample)]
+            pool_parents = {id(child): pair for child, pair in pool}
+            children, predictions = self.surrogate.screen([child for child, _ in pool], num_children)
+            for child, prediction in zip(children, predictions):
+                self.surrogate_predictions[len(new_population)] = prediction
+                new_population.append(child)
+                parents.append(pool_parents[id(child)])
+        else:
+            while len(new_population) < self.population_size:
+                child, pair = self._breed(fitness_scores)
+                new_population.append(child)
+                parents.append(pair)
             
-            # Crossover
-            child = GeneticTraits.crossover(self.population[parent1_idx], self.population[parent2_idx])
+        # Replace old population
+        self.population = new_population
+        self.parents = parents
+        self.elites = [i < elite_count for i in range(self.population_size)]
+    
+    def _inject_diversity(self):
+        """Replace part of the non-elite population with fresh random genomes"""
+        elite_count = int(self.population_size * self.elitism_rate)
+        count = int((self.population_size - elite_count) * self.early_stopping.inject_fraction)
+        for idx in range(self.population_size - count, self.population_size):
+            self.population[idx] = GeneticTraits()
+            self.parents[idx] = (-1, -1)
+            # The surrogate's prediction was for the discarded child
+            self.surrogate_predictions.pop(idx, None)
+        self._log(f"  Injected {count} random genomes")
+    
+    def _breed_child(self, fitness_scores, candidates=None):
+        """Create a child from two tournament-selected parents"""
+        return self._breed(fitness_scores, candidates)[0]
+    
+    def _breed(self, fitness_scores, candidates=None):
+        """Create a child from two tournament-selected parents, returned with their indices"""
+        # Select parents
+        parent1_idx = self._tournament_selection(fitness_scores, candidates)
+        parent2_idx = self._tournament_selection(fitness_scores, candidates)
+        
+        # Crossover
+        child = GeneticTraits.crossover(self.population[parent1_idx], self.population[parent2_idx])
+        
+        # Mutation
+        child.mutate(self.mutation_rate, self.mutation_strength)
+        
+        return child, (parent1_idx, parent2_idx)
+    
+    def _update_surrogate(self, fitness_scores, games_per_individual):
+        """Score the last screening against simulated fitness and retrain the surrogate"""
+        if self.surrogate_predictions:
+            screened = sorted(self.surrogate_predictions)
+            predicted = [self.surrogate_predictions[i] for i in screened]
+            actual = [fitness_scores[i] for i in screened]
+            rank_corr, mae = self.surrogate.accuracy(predicted, actual)
             
-            # Mutation
-            child.mutate(self.mutation_rate, self.mutation_strength)
+            # Every rejected candidate would have played games_per_individual games
+            rejected = len(screened) * (self.surrogate.oversample - 1)
+            games_saved = rejected * games_per_individual / self.num_players
             
-            # Add to new population
-            new_population.append(child)
+            self.surrogate_history.append({
+                'generation': self.generation,
+                'rank_correlation': rank_corr,
+                'mean_abs_error': mae,
+                'candidates_rejected': rejected,
+                'games_saved': games_saved
+            })
+            self._log(f"  Surrogate rank correlation: {rank_corr:.3f}, mean abs error: {mae:.2f}")
+            self._log(f"  Surrogate screened out {rejected} candidates (~{games_saved:.0f} games saved)")
             
-        # Replace old population
-        self.population = new_population
+        self.surrogate.add(self.population, [fitness_scores[i] for i in range(self.population_size)])
 
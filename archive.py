@@ -0,0 +1,172 @@
+from modules import np,List,Dict,Optional,Tuple
+import json
+import os
+from traits import TRAIT_NAMES
+
+# Bump when the column layout changes
+ARCHIVE_FORMAT_VERSION = 1
+
+# Column files of an archive: dtype and values per row
+COLUMNS = {
+    'generation': ('<i4', 1),
+    'traits': ('<f8', len(TRAIT_NAMES)),
+    'fitness': ('<f8', 1),
+    'parents': ('<i4', 2),
+    'elite': ('u1', 1),
+}
+
+class GenomeArchive:
+    """
+    Append-only columnar archive of every evaluated generation.
+
+    An archive is a directory with one raw little-endian file per column -
+    generation number, trait vector (ordered like TRAIT_NAMES), fitness,
+    parent indices within the previous generation (-1 for none; elites list
+    themselves as their first parent) and elite flag - so each column can be
+    memory-mapped and read without parsing. Appends are buffered in memory
+    and written a block at a time. Generations are numbered in append order,
+    so several runs can share one archive.
+    """
+    def __init__(self, path: str, buffer_rows: int = 65536):
+        self.path = path
+        self.buffer_rows = buffer_rows
+        os.makedirs(path, exist_ok=True)
+
+        meta_path = os.path.join(path, 'meta.json')
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if meta['version'] != ARCHIVE_FORMAT_VERSION or tuple(meta['traits']) != TRAIT_NAMES:
+                raise ValueError(f"Archive at {path} has an incompatible format")
+        else:
+            with open(meta_path, 'w') as f:
+                json.dump({'version': ARCHIVE_FORMAT_VERSION, 'traits': TRAIT_NAMES,
+                           'columns': {name: list(spec) for name, spec in COLUMNS.items()}}, f, indent=1)
+
+        # Rows written by an interrupted flush are cut back to the shortest column
+        self._rows_on_disk = self._stored_rows()
+        for name, (dtype, width) in COLUMNS.items():
+            with open(self._column_path(name), 'ab') as f:
+                f.truncate(self._rows_on_disk * width * np.dtype(dtype).itemsize)
+
+        self._buffer = {name: [] for name in COLUMNS}
+        self._buffered_rows = 0
+        self._generation_starts = None
+        columns = self._memmap(['generation'])
+        self.num_generations = int(columns['generation'][-1]) + 1 if self._rows_on_disk else 0
+
+    def _column_path(self, name: str) -> str:
+        return os.path.join(self.path, f"{name}.bin")
+
+    def _stored_rows(self) -> int:
+        rows = []
+        for name, (dtype, width) in COLUMNS.items():
+            path = self._column_path(name)
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            rows.append(size // (width * np.dtype(dtype).itemsize))
+        return min(rows)
+
+    @property
+    def num_rows(self) -> int:
+        return self._rows_on_disk + self._buffered_rows
+
+    # -- Writing -----------------------------------------------------------
+
+    def append(self, traits, fitness, parents=None, elites=None) -> int:
+        """
+        Buffer one generation: a (population x traits) matrix, its fitness
+        vector, (population x 2) parent indices and elite flags. Returns the
+        generation number it was stored under.
+        """
+        traits = np.asarray(traits, dtype=COLUMNS['traits'][0])
+        size = len(traits)
+        generation = self.num_generations
+        self._buffer['generation'].append(np.full(size, generation, dtype=COLUMNS['generation'][0]))
+        self._buffer['traits'].append(traits)
+        self._buffer['fitness'].append(np.asarray(fitness, dtype=COLUMNS['fitness'][0]))
+        self._buffer['parents'].append(np.full((size, 2), -1, dtype=COLUMNS['parents'][0]) if parents is None
+                                       else np.asarray(parents, dtype=COLUMNS['parents'][0]))
+        self._buffer['elite'].append(np.zeros(size, dtype=COLUMNS['elite'][0]) if elites is None
+                                     else np.asarray(elites, dtype=COLUMNS['elite'][0]))
+        self._buffered_rows += size
+        self.num_generations += 1
+
+        if self._buffered_rows >= self.buffer_rows:
+            self.flush()
+        return generation
+
+    def flush(self):
+        """Write the buffered generations to the column files"""
+        if not self._buffered_rows:
+            return
+        for name in COLUMNS:
+            with open(self._column_path(name), 'ab') as f:
+                for block in self._buffer[name]:
+                    block.tofile(f)
+            self._buffer[name].clear()
+        self._rows_on_disk += self._buffered_rows
+        self._buffered_rows = 0
+        self._generation_starts = None
+
+    def close(self):
+        self.flush()
+
+    # -- Reading -----------------------------------------------------------
+
+    def _memmap(self, names=COLUMNS) -> Dict[str, np.ndarray]:
+        """Read-only memory maps of the stored rows of the given columns"""
+        columns = {}
+        for name in names:
+            dtype, width = COLUMNS[name]
+            shape = (self._rows_on_disk, width) if width > 1 else (self._rows_on_disk,)
+            if self._rows_on_disk:
+                columns[name] = np.memmap(self._column_path(name), dtype=dtype, mode='r', shape=shape)
+            else:
+                columns[name] = np.empty(shape, dtype=dtype)
+        return columns
+
+    def generation_starts(self) -> np.ndarray:
+        """First row of every stored generation, plus the row count at the end"""
+        self.flush()
+        if self._generation_starts is None:
+            generations = self._memmap(['generation'])['generation']
+            self._generation_starts = np.searchsorted(generations, np.arange(self.num_generations + 1))
+        return self._generation_starts
+
+    def read(self, generations: Optional[Tuple[int, int]] = None, **trait_ranges) -> Dict[str, np.ndarray]:
+        """
+        Rows of the generations in [start, stop), or all generations, whose
+        traits fall in the given inclusive ranges, e.g.
+        read((10, 20), vote_randomness=(0.0, 0.1)). Returns every column plus
+        the archive row numbers; without trait filters the columns are
+        memory-mapped views rather than copies.
+        """
+        starts = self.generation_starts()
+        start, stop = generations if generations is not None else (0, self.num_generations)
+        start, stop = max(start, 0), min(stop, self.num_generations)
+        first, last = (int(starts[start]), int(starts[stop])) if start < stop else (0, 0)
+
+        columns = {name: values[first:last] for name, values in self._memmap().items()}
+        rows = np.arange(first, last)
+        if trait_ranges:
+            mask = np.ones(last - first, dtype=bool)
+            for name, (low, high) in trait_ranges.items():
+                values = columns['traits'][:, TRAIT_NAMES.index(name)]
+                mask &= (values >= low) & (values <= high)
+            columns = {name: np.asarray(values[mask]) for name, values in columns.items()}
+            rows = rows[mask]
+        columns['row'] = rows
+        return columns
+
+    def lineage(self, generation: int, index: int) -> List[Tuple[int, int]]:
+        """(generation, index) of an individual and its first parents back to the earliest archived ancestor"""
+        starts = self.generation_starts()
+        parents = self._memmap(['parents'])['parents']
+        line = [(generation, index)]
+        while generation > 0:
+            parent = int(parents[starts[generation] + index, 0])
+            if parent < 0:
+                break
+            generation, index = generation - 1, parent
+            line.append((generation, index))
+        return line
@@ -1,4 +1,4 @@
-from modules import np,defaultdict,List,Tuple
+from modules import np,defaultdict,List,Tuple,Dict
 from constants import ROLES
 
 class BeliefSystem:
@@ -9,11 +9,8 @@ class BeliefSystem:
         self.player_id = player_id
         self.num_players = num_players
         
-        # Initialize belief matrices for each role
-        # For each player, we track probability that they have each role
-        self.role_beliefs = {
-            role: np.ones(num_players) / num_players for role in ROLES
-        }
+        # Initialize belief matrices for each role, and trust levels
+        self._init_storage()
         
         # Known facts - definite knowledge
         self.known_facts = {
@@ -27,10 +24,6 @@ class BeliefSystem:
             'is_not_villager':set()
         }
         
-        # Set own role certainty (will be updated when role is assigned)
-        for role in ROLES.keys():
-            self.role_beliefs[role][player_id] = 0.0
-        
         # History of observations
         self.observations = []
         
@@ -40,9 +33,86 @@ class BeliefSystem:
         # Statements made by other players
         self.player_statements = defaultdict(list)
         
+    def _init_storage(self):
+        """Allocate role beliefs and trust levels at their initial values"""
+        # For each player, we track probability that they have each role
+        self.role_beliefs = {
+            role: np.ones(self.num_players) / self.num_players for role in ROLES
+        }
+        
+        # Set own role certainty (will be updated when role is assigned)
+        for role in ROLES.keys():
+            self.role_beliefs[role][self.player_id] = 0.0
+        
         # Trust levels toward other players (0-1)
-        self.trust_levels = np.ones(num_players) * 0.5
-        self.trust_levels[player_id] = 1.0  # Trust ourselves completely
+        self.trust_levels = np.ones(self.num_players) * 0.5
+        self.trust_levels[self.player_id] = 1.0  # Trust ourselves completely
+        
+    def reset(self):
+        """Return to the initial belief state in place, reusing the existing arrays and containers"""
+        uniform = 1.0 / self.num_players
+        for role in ROLES:
+            self.role_beliefs[role].fill(uniform)
+            self.role_beliefs[role][self.player_id] = 0.0
+            
+        for facts in self.known_facts.values():
+            facts.clear()
+            
+        self.observations.clear()
+        self.voting_history.clear()
+        self.player_statements.clear()
+        
+        self.trust_levels.fill(0.5)
+        self.trust_levels[self.player_id] = 1.0
+        
+    def get_state(self):
+        """Read-only copy of the mutable belief state, for game snapshots"""
+        return {
+            **self._storage_state(),
+            'known_facts': {fact: frozenset(subjects) for fact, subjects in self.known_facts.items()},
+            'observations': tuple(self.observations),
+            'voting_history': tuple(self.voting_history),
+            'player_statements': {p: tuple(s) for p, s in self.player_statements.items()}
+        }
+        
+    def set_state(self, state):
+        """Load a state from get_state in place, reusing the existing arrays and containers"""
+        self._load_storage_state(state)
+        
+        for fact, subjects in self.known_facts.items():
+            subjects.clear()
+            subjects.update(state['known_facts'][fact])
+            
+        self.observations[:] = state['observations']
+        self.voting_history[:] = state['voting_history']
+        self.player_statements.clear()
+        for player_id, statements in state['player_statements'].items():
+            self.player_statements[player_id] = list(statements)
+        
+    def _storage_state(self):
+        """Read-only copies of the role beliefs and trust levels"""
+        role_beliefs = np.stack([self.role_beliefs[role] for role in ROLES], axis=1)
+        trust_levels = self.trust_levels.copy()
+        role_beliefs.flags.writeable = False
+        trust_levels.flags.writeable = False
+        return {'role_beliefs': role_beliefs, 'trust_levels': trust_levels}
+        
+    def _load_storage_state(self, state):
+        for role, index in ROLES.items():
+            self.role_beliefs[role][:] = state['role_beliefs'][:, index]
+        self.trust_levels[:] = state['trust_levels']
+        
+    def bind_storage(self, role_beliefs, trust_levels):
+        """
+        Move beliefs into externally owned arrays - a (num_players x roles) block
+        and a num_players trust vector - so a game can hold every player's
+        beliefs in one tensor. Current values are copied across.
+        """
+        for role, index in ROLES.items():
+            role_beliefs[:, index] = self.role_beliefs[role]
+            self.role_beliefs[role] = role_beliefs[:, index]
+        trust_levels[:] = self.trust_levels
+        self.trust_levels = trust_levels
         
     def update_known_role(self, player_id: int, role: str):
         """Update beliefs when a player's role is definitively known"""
@@ -75,9 +145,9 @@ class BeliefSystem:
         else:
             self.known_facts['is_not_mafia'].add(player_id)
             
-    def update_beliefs_from_vote(self, voter_id: int, target_id: int, day: int):
+    def update_beliefs_from_vote(self, voter_id: int, target_id: int, day: int, record: Tuple = None):
         """Update beliefs based on voting behavior"""
-        self.voting_history.append((day, voter_id, target_id))
+        self.voting_history.append(self._vote_record(day, voter_id, target_id, record))
         
         # Analyze voting patterns
         # If someone keeps voting for non-mafia, they might be mafia
@@ -97,13 +167,10 @@ class BeliefSystem:
                 # More likely to be mafia
                 self._shift_belief_toward(voter_id, 'MAFIA', decrease=False)
     
-    def record_statement(self, speaker_id: int, statement_type: str, subject_id: int, day: int):
+    def record_statement(self, speaker_id: int, statement_type: str, subject_id: int, day: int,
+                         record: Dict = None):
         """Record a statement made by a player"""
-        self.player_statements[speaker_id].append({
-            'day': day,
-            'type': statement_type, 
-            'subject': subject_id
-        })
+        self.player_statements[speaker_id].append(self._statement_record(day, statement_type, subject_id, record))
         
         # Update beliefs based on statement
         if statement_type == 'accuse':
@@ -121,10 +188,7 @@ class BeliefSystem:
                 else:
                     # Unknown validity - slightly update beliefs on subject
                     trust_weight = self.trust_levels[speaker_id] * 0.05
-                    current = self.role_beliefs['MAFIA'][subject_id]
-                    self.role_beliefs['MAFIA'][subject_id] = min(0.95, current + trust_weight)
-                    # Normalize other beliefs
-                    self._normalize_beliefs()
+                    self._nudge_belief(subject_id, 'MAFIA', trust_weight)
         
         elif statement_type == 'defend':
             # If speaker defends someone against mafia accusations
@@ -141,10 +205,15 @@ class BeliefSystem:
                 else:
                     # Unknown validity - slightly update beliefs
                     trust_weight = self.trust_levels[speaker_id] * 0.05
-                    current = self.role_beliefs['MAFIA'][subject_id]
-                    self.role_beliefs['MAFIA'][subject_id] = max(0.05, current - trust_weight)
-                    # Normalize other beliefs
-                    self._normalize_beliefs()
+                    self._nudge_belief(subject_id, 'MAFIA', -trust_weight)
+    
+    def _vote_record(self, day: int, voter_id: int, target_id: int, record: Tuple = None) -> Tuple[int, int, int]:
+        """Entry of voting_history for a vote - record, if given, is the one the game made for all observers"""
+        return (day, voter_id, target_id)
+        
+    def _statement_record(self, day: int, statement_type: str, subject_id: int, record: Dict = None) -> Dict:
+        """Entry of player_statements for a statement - records are never modified once made"""
+        return {'day': day, 'type': statement_type, 'subject': subject_id}
     
     def record_detective_investigation(self, target_id: int, is_mafia: bool):
         """Record the result of a detective investigation"""
@@ -193,14 +262,26 @@ class BeliefSystem:
         self.role_beliefs[role][player_id] = new_value
         self._normalize_beliefs()
     
+    def _nudge_belief(self, player_id: int, role: str, amount: float):
+        """Move belief about a player's role by a small, trust-weighted amount"""
+        current = self.role_beliefs[role][player_id]
+        if amount >= 0:
+            self.role_beliefs[role][player_id] = min(0.95, current + amount)
+        else:
+            self.role_beliefs[role][player_id] = max(0.05, current + amount)
+        # Normalize other beliefs
+        self._normalize_beliefs()
+    
     def _normalize_beliefs(self):
         """Ensure belief probabilities remain consistent"""
         # Ensure probabilities for each player sum to 1 across roles
-        for p in range(self.num_players):
-            total = sum(self.role_beliefs[role][p] for role in ROLES.keys())
-            if total > 0:  # Avoid division by zero
-                for role in ROLES.keys():
-                    self.role_beliefs[role][p] /= total
+        beliefs = [self.role_beliefs[role] for role in ROLES.keys()]
+        total = np.zeros(self.num_players)
+        for belief in beliefs:
+            total += belief
+        positive = total > 0  # Avoid division by zero
+        for belief in beliefs:
+            np.divide(belief, total, out=belief, where=positive)
     
     def _analyze_night_kill_patterns(self, killed_player_id: int):
         """Analyze voting patterns to infer who might have wanted a player dead"""
@@ -0,0 +1,576 @@
+"""
+Benchmarks for the Mafia AI Agent
+---------------------------------
+Each benchmark prints a small table and returns its raw numbers.
+Run them with `python benchmarks.py [name ...]`.
+"""
+
+from GeneticAlgorithm import GeneticAlgorithm
+from config import GameConfig
+from mafia import MafiaGame
+from traits import GeneticTraits
+from scheduler import RoleStratifiedScheduler
+from stats import rank_correlation
+from evaluation import play_games,create_game
+from diversity import EarlyStopping
+from ratings import RatingSystem
+from archive import GenomeArchive
+from recorder import BeliefRecorder
+from coevolution import CoevolutionGA
+from telemetry import RunTelemetry
+from budget import TimeBudget
+from opponent_pool import OpponentPool
+from policy import HeuristicPolicy,RemotePolicy,PolicyRunner,start_stub_server,run_policy_games
+from strategy import CompiledStrategy,INVESTIGATE_SUSPICIOUS,INVESTIGATE_RANDOM,PROTECT_SELF,PROTECT_VALUABLE,PROTECT_AT_RISK
+import asyncio
+from modules import random,np,time,copy
+import sys
+import tempfile
+import tracemalloc
+
+
+def bench_seating_variance(population_size=32, num_players=8, budgets=(1, 2, 4, 8), repeats=6, seed=0):
+    """Compare fitness noise of contiguous and role-stratified seating per game budget"""
+    random.seed(seed)
+    game_config = GameConfig(num_players=num_players)
+    ga = GeneticAlgorithm(population_size=population_size, num_players=num_players)
+    stratified = RoleStratifiedScheduler(num_players)
+
+    print(f"{'seating':<12}{'games':>6}{'fitness std':>14}{'rank corr':>12}{'seconds':>10}")
+    results = {}
+    for name, scheduler in (('contiguous', None), ('stratified', stratified)):
+        ga.scheduler = scheduler
+        for games in budgets:
+            start = time.time()
+            runs = []
+            for _ in range(repeats):
+                fitness = ga._evaluate_population(game_config, games)
+                runs.append([fitness[i] for i in range(population_size)])
+            elapsed = time.time() - start
+            runs = np.array(runs)
+
+            # Noise of an individual's score and agreement between repeated rankings
+            fitness_std = float(runs.std(axis=0).mean())
+            correlations = [rank_correlation(runs[a], runs[b])
+                            for a in range(repeats) for b in range(a + 1, repeats)]
+            rank_corr = float(np.mean(correlations))
+
+            results[(name, games)] = (fitness_std, rank_corr, elapsed)
+            print(f"{name:<12}{games:>6}{fitness_std:>14.2f}{rank_corr:>12.3f}{elapsed:>10.2f}")
+    return results
+
+
+def bench_import_time(module_names=('modules', 'traits', 'config', 'evaluation', 'matchup',
+                                     'GeneticAlgorithm', 'simulation', 'sweep', 'cli'), repeats=3):
+    """Time importing each module in a fresh interpreter, as a spawned worker would"""
+    import os
+    import subprocess
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    code = "import time; t = time.perf_counter(); import {}; print(time.perf_counter() - t)"
+
+    print(f"{'module':<20}{'import ms':>12}")
+    results = {}
+    for name in module_names:
+        timings = []
+        for _ in range(repeats):
+            output = subprocess.run([sys.executable, '-c', code.format(name)], cwd=package_dir,
+                                    capture_output=True, text=True, check=True).stdout
+            timings.append(float(output))
+        results[name] = 1000 * min(timings)
+        print(f"{name:<20}{results[name]:>12.1f}")
+    return results
+
+
+def bench_player_pooling(num_players=8, games=200, seed=0):
+    """Count allocations made by game setup with fresh players and with pooled players"""
+    import tracemalloc
+    random.seed(seed)
+    game_config = GameConfig(num_players=num_players)
+    lineup = [GeneticTraits() for _ in range(num_players)]
+
+    print(f"{'players':<10}{'blocks/setup':>14}{'KiB/setup':>12}{'ms/game':>10}")
+    results = {}
+    for mode in ('fresh', 'pooled'):
+        pooled_game = MafiaGame(game_config)
+        blocks = size = 0
+        elapsed = 0.0
+        for _ in range(games):
+            game = pooled_game if mode == 'pooled' else MafiaGame(game_config)
+
+            # Only game setup is traced - that is where pooling avoids allocation
+            tracemalloc.start()
+            before = tracemalloc.take_snapshot()
+            game.initialize_game(lineup)
+            after = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            diff = [d for d in after.compare_to(before, 'lineno') if d.count_diff > 0]
+            blocks += sum(d.count_diff for d in diff)
+            size += sum(d.size_diff for d in diff)
+
+            start = time.perf_counter()
+            if mode == 'fresh':
+                game = MafiaGame(game_config)
+            game.initialize_game(lineup)
+            game.run_game()
+            game.get_player_fitness()
+            elapsed += time.perf_counter() - start
+
+        results[mode] = (blocks / games, size / games / 1024, 1000 * elapsed / games)
+        print(f"{mode:<10}{results[mode][0]:>14.1f}{results[mode][1]:>12.1f}{results[mode][2]:>10.3f}")
+    return results
+
+
+def bench_kernel_mode(sizes=(8, 16, 32, 64, 96), game_budget=200, seed=0):
+    """Compare per-game time of the per-seat reference game and the batched kernel game"""
+    print(f"{'players':>8}{'games':>7}{'reference ms':>14}{'kernel ms':>12}{'speedup':>9}{'same':>6}")
+    results = {}
+    for num_players in sizes:
+        random.seed(seed)
+        lineup = [GeneticTraits() for _ in range(num_players)]
+        games = max(2, game_budget // num_players)
+        timings = {}
+        outcomes = {}
+        for kernel_mode in (False, True):
+            game_config = GameConfig(num_players=num_players, kernel_mode=kernel_mode)
+            start = time.perf_counter()
+            outcomes[kernel_mode] = play_games(game_config, lineup, games, seed=seed)
+            timings[kernel_mode] = 1000 * (time.perf_counter() - start) / games
+
+        # Both modes must play identical games under the same seed
+        same = outcomes[False] == outcomes[True]
+        results[num_players] = (timings[False], timings[True], same)
+        print(f"{num_players:>8}{games:>7}{timings[False]:>14.2f}{timings[True]:>12.2f}"
+              f"{timings[False] / timings[True]:>9.2f}{'yes' if same else 'NO':>6}")
+    return results
+
+
+def bench_steady_state(population_size=32, generations=4, games_per_individual=3, workers=4, seed=0):
+    """Evaluation throughput of generational evolution against steady-state evolution"""
+    game_config = GameConfig(num_players=8)
+    runs = [('generational', None), ('steady-state serial', None), (f'steady-state {workers} workers', workers)]
+    results = {}
+    for name, run_workers in runs:
+        random.seed(seed)
+        ga = GeneticAlgorithm(population_size=population_size, num_players=8, verbose=False)
+        start = time.perf_counter()
+        if name == 'generational':
+            ga.evolve(generations, games_per_individual, game_config)
+        else:
+            ga.evolve_async(generations * population_size, games_per_individual, game_config,
+                            workers=run_workers)
+        elapsed = time.perf_counter() - start
+        # A generational table scores all its seats at once, a steady-state table only seat 0
+        games = generations * population_size * games_per_individual
+        if name == 'generational':
+            games //= 8
+        rate = generations * population_size / elapsed
+        results[name] = (rate, games / elapsed)
+        print(f"  {name:<26}{rate:>8.1f} evals/s{games / elapsed:>9.1f} games/s"
+              f"   best {ga.best_fitness_history[-1]:.2f}")
+    return results
+
+
+def bench_snapshot_fork(sizes=(8, 16, 32), repeats=50, seed=0):
+    """Cost of copying a mid-game state with deepcopy against snapshot and restore"""
+    print(f"{'players':>8}{'deepcopy ms':>13}{'snapshot ms':>13}{'restore ms':>12}{'fork ms':>9}")
+    results = {}
+    for num_players in sizes:
+        random.seed(seed)
+        # A private generator, since deepcopy cannot copy the global random module
+        game = MafiaGame(GameConfig(num_players=num_players), random.Random(seed))
+        game.initialize_game([GeneticTraits() for _ in range(num_players)])
+        game.run_game(stop_at=(2, 0))
+        target = MafiaGame(game.config)
+        
+        timings = []
+        for action in (lambda: copy.deepcopy(game), game.snapshot, None, game.fork):
+            if action is None:
+                snapshot = game.snapshot()
+                action = lambda: target.restore(snapshot, restore_random=False)
+            start = time.perf_counter()
+            for _ in range(repeats):
+                action()
+            timings.append(1000 * (time.perf_counter() - start) / repeats)
+        results[num_players] = timings
+        print(f"{num_players:>8}" + ''.join(f"{t:>{w}.3f}" for t, w in zip(timings, (13, 13, 12, 9))))
+    return results
+
+
+def bench_early_stopping(population_size=32, generations=40, games_per_individual=3, seeds=(0, 1, 2)):
+    """Generations and time used with and without the early stopping policy, and where each run ends up"""
+    policies = [('full run', None), ('stop', dict(patience=8)), ('inject', dict(patience=8, action='inject'))]
+    print(f"{'policy':<10}{'generations':>12}{'seconds':>9}{'final best':>12}{'peak best':>11}{'distance':>10}")
+    results = {}
+    for name, options in policies:
+        used = elapsed = final = peak = distance = 0.0
+        for seed in seeds:
+            random.seed(seed)
+            ga = GeneticAlgorithm(population_size=population_size, num_players=8, verbose=False,
+                                  early_stopping=EarlyStopping(**options) if options else None)
+            start = time.perf_counter()
+            _, best, _ = ga.evolve(generations, games_per_individual, GameConfig(num_players=8))
+            elapsed += time.perf_counter() - start
+            used += len(best)
+            final += best[-1]
+            peak += max(best)
+            distance += ga.diversity_history[-1]['mean_distance']
+        row = [v / len(seeds) for v in (used, elapsed, final, peak, distance)]
+        results[name] = row
+        print(f"{name:<10}{row[0]:>12.1f}{row[1]:>9.2f}{row[2]:>12.2f}{row[3]:>11.2f}{row[4]:>10.3f}")
+    return results
+
+
+def bench_ratings(population_size=32, budgets=(1, 2, 4), generations=3, seed_pairs=((1, 2), (3, 4), (5, 6)), seed=0):
+    """
+    Selection quality of per-generation mean fitness against carried-over skill
+    ratings, as the rank correlation between the scores two independently seeded
+    runs give the same genomes (how repeatable the selection is)
+    """
+    game_config = GameConfig(num_players=8)
+    random.seed(seed)
+    population = [GeneticTraits() for _ in range(population_size)]
+    
+    print(f"{'games/gen':>10}{'fitness':>10}{'ratings':>10}")
+    results = {}
+    for budget in budgets:
+        reliability = []
+        for use_ratings in (False, True):
+            correlations = []
+            for pair in seed_pairs:
+                scores = []
+                for run_seed in pair:
+                    random.seed(run_seed)
+                    ga = GeneticAlgorithm(population_size=population_size, num_players=8, verbose=False,
+                                          rating_system=RatingSystem() if use_ratings else None)
+                    # The population is held fixed, so only the estimates change between generations
+                    ga.population = list(population)
+                    for _ in range(generations):
+                        generation_scores = ga._evaluate_population(game_config, budget)
+                    scores.append([generation_scores[i] for i in range(population_size)])
+                correlations.append(rank_correlation(*scores))
+            reliability.append(sum(correlations) / len(correlations))
+        results[budget] = reliability
+        print(f"{budget:>10}{reliability[0]:>10.3f}{reliability[1]:>10.3f}")
+    return results
+
+def bench_backends(population_size=64, generations=3, games_per_individual=4, workers=4, seed=0):
+    """Evaluation throughput of the serial, thread-pool and process-pool backends"""
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f"  GIL {'enabled' if gil else 'disabled (free-threaded build)'}, {workers} workers")
+    game_config = GameConfig(num_players=8)
+    games = generations * population_size * games_per_individual // 8
+    results = {}
+    for backend in ('serial', 'threads', 'processes'):
+        random.seed(seed)
+        ga = GeneticAlgorithm(population_size=population_size, num_players=8, verbose=False,
+                              backend=backend, workers=workers)
+        start = time.perf_counter()
+        ga.evolve(generations, games_per_individual, game_config)
+        elapsed = time.perf_counter() - start
+        results[backend] = games / elapsed
+        print(f"  {backend:<10}{games / elapsed:>9.1f} games/s")
+    return results
+
+
+def bench_policy_batching(num_games=32, delay=0.001, seed=0):
+    """
+    Games played by an external policy on every seat: one policy call per
+    game phase against calls batched across games, with delay seconds of
+    simulated inference per call, and batched calls to the stub policy server
+    """
+    game_config = GameConfig(num_players=8)
+    random.seed(seed)
+    lineups = [[GeneticTraits() for _ in range(8)] for _ in range(num_games)]
+    seats = range(8)
+    
+    async def remote():
+        server = await start_stub_server()
+        runner = PolicyRunner(RemotePolicy(port=server.sockets[0].getsockname()[1]))
+        try:
+            await runner.run(game_config, lineups, seats, seed=seed)
+        finally:
+            await runner.policy.close()
+            server.close()
+            await server.wait_closed()
+        return runner.metrics.summary()
+    
+    runs = {
+        'per game': lambda: run_policy_games(game_config, lineups, HeuristicPolicy(seed, delay), seats,
+                                                 seed=seed, max_batch=1)[1],
+        'batched': lambda: run_policy_games(game_config, lineups, HeuristicPolicy(seed, delay), seats,
+                                            seed=seed)[1],
+        'batched stub server': lambda: asyncio.run(remote()),
+    }
+    print(f"{'mode':<22}{'batches':>8}{'mean size':>10}{'p50 ms':>8}{'p95 ms':>8}{'decisions/s':>13}{'seconds':>9}")
+    results = {}
+    for name, run in runs.items():
+        start = time.perf_counter()
+        metrics = run()
+        elapsed = time.perf_counter() - start
+        results[name] = metrics
+        print(f"{name:<22}{metrics['batches']:>8}{metrics['mean_batch_size']:>10.1f}{metrics['latency_p50_ms']:>8.2f}"
+              f"{metrics['latency_p95_ms']:>8.2f}{metrics['decisions_per_second']:>13.0f}{elapsed:>9.2f}")
+    return results
+
+
+class _TraitRules:
+    """The uncompiled rules: every strategy value re-read from the genome, and bucketed, on each use"""
+    def __init__(self, traits):
+        self.traits = traits
+
+    vote_randomness = property(lambda self: self.traits.vote_randomness)
+    accusation_threshold = property(lambda self: self.traits.accusation_threshold)
+    false_accusation_rate = property(lambda self: self.traits.false_accusation_rate)
+    deception_skill = property(lambda self: self.traits.deception_skill)
+
+    @property
+    def investigation(self):
+        return (INVESTIGATE_SUSPICIOUS if self.traits.detective_investigation_strategy < 0.5
+                else INVESTIGATE_RANDOM)
+
+    @property
+    def protection(self):
+        strategy = self.traits.doctor_protection_strategy
+        if strategy < 0.3:
+            return PROTECT_SELF
+        return PROTECT_VALUABLE if strategy < 0.7 else PROTECT_AT_RISK
+
+
+def bench_compiled_strategy(sizes=(8, 16, 32), repeats=200, seed=0):
+    """
+    Per-call cost of each decision on a mid-game state under the uncompiled
+    trait rules and under compiled strategies, and of compiling a seat's
+    strategy. Both play from the same random state.
+    """
+    print(f"{'players':>8}{'rules':>10}{'compile us':>12}{'vote us':>10}{'statement us':>14}{'night us':>10}")
+    results = {}
+    for num_players in sizes:
+        random.seed(seed)
+        game = MafiaGame(GameConfig(num_players=num_players))
+        game.initialize_game([GeneticTraits() for _ in range(num_players)])
+        game.run_game(stop_at=(2, 0))
+        alive = game.alive_players
+        seats = [game.players[p] for p in alive]
+        state = random.getstate()
+
+        for rules in ('traits', 'compiled'):
+            random.setstate(state)
+            for player in seats:
+                player.strategy = (_TraitRules(player.genetic_traits) if rules == 'traits'
+                                   else CompiledStrategy(player.genetic_traits))
+            decisions = [lambda player: player.get_voting_target(alive),
+                         lambda player: player.make_statement(alive, game.day),
+                         lambda player: player.night_action(alive)]
+            if rules == 'compiled':
+                decisions.insert(0, lambda player: player.compile_strategy())
+
+            timings = [None] if rules == 'traits' else []
+            for decide in decisions:
+                start = time.perf_counter()
+                for _ in range(repeats):
+                    for player in seats:
+                        decide(player)
+                timings.append(1e6 * (time.perf_counter() - start) / (repeats * len(seats)))
+            results[(num_players, rules)] = timings
+            print(f"{num_players:>8}{rules:>10}" + ''.join(f"{'-':>{w}}" if t is None else f"{t:>{w}.2f}"
+                                                            for t, w in zip(timings, (12, 10, 14, 10))))
+    return results
+
+
+def bench_belief_memory(sizes=(50, 100, 200, 400), days=1, seed=0):
+    """Memory held by a game after its first days, with dense and compact belief storage"""
+    print(f"{'players':>8}{'storage':>9}{'start MB':>10}{'after MB':>10}{'per seat KB':>13}{'seconds':>9}")
+    results = {}
+    for num_players in sizes:
+        random.seed(seed)
+        lineup = [GeneticTraits() for _ in range(num_players)]
+        for storage in ('dense', 'compact'):
+            game_config = GameConfig(num_players=num_players, compact_beliefs=storage == 'compact')
+            tracemalloc.start()
+            game = MafiaGame(game_config, random.Random(seed))
+            game.initialize_game(lineup)
+            initial = tracemalloc.get_traced_memory()[0]
+            start = time.perf_counter()
+            game.run_game(stop_at=(days + 1, 0))
+            elapsed = time.perf_counter() - start
+            final = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            del game
+            results[(num_players, storage)] = (initial, final, elapsed)
+            print(f"{num_players:>8}{storage:>9}{initial / 1e6:>10.2f}{final / 1e6:>10.2f}"
+                  f"{final / num_players / 1e3:>13.1f}{elapsed:>9.2f}")
+    return results
+
+
+def bench_archive(population_sizes=(1000, 10000), generations=20, seed=0):
+    """Archive append cost next to one generation's evaluation, and read times by range and filter"""
+    print(f"{'population':>11}{'eval s':>8}{'append ms':>11}{'overhead %':>12}{'range ms':>10}{'filter ms':>11}")
+    results = {}
+    for population_size in population_sizes:
+        random.seed(seed)
+        with tempfile.TemporaryDirectory() as path:
+            archive = GenomeArchive(path)
+            ga = GeneticAlgorithm(population_size=population_size, verbose=False, archive=archive)
+            start = time.perf_counter()
+            fitness = ga._evaluate_population(GameConfig(num_players=8), 1)
+            evaluation = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for _ in range(generations):
+                ga._archive_generation(fitness)
+            archive.flush()
+            append = (time.perf_counter() - start) / generations
+
+            start = time.perf_counter()
+            rows = archive.read((generations // 2, generations // 2 + 5))
+            float(rows['fitness'].sum())
+            range_read = time.perf_counter() - start
+            start = time.perf_counter()
+            archive.read(vote_randomness=(0.0, 0.05), deception_skill=(0.5, 1.0))
+            filter_read = time.perf_counter() - start
+
+        results[population_size] = (evaluation, append, range_read, filter_read)
+        print(f"{population_size:>11}{evaluation:>8.2f}{1000 * append:>11.2f}{100 * append / evaluation:>12.2f}"
+              f"{1000 * range_read:>10.2f}{1000 * filter_read:>11.2f}")
+    return results
+
+
+def bench_belief_recorder(sizes=(8, 32, 128), games=10, seed=0):
+    """Stored bytes per recorded day against dense float64 tensors, and the recorder's cost in game time"""
+    print(f"{'players':>8}{'days':>6}{'KB/day':>9}{'dense KB/day':>14}{'plain ms':>10}{'recorded ms':>13}")
+    results = {}
+    for num_players in sizes:
+        random.seed(seed)
+        lineups = [[GeneticTraits() for _ in range(num_players)] for _ in range(games)]
+        timings = []
+        for recorder in (None, BeliefRecorder()):
+            game = MafiaGame(GameConfig(num_players=num_players), random.Random(seed))
+            game.recorder = recorder
+            start = time.perf_counter()
+            for lineup in lineups:
+                game.initialize_game(lineup)
+                game.run_game()
+            timings.append(1000 * (time.perf_counter() - start) / games)
+
+        days = sum(len(r) for r in recorder.recordings)
+        stored = sum(r.stored_bytes() for r in recorder.recordings) / days
+        dense = 5 * num_players ** 2 * 8
+        results[num_players] = (days, stored, dense, *timings)
+        print(f"{num_players:>8}{days:>6}{stored / 1e3:>9.1f}{dense / 1e3:>14.1f}{timings[0]:>10.2f}{timings[1]:>13.2f}")
+    return results
+
+
+def bench_coevolution(tables=8, checkpoints=(2, 5, 10), games_per_individual=3, pool_size=32, blocks=4, seed=0):
+    """
+    Held-out pool score against games simulated for one mixed population and
+    for role-specialized co-evolution with the same number of genomes. The
+    single population is scored by its elite in every seat; co-evolution by
+    each role's elite in the seats dealt that role, over the same pool games.
+    """
+    game_config = GameConfig(num_players=8)
+    pool = OpponentPool.generate(pool_size, seed=seed + 1000, name='held-out')
+    game = create_game(game_config)
+    table_roles = game_config.get_roles()
+
+    random.seed(seed)
+    single = GeneticAlgorithm(population_size=tables * 8, num_players=8, verbose=False)
+    random.seed(seed)
+    coevolution = CoevolutionGA(num_players=8, tables=tables, game_config=game_config, verbose=False)
+
+    print(f"{'generation':>10}{'games':>8}{'single':>9}{'coevolved':>11}")
+    results = {}
+    done = 0
+    for generations in checkpoints:
+        single.evolve(generations - done, games_per_individual, game_config)
+        coevolution.evolve(generations - done, games_per_individual)
+        done = generations
+
+        games = generations * tables * games_per_individual
+        best = single.population[0]
+        champions = coevolution.champions()
+        single_score = sum(pool.play_block(best, game_config, block, game) for block in range(blocks)) / blocks
+        coevolved_score = sum(pool.play_seat(champions[role], game_config, block, seat, game)
+                              for block in range(blocks)
+                              for seat, role in enumerate(table_roles)) / (blocks * len(table_roles))
+        results[generations] = (games, single_score, coevolved_score)
+        print(f"{generations:>10}{games:>8}{single_score:>9.2f}{coevolved_score:>11.2f}")
+    return results
+
+
+def bench_telemetry(population_size=64, generations=5, games_per_individual=4, intervals=(1.0, 0.01),
+                    repeats=5, seed=0):
+    """Best-of-repeats evolution time with telemetry off and exported at several intervals, and the snapshots written"""
+    game_config = GameConfig(num_players=8)
+    print(f"{'interval':>10}{'seconds':>9}{'snapshots':>11}")
+    results = {}
+    for interval in (None,) + tuple(intervals):
+        elapsed = float('inf')
+        for _ in range(repeats):
+            with tempfile.TemporaryDirectory() as path:
+                telemetry = RunTelemetry(path, interval=interval) if interval else None
+                random.seed(seed)
+                ga = GeneticAlgorithm(population_size=population_size, num_players=8, verbose=False,
+                                      telemetry=telemetry)
+                start = time.perf_counter()
+                ga.evolve(generations, games_per_individual, game_config)
+                elapsed = min(elapsed, time.perf_counter() - start)
+                snapshots = 0
+                if telemetry:
+                    telemetry.close()
+                    with open(telemetry.jsonl_path) as f:
+                        snapshots = sum(1 for _ in f)
+        label = f"{interval:.2f}s" if interval else 'off'
+        results[label] = (elapsed, snapshots)
+        print(f"{label:>10}{elapsed:>9.3f}{snapshots:>11}")
+    return results
+
+
+def bench_time_budget(budgets=(0.5, 1.0, 2.0, 4.0), population_size=64, num_players=(8, 16), max_generations=20,
+                      max_games_per_individual=20, seed=0):
+    """Wall time used against the budget, with the generations and games per individual the budget chose"""
+    print(f"{'players':>8}{'budget':>8}{'used':>8}{'generations':>13}{'games/ind':>11}{'final best':>12}")
+    results = {}
+    for players in num_players:
+        game_config = GameConfig(num_players=players)
+        for seconds in budgets:
+            random.seed(seed)
+            budget = TimeBudget(seconds)
+            ga = GeneticAlgorithm(population_size=population_size, num_players=players, verbose=False,
+                                  time_budget=budget)
+            start = time.perf_counter()
+            _, best, _ = ga.evolve(max_generations, max_games_per_individual, game_config)
+            used = time.perf_counter() - start
+            games = budget.summary()['games_per_individual']
+            mean_games = sum(games) / len(games) if games else 0.0
+            results[(players, seconds)] = (used, len(best), mean_games, best[-1] if best else None)
+            print(f"{players:>8}{seconds:>8.1f}{used:>8.2f}{len(best):>13}{mean_games:>11.1f}"
+                  f"{best[-1] if best else float('nan'):>12.2f}")
+    return results
+
+
+BENCHMARKS = {
+    'seating': bench_seating_variance,
+    'imports': bench_import_time,
+    'pooling': bench_player_pooling,
+    'kernel': bench_kernel_mode,
+    'steady-state': bench_steady_state,
+    'snapshot': bench_snapshot_fork,
+    'early-stopping': bench_early_stopping,
+    'ratings': bench_ratings,
+    'backends': bench_backends,
+    'policy': bench_policy_batching,
+    'compile': bench_compiled_strategy,
+    'belief-memory': bench_belief_memory,
+    'archive': bench_archive,
+    'recorder': bench_belief_recorder,
+    'coevolution': bench_coevolution,
+    'telemetry': bench_telemetry,
+    'time-budget': bench_time_budget,
+}
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        print(f"== {name} ==")
+        BENCHMARKS[name]()
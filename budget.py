@@ -0,0 +1,88 @@
+from modules import math,time,Dict,Optional
+
+class TimeBudget:
+    """
+    Wall-clock budget policy for GeneticAlgorithm.evolve.
+
+    The run gets `seconds` of wall time from the start of evolve. Before each
+    generation the policy predicts the cost of an evaluation round (one game
+    per individual) and of breeding from what earlier generations took,
+    pessimistically at the mean plus `safety` standard deviations, since a
+    game lasts anywhere from one day to max_days. The remaining time is
+    spread over the generations num_generations still allows, giving between
+    min_games_per_individual and the evolve argument games per individual;
+    the run ends once not even the minimum fits. The first generation plays
+    the minimum to calibrate the estimates. A generation still being
+    evaluated at the deadline is abandoned and discarded.
+    """
+    def __init__(self, seconds: float, min_games_per_individual: int = 1, safety: float = 2.0,
+                 smoothing: float = 0.3):
+        self.seconds = seconds
+        self.min_games_per_individual = min_games_per_individual
+        self.safety = safety
+        self.smoothing = smoothing   # Weight of the newest generation in the running estimates
+        self.start()
+
+    def start(self):
+        """Start the clock and forget earlier estimates"""
+        self.deadline = time.perf_counter() + self.seconds
+        self.history = []
+        self._round = None      # (mean, variance) of evaluation seconds per game per individual
+        self._overhead = None   # (mean, variance) of the rest of a generation
+
+    def remaining(self) -> float:
+        return self.deadline - time.perf_counter()
+
+    def _estimate(self, stats) -> float:
+        mean, variance = stats
+        return mean + self.safety * math.sqrt(variance)
+
+    def _update(self, stats, value):
+        """Exponentially weighted mean and variance"""
+        if stats is None:
+            return (value, 0.0)
+        mean, variance = stats
+        diff = value - mean
+        increment = self.smoothing * diff
+        return (mean + increment, (1 - self.smoothing) * (variance + diff * increment))
+
+    def predict(self, games_per_individual: int) -> Optional[float]:
+        """Pessimistic seconds for a generation at games_per_individual, or None before calibration"""
+        if self._round is None:
+            return None
+        return games_per_individual * self._estimate(self._round) + self._estimate(self._overhead)
+
+    def plan(self, generations_left: int, max_games_per_individual: int) -> Optional[int]:
+        """Games per individual for the next generation, or None to end the run"""
+        remaining = self.remaining()
+        minimum = min(self.min_games_per_individual, max_games_per_individual)
+        if remaining <= 0:
+            return None
+        if self._round is None:
+            return minimum
+
+        round_cost = max(self._estimate(self._round), 1e-9)
+        share = remaining / max(generations_left, 1) - self._estimate(self._overhead)
+        games = min(max_games_per_individual, max(minimum, int(share // round_cost)))
+        if self.predict(games) > remaining:
+            return None
+        return games
+
+    def observe(self, games_per_individual: int, evaluation_seconds: float, other_seconds: float):
+        """Update the estimates with a finished generation"""
+        self.history.append({
+            'games_per_individual': games_per_individual,
+            'predicted_seconds': self.predict(games_per_individual),
+            'seconds': evaluation_seconds + other_seconds,
+        })
+        self._round = self._update(self._round, evaluation_seconds / games_per_individual)
+        self._overhead = self._update(self._overhead, other_seconds)
+
+    def summary(self) -> Dict:
+        """Generations run, games per individual used and budget left over"""
+        return {
+            'generations': len(self.history),
+            'games_per_individual': [h['games_per_individual'] for h in self.history],
+            'seconds_used': self.seconds - self.remaining(),
+            'seconds_left': self.remaining(),
+        }
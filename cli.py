@@ -0,0 +1,386 @@
+"""
+Command line interface for the Mafia AI Agent
+---------------------------------------------
+Subcommands: evolve, bench, matchup, replay, sweep, tune, policy-server
+and policy-games.
+
+Only argparse and the standard library are imported up front; each
+subcommand imports the simulation modules it needs when it runs, so
+`--help` and light subcommands start fast. Pass --import-time to see
+how long those imports took.
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+
+_import_times = []
+
+def _timed_import(name):
+    """Import a module by name, recording how long it took"""
+    import importlib
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    _import_times.append((name, time.perf_counter() - start))
+    return module
+
+def _add_game_config_args(parser):
+    parser.add_argument('--num-players', type=int, default=8)
+    parser.add_argument('--mafia-ratio', type=float, default=0.25)
+    parser.add_argument('--detective-prob', type=float, default=0.125)
+    parser.add_argument('--doctor-prob', type=float, default=0.125)
+    parser.add_argument('--exact-beliefs', action='store_true',
+                        help="Use exact inference over role assignments")
+    parser.add_argument('--kernel', action='store_true',
+                        help="Batch all seats' decisions on a game-wide belief tensor")
+    parser.add_argument('--compact-beliefs', action='store_true',
+                        help="Store beliefs as a shared prior plus sparse float32 deltas")
+
+def _game_config(args):
+    config = _timed_import('config')
+    return config.GameConfig(num_players=args.num_players, mafia_ratio=args.mafia_ratio,
+                             detective_prob=args.detective_prob, doctor_prob=args.doctor_prob,
+                             exact_beliefs=args.exact_beliefs, kernel_mode=args.kernel,
+                             compact_beliefs=args.compact_beliefs)
+
+def _load_population(path):
+    """Load trait sets saved by `evolve --save`"""
+    traits = _timed_import('traits')
+    with open(path) as f:
+        return [traits.GeneticTraits.from_vector([entry[name] for name in traits.TRAIT_NAMES])
+                for entry in json.load(f)]
+
+def cmd_evolve(args):
+    if args.inject_diversity and args.patience is None and args.min_diversity is None:
+        sys.exit("--inject-diversity needs --patience or --min-diversity to decide when to inject")
+    if args.backend != 'serial' and (args.opponent_pool or args.ratings or args.balanced_seating):
+        sys.exit(f"--backend {args.backend} cannot be combined with --opponent-pool, --ratings or --balanced-seating")
+    steady_state_options = {'--time-budget': args.time_budget, '--patience': args.patience,
+                            '--min-diversity': args.min_diversity, '--surrogate': args.surrogate,
+                            '--opponent-pool': args.opponent_pool, '--eval-store': args.eval_store,
+                            '--ratings': args.ratings, '--balanced-seating': args.balanced_seating,
+                            '--archive': args.archive}
+    unsupported = [flag for flag, value in steady_state_options.items() if value not in (None, False)]
+    if args.steady_state and unsupported:
+        sys.exit(f"--steady-state cannot be combined with {', '.join(unsupported)}")
+    simulation = _timed_import('simulation')
+    print("Mafia AI Agent with Genetic Algorithms and Propositional Logic")
+    print("------------------------------------------------------------")
+
+    best_population, best_fitness, avg_fitness, game_log = simulation.run_simulation(
+        generations=args.generations,
+        population_size=args.population_size,
+        num_players=args.num_players,
+        games_per_individual=args.games_per_individual,
+        balanced_seating=args.balanced_seating,
+        surrogate_method=args.surrogate,
+        surrogate_oversample=args.surrogate_oversample,
+        surrogate_exploration=args.surrogate_exploration,
+        exact_beliefs=args.exact_beliefs,
+        kernel_mode=args.kernel,
+        compact_beliefs=args.compact_beliefs,
+        steady_state=args.steady_state,
+        workers=args.workers,
+        patience=args.patience,
+        min_diversity=args.min_diversity,
+        inject_diversity=args.inject_diversity,
+        opponent_pool_path=args.opponent_pool,
+        evaluation_store_path=args.eval_store,
+        skill_ratings=args.ratings,
+        backend=args.backend,
+        archive_path=args.archive,
+        telemetry_path=args.telemetry,
+        telemetry_interval=args.telemetry_interval,
+        time_budget=args.time_budget
+    )
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump([vars(traits) for traits in best_population], f, indent=1)
+        print(f"\nSaved evolved population to {args.save}")
+
+    print("\nEvolution complete. The AI agents have evolved strategies for")
+    print("deception, trust building, and probabilistic reasoning in social deduction games.")
+
+def cmd_bench(args):
+    benchmarks = _timed_import('benchmarks')
+    names = args.names or list(benchmarks.BENCHMARKS)
+    for name in names:
+        if name not in benchmarks.BENCHMARKS:
+            sys.exit(f"Unknown benchmark {name!r}, choose from: {', '.join(benchmarks.BENCHMARKS)}")
+        print(f"== {name} ==")
+        benchmarks.BENCHMARKS[name]()
+
+def cmd_matchup(args):
+    matchup = _timed_import('matchup')
+    game_config = _game_config(args)
+    if args.population:
+        lineup = _load_population(args.population)[:args.num_players]
+    else:
+        traits = _timed_import('traits')
+        lineup = [traits.GeneticTraits() for _ in range(args.num_players)]
+
+    result = matchup.estimate_matchup(lineup, game_config, team=args.team, tolerance=args.tolerance,
+                                      confidence=args.confidence, batch_size=args.batch_size,
+                                      max_games=args.max_games, workers=args.workers,
+                                      seed=args.seed, max_days=args.max_days)
+    low, high = result.ci
+    print(f"{result.team} win probability: {result.win_probability:.3f} "
+          f"({100 * result.confidence:.0f}% CI {low:.3f}-{high:.3f})")
+    print(f"Games played: {result.games} ({'converged' if result.converged else 'budget exhausted'}), "
+          f"draws: {result.draws}, mean days: {result.mean_days:.2f}")
+    for seat, fitness in enumerate(result.seat_fitness):
+        print(f"  Seat {seat}: mean fitness {fitness:.2f}")
+
+def cmd_replay(args):
+    evaluation = _timed_import('evaluation')
+    game_config = _game_config(args)
+    lineup = _load_population(args.population)[:args.num_players] if args.population else None
+
+    # Replays are reproducible: the same seed and lineup give the same game
+    rng = random.Random(args.seed if args.seed is not None else 0)
+    if lineup is None:
+        traits = _timed_import('traits')
+        lineup = [traits.GeneticTraits(rng) for _ in range(args.num_players)]
+    game = evaluation.create_game(game_config, rng)
+    if args.record:
+        recorder = _timed_import('recorder')
+        game.recorder = recorder.BeliefRecorder()
+    game.initialize_game(lineup)
+    winning_team, days_played = game.run_game(args.max_days)
+    if args.record:
+        game.recorder.save(args.record)
+
+    for entry in game.log:
+        print(f"  {entry}")
+    print(f"\nWinning Team: {winning_team}")
+    print(f"Days Played: {days_played}")
+
+def cmd_policy_server(args):
+    policy = _timed_import('policy')
+    policy.serve_stub_policy(args.host, args.port, args.delay)
+
+def cmd_policy_games(args):
+    policy_module = _timed_import('policy')
+    traits = _timed_import('traits')
+    game_config = _game_config(args)
+    if args.population:
+        lineup = _load_population(args.population)[:args.num_players]
+        lineups = [lineup] * args.games
+    else:
+        rng = random.Random(args.seed)
+        lineups = [[traits.GeneticTraits(rng) for _ in range(args.num_players)] for _ in range(args.games)]
+
+    if args.port:
+        policy = policy_module.RemotePolicy(args.host, args.port)
+    else:
+        policy = policy_module.HeuristicPolicy(seed=args.seed)
+    seats = args.seats if args.seats is not None else range(args.num_players)
+    results, metrics = policy_module.run_policy_games(game_config, lineups, policy, seats, args.max_days,
+                                                      seed=args.seed, max_batch=args.max_batch)
+
+    winners = [winning_team for winning_team, _, _ in results]
+    print(f"Games: {len(results)}, town wins: {winners.count('TOWN')}, mafia wins: {winners.count('MAFIA')}, "
+          f"draws: {winners.count(None)}")
+    for key, value in metrics.items():
+        print(f"  {key}: {value:.2f}" if isinstance(value, float) else f"  {key}: {value}")
+
+def _parse_grid_value(text):
+    """Parse a grid value as int, then float, falling back to the raw string"""
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            pass
+    return text
+
+def cmd_sweep(args):
+    sweep = _timed_import('sweep')
+    grid = {}
+    for item in args.grid:
+        key, _, values = item.partition('=')
+        grid[key.replace('-', '_')] = [_parse_grid_value(v) for v in values.split(',')]
+    base = {'generations': args.generations, 'population_size': args.population_size,
+            'games_per_individual': args.games_per_individual}
+
+    results = sweep.run_sweep(grid, base=base, seeds=args.seeds, balance_games=args.balance_games,
+                              workers=args.workers, cache_path=args.cache)
+    print(sweep.format_summary(results))
+
+def cmd_tune(args):
+    tuning = _timed_import('tuning')
+    config = _timed_import('config')
+    results = tuning.run_search(budget=args.budget, min_generations=args.min_generations,
+                                max_generations=args.max_generations, eta=args.eta, num_trials=args.trials,
+                                population_size=args.population_size,
+                                games_per_individual=args.games_per_individual,
+                                game_config=config.GameConfig(num_players=args.num_players),
+                                pool_games=args.pool_games, workers=args.workers,
+                                seed=args.seed if args.seed is not None else 0)
+    print(tuning.format_search(results))
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=1)
+
+def cmd_equivalence(args):
+    equivalence = _timed_import('equivalence')
+    report = equivalence.compare_backends(args.candidate, args.scenarios,
+                                          seed=args.seed if args.seed is not None else 0,
+                                          tolerance=args.tolerance, min_players=args.min_players,
+                                          max_players=args.max_players, workers=args.workers)
+    print(equivalence.format_report(report, show=args.show))
+    if report['divergent']:
+        sys.exit(1)
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='mafia-ai', description="Mafia AI Agent with Genetic Algorithms")
+    parser.add_argument('--seed', type=int, default=None, help="Seed the random number generator")
+    parser.add_argument('--import-time', action='store_true', help="Report time spent importing modules")
+    subparsers = parser.add_subparsers(dest='command')
+
+    evolve = subparsers.add_parser('evolve', help="Evolve a population (run_simulation)")
+    evolve.add_argument('--generations', type=int, default=10)
+    evolve.add_argument('--population-size', type=int, default=32)
+    evolve.add_argument('--num-players', type=int, default=8)
+    evolve.add_argument('--games-per-individual', type=int, default=4)
+    evolve.add_argument('--balanced-seating', action='store_true',
+                        help="Reshuffle tables and balance role exposure between games")
+    evolve.add_argument('--surrogate', choices=('ridge', 'knn'), default=None,
+                        help="Pre-screen offspring with a surrogate fitness model")
+    evolve.add_argument('--surrogate-oversample', type=int, default=4)
+    evolve.add_argument('--surrogate-exploration', type=float, default=0.2)
+    evolve.add_argument('--exact-beliefs', action='store_true',
+                        help="Use exact inference over role assignments")
+    evolve.add_argument('--kernel', action='store_true',
+                        help="Batch all seats' decisions on a game-wide belief tensor")
+    evolve.add_argument('--compact-beliefs', action='store_true',
+                        help="Store beliefs as a shared prior plus sparse float32 deltas")
+    evolve.add_argument('--steady-state', action='store_true',
+                        help="Asynchronous steady-state evolution (generations x population-size evaluations)")
+    evolve.add_argument('--workers', type=int, default=None,
+                        help="Workers for --steady-state and the threads/processes backends")
+    evolve.add_argument('--backend', choices=('serial', 'threads', 'processes'), default='serial',
+                        help="Run table games in this thread, a thread pool or a process pool")
+    evolve.add_argument('--patience', type=int, default=None,
+                        help="Stop after this many generations without best-fitness improvement")
+    evolve.add_argument('--min-diversity', type=float, default=None,
+                        help="Stop once the mean pairwise trait distance falls below this")
+    evolve.add_argument('--inject-diversity', action='store_true',
+                        help="Inject random genomes instead of stopping on convergence")
+    evolve.add_argument('--opponent-pool', default=None,
+                        help="Score against a fixed opponent pool JSON file (a random pool is created if missing)")
+    evolve.add_argument('--eval-store', default=None,
+                        help="SQLite file of stored pool evaluations, shared across runs")
+    evolve.add_argument('--ratings', action='store_true',
+                        help="Select on per-role skill ratings kept across generations")
+    evolve.add_argument('--archive', default=None,
+                        help="Directory of the columnar archive every evaluated generation is appended to")
+    evolve.add_argument('--time-budget', type=float, default=None,
+                        help="Wall-clock seconds for a generational run; --generations and --games-per-individual become upper bounds")
+    evolve.add_argument('--telemetry', default=None,
+                        help="Directory to write live telemetry.jsonl and Prometheus metrics.prom to")
+    evolve.add_argument('--telemetry-interval', type=float, default=5.0,
+                        help="Seconds between telemetry snapshots")
+    evolve.add_argument('--save', default=None, help="Write the evolved population to a JSON file")
+    evolve.set_defaults(func=cmd_evolve)
+
+    bench = subparsers.add_parser('bench', help="Run benchmarks")
+    bench.add_argument('names', nargs='*', help="Benchmarks to run (default: all)")
+    bench.set_defaults(func=cmd_bench)
+
+    matchup = subparsers.add_parser('matchup', help="Estimate a lineup's win probability")
+    _add_game_config_args(matchup)
+    matchup.add_argument('--population', default=None, help="JSON population from `evolve --save`")
+    matchup.add_argument('--team', choices=('TOWN', 'MAFIA'), default='TOWN')
+    matchup.add_argument('--tolerance', type=float, default=0.03)
+    matchup.add_argument('--confidence', type=float, default=0.95)
+    matchup.add_argument('--batch-size', type=int, default=50)
+    matchup.add_argument('--max-games', type=int, default=5000)
+    matchup.add_argument('--max-days', type=int, default=20)
+    matchup.add_argument('--workers', type=int, default=None)
+    matchup.set_defaults(func=cmd_matchup)
+
+    replay = subparsers.add_parser('replay', help="Replay and print a single seeded game")
+    _add_game_config_args(replay)
+    replay.add_argument('--population', default=None, help="JSON population from `evolve --save`")
+    replay.add_argument('--max-days', type=int, default=20)
+    replay.add_argument('--record', default=None,
+                        help="Save the per-day beliefs and trust of the game to this .npz file")
+    replay.set_defaults(func=cmd_replay)
+
+    sweep = subparsers.add_parser('sweep', help="Sweep GameConfig and GA parameters")
+    sweep.add_argument('grid', nargs='+', help="Grid axes such as mafia_ratio=0.2,0.25 num_players=6,8")
+    sweep.add_argument('--generations', type=int, default=10)
+    sweep.add_argument('--population-size', type=int, default=32)
+    sweep.add_argument('--games-per-individual', type=int, default=3)
+    sweep.add_argument('--seeds', type=int, nargs='+', default=[0])
+    sweep.add_argument('--balance-games', type=int, default=200)
+    sweep.add_argument('--workers', type=int, default=None)
+    sweep.add_argument('--cache', default='sweep_cache.sqlite')
+    sweep.set_defaults(func=cmd_sweep)
+
+    tune = subparsers.add_parser('tune', help="Search GA hyperparameters with successive halving")
+    tune.add_argument('--budget', type=int, default=240, help="Total GA generations across all trials")
+    tune.add_argument('--trials', type=int, default=None, help="Trials to start (default: as many as fit the budget)")
+    tune.add_argument('--min-generations', type=int, default=3, help="Generations before the first pruning")
+    tune.add_argument('--max-generations', type=int, default=27)
+    tune.add_argument('--eta', type=int, default=3, help="Keep the best 1/eta trials at each checkpoint")
+    tune.add_argument('--population-size', type=int, default=16)
+    tune.add_argument('--num-players', type=int, default=8)
+    tune.add_argument('--games-per-individual', type=int, default=3)
+    tune.add_argument('--pool-games', type=int, default=16, help="Opponent pool games scoring each elite")
+    tune.add_argument('--workers', type=int, default=None)
+    tune.add_argument('--save', default=None, help="Write the ranked trials as JSON")
+    tune.set_defaults(func=cmd_tune)
+
+    equivalence = subparsers.add_parser('equivalence', help="Check a game backend against the reference on random scenarios")
+    equivalence.add_argument('candidate', choices=('reference', 'kernel', 'compact'))
+    equivalence.add_argument('--scenarios', type=int, default=1000)
+    equivalence.add_argument('--tolerance', type=float, default=1e-9, help="Largest belief or trust difference allowed")
+    equivalence.add_argument('--min-players', type=int, default=5)
+    equivalence.add_argument('--max-players', type=int, default=16)
+    equivalence.add_argument('--workers', type=int, default=None)
+    equivalence.add_argument('--show', type=int, default=3, help="Divergences to print")
+    equivalence.set_defaults(func=cmd_equivalence)
+
+    server = subparsers.add_parser('policy-server', help="Serve the stub external policy over TCP")
+    server.add_argument('--host', default='127.0.0.1')
+    server.add_argument('--port', type=int, default=8765)
+    server.add_argument('--delay', type=float, default=0.0, help="Simulated inference seconds per batch")
+    server.set_defaults(func=cmd_policy_server)
+
+    policy_games = subparsers.add_parser('policy-games', help="Play games with seats driven by an external policy")
+    _add_game_config_args(policy_games)
+    policy_games.add_argument('--games', type=int, default=64)
+    policy_games.add_argument('--seats', type=int, nargs='*', default=None,
+                              help="Seats played by the policy (default: all)")
+    policy_games.add_argument('--host', default='127.0.0.1')
+    policy_games.add_argument('--port', type=int, default=None,
+                              help="Policy server port (default: in-process stub policy)")
+    policy_games.add_argument('--max-batch', type=int, default=None)
+    policy_games.add_argument('--max-days', type=int, default=20)
+    policy_games.add_argument('--population', default=None, help="JSON population from `evolve --save`")
+    policy_games.set_defaults(func=cmd_policy_games)
+
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        # Bare invocation keeps the original main.py behaviour
+        args = parser.parse_args((sys.argv[1:] if argv is None else list(argv)) + ['evolve'])
+
+    if args.seed is not None:
+        random.seed(args.seed)
+    args.func(args)
+
+    if args.import_time:
+        print("\nImport times:", file=sys.stderr)
+        for name, seconds in _import_times:
+            print(f"  {name:<20}{1000 * seconds:>8.1f} ms", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
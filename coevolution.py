@@ -0,0 +1,95 @@
+from modules import random,List,Dict
+from GeneticAlgorithm import GeneticAlgorithm
+from config import GameConfig
+from evaluation import create_game
+
+class CoevolutionGA:
+    """
+    Role-specialized co-evolution: one sub-population per role.
+
+    Every table is seated with one genome per seat drawn from the population
+    of the role that seat is dealt, so each game selects directly on the genes
+    each role uses. Each role population holds its number of seats at a table
+    times `tables` genomes, so every genome plays once per round, and is bred
+    by its own GeneticAlgorithm on the fitness calculate_fitness gives that role.
+    """
+    def __init__(self, num_players=8, tables=8, elitism_rate=0.2, mutation_rate=0.1,
+                 mutation_strength=0.2, tournament_size=3, game_config: GameConfig = None, verbose=True):
+        self.num_players = num_players
+        self.tables = tables
+        self.game_config = game_config or GameConfig(num_players=num_players)
+        self.verbose = verbose
+
+        table_roles = self.game_config.get_roles()
+        self.seats = {role: table_roles.count(role) for role in dict.fromkeys(table_roles)}
+        self.role_gas = {
+            role: GeneticAlgorithm(population_size=seats * tables, num_players=num_players,
+                                   elitism_rate=elitism_rate, mutation_rate=mutation_rate,
+                                   mutation_strength=mutation_strength, tournament_size=tournament_size,
+                                   verbose=False)
+            for role, seats in self.seats.items()
+        }
+
+        self.generation = 0
+        self.games_played = 0
+        self.best_fitness_history = {role: [] for role in self.role_gas}
+        self.avg_fitness_history = {role: [] for role in self.role_gas}
+
+    @property
+    def populations(self) -> Dict[str, List]:
+        return {role: ga.population for role, ga in self.role_gas.items()}
+
+    def champions(self) -> Dict[str, object]:
+        """Best genome of each role from the last evaluated generation - elites lead each population"""
+        return {role: ga.population[0] for role, ga in self.role_gas.items()}
+
+    def evolve(self, num_generations=50, games_per_individual=5):
+        """Run the co-evolution for a number of generations; returns the role populations and histories"""
+        for gen in range(num_generations):
+            self.generation = gen + 1
+            self._log(f"Generation {self.generation}...")
+
+            fitness = self._evaluate_populations(games_per_individual)
+            for role, ga in self.role_gas.items():
+                scores = fitness[role]
+                self.best_fitness_history[role].append(max(scores.values()))
+                self.avg_fitness_history[role].append(sum(scores.values()) / len(scores))
+                self._log(f"  {role:<10} best {self.best_fitness_history[role][-1]:.2f}, "
+                          f"average {self.avg_fitness_history[role][-1]:.2f}")
+                ga._generate_new_population(scores)
+
+        return self.populations, self.best_fitness_history, self.avg_fitness_history
+
+    def _evaluate_populations(self, games_per_individual) -> Dict[str, Dict[int, float]]:
+        """Play games_per_individual rounds of tables, each genome seated once per round in its role"""
+        totals = {role: [0.0] * ga.population_size for role, ga in self.role_gas.items()}
+        game = create_game(self.game_config)
+        roles = self.game_config.get_roles()
+
+        for _ in range(games_per_individual):
+            # Deal each role population out across the tables in a fresh order
+            queues = {}
+            for role, ga in self.role_gas.items():
+                order = list(range(ga.population_size))
+                random.shuffle(order)
+                queues[role] = order
+
+            for _ in range(self.tables):
+                random.shuffle(roles)
+                seats = [(role, queues[role].pop()) for role in roles]
+                group = [self.role_gas[role].population[idx] for role, idx in seats]
+
+                game.initialize_game(group, roles=roles)
+                game.run_game()
+                self.games_played += 1
+
+                for seat, score in game.get_player_fitness().items():
+                    role, idx = seats[seat]
+                    totals[role][idx] += score
+
+        return {role: {idx: total / games_per_individual for idx, total in enumerate(role_totals)}
+                for role, role_totals in totals.items()}
+
+    def _log(self, message):
+        if self.verbose:
+            print(message)
@@ -0,0 +1,170 @@
+from modules import np,List,Tuple,Dict
+from constants import ROLES
+from belief import BeliefSystem
+
+NUM_ROLES = len(ROLES)
+TRUST = NUM_ROLES        # Column of the delta table holding trust
+TRUST_PRIOR = 0.5
+
+class BeliefColumn:
+    """
+    One role's beliefs, or the trust levels, of a CompactBeliefSystem.
+    Indexing by subject reads and writes like the dense vector it replaces.
+    """
+    __slots__ = ('owner', 'column')
+
+    def __init__(self, owner: 'CompactBeliefSystem', column: int):
+        self.owner = owner
+        self.column = column
+
+    def __getitem__(self, subject: int) -> float:
+        return self.owner._get(subject, self.column)
+
+    def __setitem__(self, subject: int, value: float):
+        self.owner._set(subject, self.column, value)
+
+    def __len__(self):
+        return self.owner.num_players
+
+    def tolist(self) -> List[float]:
+        return self.owner._dense(self.column).tolist()
+
+    def __array__(self, dtype=None, copy=None):
+        return self.owner._dense(self.column).astype(dtype or np.float64, copy=False)
+
+class CompactBeliefSystem(BeliefSystem):
+    """
+    BeliefSystem that stores beliefs as a shared prior plus sparse deltas.
+
+    Subjects the observer never gained evidence about all hold the same
+    prior, so only touched subjects get a row - role beliefs then trust - in
+    a small float32 table. Statement and vote records, which every observer
+    of an event holds identical copies of, are the single record the game
+    makes for each event. The update rules are BeliefSystem's; with
+    dtype=np.float64 the results match it exactly.
+    """
+    def __init__(self, player_id: int, num_players: int, dtype=np.float32):
+        self.dtype = np.dtype(dtype)
+        super().__init__(player_id, num_players)
+
+    def _init_storage(self):
+        self._prior = 1.0 / self.num_players   # Role belief of every subject without a row
+        self._rows = {}                         # subject -> row of _table
+        self._table = np.empty((4, NUM_ROLES + 1), dtype=self.dtype)
+        self.role_beliefs = {role: BeliefColumn(self, index) for role, index in ROLES.items()}
+        self.trust_levels = BeliefColumn(self, TRUST)
+
+        # Own role certainty and full self-trust
+        row = self._row(self.player_id)
+        self._table[row, :NUM_ROLES] = 0.0
+        self._table[row, TRUST] = 1.0
+
+    def reset(self):
+        self._rows.clear()
+        self._prior = 1.0 / self.num_players
+        row = self._row(self.player_id)
+        self._table[row, :NUM_ROLES] = 0.0
+        self._table[row, TRUST] = 1.0
+
+        for facts in self.known_facts.values():
+            facts.clear()
+        self.observations.clear()
+        self.voting_history.clear()
+        self.player_statements.clear()
+
+    def _storage_state(self):
+        table = self._table[:len(self._rows)].copy()
+        table.flags.writeable = False
+        return {'prior': self._prior, 'rows': dict(self._rows), 'table': table}
+
+    def _load_storage_state(self, state):
+        self._prior = state['prior']
+        self._rows = dict(state['rows'])
+        if len(self._table) < len(state['table']):
+            self._table = np.empty((len(state['table']), NUM_ROLES + 1), dtype=self.dtype)
+        self._table[:len(state['table'])] = state['table']
+
+    def bind_storage(self, role_beliefs, trust_levels):
+        raise ValueError("Compact beliefs cannot be bound to a dense belief tensor")
+
+    # -- Storage -----------------------------------------------------------
+
+    def _row(self, subject: int) -> int:
+        """Row of the subject in the delta table, created from the prior on first use"""
+        row = self._rows.get(subject)
+        if row is None:
+            row = len(self._rows)
+            if row == len(self._table):
+                grown = np.empty((2 * row, NUM_ROLES + 1), dtype=self.dtype)
+                grown[:row] = self._table
+                self._table = grown
+            self._table[row, :NUM_ROLES] = self._prior
+            self._table[row, TRUST] = TRUST_PRIOR
+            self._rows[subject] = row
+        return row
+
+    def _get(self, subject: int, column: int) -> float:
+        row = self._rows.get(subject)
+        if row is None:
+            return TRUST_PRIOR if column == TRUST else self._prior
+        return float(self._table[row, column])
+
+    def _set(self, subject: int, column: int, value: float):
+        row = self._row(subject)  # May grow the table
+        self._table[row, column] = value
+
+    def _dense(self, column: int):
+        """Full vector of one column, built on demand"""
+        dense = np.full(self.num_players, TRUST_PRIOR if column == TRUST else self._prior)
+        for subject, row in self._rows.items():
+            dense[subject] = self._table[row, column]
+        return dense
+
+    def _normalize_beliefs(self):
+        """Normalize the prior and every stored row, as BeliefSystem does for all subjects"""
+        prior = self._prior
+        self._prior = prior / (prior + prior + prior + prior)
+        count = len(self._rows)
+        if count:
+            beliefs = self._table[:count, :NUM_ROLES].astype(np.float64)
+            total = beliefs[:, 0] + beliefs[:, 1] + beliefs[:, 2] + beliefs[:, 3]
+            positive = total > 0  # Avoid division by zero
+            np.divide(beliefs, total[:, None], out=beliefs, where=positive[:, None])
+            self._table[:count, :NUM_ROLES] = beliefs
+
+    # -- Shared records ----------------------------------------------------
+
+    def _statement_record(self, day: int, statement_type: str, subject_id: int, record: Dict = None) -> Dict:
+        if record is None:
+            record = super()._statement_record(day, statement_type, subject_id)
+        return record
+
+    def _vote_record(self, day: int, voter_id: int, target_id: int, record: Tuple = None) -> Tuple[int, int, int]:
+        if record is None:
+            record = (day, voter_id, target_id)
+        return record
+
+    # -- Queries -----------------------------------------------------------
+
+    def _ranked(self, alive_players: List[int], column: int) -> List[Tuple[int, float]]:
+        default = TRUST_PRIOR if column == TRUST else self._prior
+        rows = self._rows
+        table = self._table
+        values = []
+        for p in alive_players:
+            if p != self.player_id:
+                row = rows.get(p)
+                values.append((p, default if row is None else float(table[row, column])))
+        return sorted(values, key=lambda x: x[1], reverse=True)
+
+    def get_most_likely_mafia(self, alive_players: List[int]) -> List[Tuple[int, float]]:
+        return self._ranked(alive_players, ROLES['MAFIA'])
+
+    def get_most_likely_detective(self, alive_players: List[int]) -> List[Tuple[int, float]]:
+        return self._ranked(alive_players, ROLES['DETECTIVE'])
+
+    def get_most_likely_doctor(self, alive_players: List[int]) -> List[Tuple[int, float]]:
+        return self._ranked(alive_players, ROLES['DOCTOR'])
+
+    def get_most_trusted(self, alive_players: List[int]) -> List[Tuple[int, float]]:
+        return self._ranked(alive_players, TRUST)
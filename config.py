@@ -1,6 +1,54 @@
 class GameConfig:
-    def __init__(self, num_players=8, mafia_ratio=0.25, detective_prob=0.125, doctor_prob=0.125):
+    def __init__(self, num_players=8, mafia_ratio=0.25, detective_prob=0.125, doctor_prob=0.125,
+                 exact_beliefs=False, kernel_mode=False, compact_beliefs=False):
         self.num_players = num_players
         self.mafia_ratio = mafia_ratio
         self.detective_prob = detective_prob
         self.doctor_prob = doctor_prob
+        # Use exact inference over role assignments instead of approximate belief shifts
+        self.exact_beliefs = exact_beliefs
+        # Decide for all seats at once on a game-wide belief tensor (KernelMafiaGame)
+        self.kernel_mode = kernel_mode
+        # Store beliefs as a shared prior plus sparse float32 deltas, for very large tables
+        self.compact_beliefs = compact_beliefs
+
+    def get_role_counts(self):
+        """Return the (mafia, detective, doctor, villager) counts used for a table"""
+        num_mafia = max(1, int(self.num_players * self.mafia_ratio))
+        num_detective = int(self.num_players * self.detective_prob)
+        num_doctor = int(self.num_players * self.doctor_prob)
+        
+        # Ensure at least one special role if probability > 0
+        if self.detective_prob > 0 and num_detective == 0:
+            num_detective = 1
+        if self.doctor_prob > 0 and num_doctor == 0:
+            num_doctor = 1
+            
+        # Limit number of special roles
+        total_special = num_mafia + num_detective + num_doctor
+        if total_special > self.num_players:
+            # Reduce detective and doctor count if needed
+            while total_special > self.num_players and (num_detective > 0 or num_doctor > 0):
+                if num_detective > 0:
+                    num_detective -= 1
+                    total_special -= 1
+                if total_special > self.num_players and num_doctor > 0:
+                    num_doctor -= 1
+                    total_special -= 1
+            
+            # As a last resort, reduce mafia count
+            while total_special > self.num_players:
+                num_mafia -= 1
+                total_special -= 1
+                
+            # Ensure at least one mafia
+            num_mafia = max(1, num_mafia)
+            
+        num_villager = self.num_players - num_mafia - num_detective - num_doctor
+        return num_mafia, num_detective, num_doctor, num_villager
+    
+    def get_roles(self):
+        """Return the unshuffled list of roles dealt at a table"""
+        num_mafia, num_detective, num_doctor, num_villager = self.get_role_counts()
+        return (['MAFIA'] * num_mafia + ['DETECTIVE'] * num_detective +
+                ['DOCTOR'] * num_doctor + ['VILLAGER'] * num_villager)
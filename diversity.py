@@ -0,0 +1,89 @@
+from modules import np,Dict,List,Optional
+from traits import TRAIT_NAMES
+
+def population_diversity(population, max_pairs: int = 20000) -> Dict:
+    """
+    Diversity of a population over its trait matrix: per-trait variance,
+    mean pairwise Euclidean distance and the number of distinct genomes.
+
+    All pairs are used when there are at most max_pairs of them, otherwise a
+    fixed sample of pairs, drawn from a private generator so measuring
+    diversity never disturbs the evolution's random stream.
+    """
+    traits = np.array([genome.to_vector() for genome in population], dtype=float)
+    size = len(traits)
+
+    if size < 2:
+        mean_distance = 0.0
+    elif size * (size - 1) // 2 <= max_pairs:
+        # Squared distances from the Gram matrix, upper triangle only
+        squared = (traits * traits).sum(axis=1)
+        gram = squared[:, None] + squared[None, :] - 2 * traits @ traits.T
+        upper = np.triu_indices(size, k=1)
+        mean_distance = float(np.sqrt(np.maximum(gram[upper], 0.0)).mean())
+    else:
+        rng = np.random.default_rng(0)
+        first = rng.integers(0, size, max_pairs)
+        second = (first + rng.integers(1, size, max_pairs)) % size
+        mean_distance = float(np.linalg.norm(traits[first] - traits[second], axis=1).mean())
+
+    return {
+        'trait_variance': dict(zip(TRAIT_NAMES, traits.var(axis=0).tolist())),
+        'mean_distance': mean_distance,
+        'unique_genomes': len(np.unique(traits, axis=0)) if size else 0,
+    }
+
+class EarlyStopping:
+    """
+    Convergence policy for GeneticAlgorithm.evolve.
+
+    Triggers when the best fitness has not improved by min_improvement for
+    patience generations, or when the mean pairwise trait distance falls
+    below min_diversity (either check is off when None). On a trigger the
+    run stops, or with action='inject' a fraction of the non-elite
+    population is replaced by fresh random genomes, up to max_injections
+    times before stopping.
+    """
+    def __init__(self, patience: Optional[int] = 10, min_improvement: float = 0.5,
+                 min_diversity: Optional[float] = None, action: str = 'stop',
+                 inject_fraction: float = 0.5, max_injections: int = 3):
+        if action not in ('stop', 'inject'):
+            raise ValueError(f"Unknown early stopping action: {action}")
+        self.patience = patience
+        self.min_improvement = min_improvement
+        self.min_diversity = min_diversity
+        self.action = action
+        self.inject_fraction = inject_fraction
+        self.max_injections = max_injections
+
+        self.injections = 0
+        self._last_trigger = 0  # History length when the policy last fired
+
+    def reset(self, history_length: int = 0):
+        """Start a new run whose fitness history begins after history_length entries"""
+        self.injections = 0
+        self._last_trigger = history_length
+
+    def stagnated(self, best_fitness_history: List[float]) -> bool:
+        """Whether the best fitness has stalled for patience generations since the last trigger"""
+        if self.patience is None:
+            return False
+        history = best_fitness_history[self._last_trigger:]
+        if len(history) <= self.patience:
+            return False
+        earlier_best = max(history[:-self.patience])
+        return max(history[-self.patience:]) < earlier_best + self.min_improvement
+
+    def converged(self, diversity: Dict) -> bool:
+        """Whether the population has collapsed below the diversity threshold"""
+        return self.min_diversity is not None and diversity['mean_distance'] < self.min_diversity
+
+    def check(self, best_fitness_history: List[float], diversity: Dict) -> Optional[str]:
+        """Return None to keep going, 'inject' to add fresh genomes or 'stop' to end the run"""
+        if not (self.stagnated(best_fitness_history) or self.converged(diversity)):
+            return None
+        self._last_trigger = len(best_fitness_history)
+        if self.action == 'inject' and self.injections < self.max_injections:
+            self.injections += 1
+            return 'inject'
+        return 'stop'
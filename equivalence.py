@@ -0,0 +1,210 @@
+from modules import random,np,time,copy,List,Dict,Tuple,Optional
+import hashlib
+from constants import ROLES,PHASES
+from config import GameConfig
+from traits import GeneticTraits
+from mafia import MafiaGame
+from kernel import KernelMafiaGame
+from evaluation import make_executor
+
+PHASE_NAMES = {index: name for name, index in PHASES.items()}
+
+def compact_game(game_config, rng=None) -> MafiaGame:
+    """MafiaGame on float32 CompactBeliefSystem beliefs"""
+    game_config = copy.copy(game_config)
+    game_config.compact_beliefs = True
+    return MafiaGame(game_config, rng)
+
+# Game factories, called as factory(game_config, rng), that can be checked against the reference
+CANDIDATES = {
+    'reference': MafiaGame,
+    'kernel': KernelMafiaGame,
+    'compact': compact_game,
+}
+
+def random_scenarios(count: int, seed: int = 0, min_players: int = 5, max_players: int = 16,
+                     exact_max_players: int = 10) -> List[Dict]:
+    """
+    Randomized game setups: table size, role mix, belief model, a trait lineup
+    and a game seed. Exact beliefs are only drawn for tables of up to
+    exact_max_players, where their inference stays cheap.
+    """
+    rng = random.Random(seed)
+    scenarios = []
+    for index in range(count):
+        num_players = rng.randint(min_players, max_players)
+        config = {
+            'num_players': num_players,
+            'mafia_ratio': rng.choice((0.2, 0.25, 0.34)),
+            'detective_prob': rng.choice((0.0, 0.125, 0.25)),
+            'doctor_prob': rng.choice((0.0, 0.125, 0.25)),
+            'exact_beliefs': num_players <= exact_max_players and rng.random() < 0.25,
+        }
+        scenarios.append({
+            'scenario': index,
+            'config': config,
+            'lineup': [GeneticTraits(rng).to_vector() for _ in range(num_players)],
+            'seed': rng.randrange(2**32),
+        })
+    return scenarios
+
+def _phase_state(game, key) -> Tuple[Dict, np.ndarray]:
+    """Discrete state after a phase and every player's (role beliefs + trust) x subject matrix"""
+    state = {
+        'phase': key,
+        'alive': tuple(game.alive_players),
+        'roles': tuple(player.role for player in game.players),
+        # Votes, statements and night actions are all logged as they happen
+        'events': tuple(game.log[key[2]:]),
+        'night_kill_target': game.night_kill_target,
+        'night_kill_succeeded': game.night_kill_succeeded,
+        'protected_player': game.protected_player,
+        'game_over': game.game_over,
+        'winning_team': game.winning_team,
+        # Candidates must draw random numbers exactly as the reference does
+        'random': hash(game.rng.getstate()),
+    }
+    beliefs = np.array([[np.asarray(player.beliefs.role_beliefs[role], dtype=np.float64) for role in ROLES]
+                        + [np.asarray(player.beliefs.trust_levels, dtype=np.float64)]
+                        for player in game.players])
+    return state, beliefs
+
+def trace_games(factory, scenario: Dict, games: int = 2,
+                max_days: int = 20) -> Tuple[List[Tuple[Dict, np.ndarray]], float]:
+    """
+    Play a scenario's lineup games times in a row on one game object, so
+    pooled players are reset between games as in evolution, and record the
+    state after setup and after every phase. Phases are stepped like
+    resume_game steps them. Returns the trace and the seconds spent playing,
+    which leave out the time taken recording states.
+    """
+    lineup = [GeneticTraits.from_vector(vector) for vector in scenario['lineup']]
+    game_config = GameConfig(**scenario['config'])
+    clock = time.perf_counter
+    start = clock()
+    game = factory(game_config, random.Random(scenario['seed']))
+    seconds = 0.0
+    trace = []
+    for number in range(games):
+        game.initialize_game(lineup)
+        seconds += clock() - start
+        trace.append(_phase_state(game, (number, 0, 0, 'setup')))
+        game.day = 1
+        game.phase = PHASES['DAY_DISCUSSION']
+        while not game.game_over and game.day <= max_days:
+            key = (number, game.day, len(game.log), PHASE_NAMES[game.phase])
+            start = clock()
+            game._run_phase()
+            seconds += clock() - start
+            trace.append(_phase_state(game, key))
+        start = clock()
+    return trace, seconds
+
+def first_divergence(reference: List, candidate: List, tolerance: float) -> Optional[Dict]:
+    """First phase at which the candidate's state differs, or its beliefs differ by more than tolerance"""
+    for step, ((ref_state, ref_beliefs), (cand_state, cand_beliefs)) in enumerate(zip(reference, candidate)):
+        fields = [name for name in ref_state if ref_state[name] != cand_state[name]]
+        error = float(np.abs(ref_beliefs - cand_beliefs).max()) if ref_beliefs.shape == cand_beliefs.shape else float('inf')
+        if fields or error > tolerance:
+            if error > tolerance:
+                fields.append('beliefs')
+            game, day, _, phase = ref_state['phase']
+            hashes = phase_hashes([reference[step], candidate[step]], tolerance)
+            return {'step': step, 'game': game, 'day': day, 'phase': phase, 'fields': fields,
+                    'belief_error': error, 'reference': ref_state, 'candidate': cand_state, 'hashes': hashes}
+    if len(reference) != len(candidate):
+        longer = reference if len(reference) > len(candidate) else candidate
+        game, day, _, phase = longer[min(len(reference), len(candidate))][0]['phase']
+        return {'step': min(len(reference), len(candidate)), 'game': game, 'day': day, 'phase': phase,
+                'fields': ['length'], 'belief_error': 0.0, 'reference': None, 'candidate': None, 'hashes': None}
+    return None
+
+def phase_hashes(trace: List[Tuple[Dict, np.ndarray]], tolerance: float) -> List[str]:
+    """Digest of each traced phase, with beliefs rounded to the tolerance"""
+    hashes = []
+    for state, beliefs in trace:
+        digest = hashlib.md5(repr(sorted(state.items())).encode())
+        digest.update(np.round(beliefs / tolerance).astype(np.int64).tobytes())
+        hashes.append(digest.hexdigest()[:16])
+    return hashes
+
+def check_scenarios(candidate: str, scenarios: List[Dict], reference: str = 'reference', tolerance: float = 1e-9,
+                    games: int = 2, max_days: int = 20) -> Dict:
+    """Compare a candidate against the reference on scenarios - the unit of work sent to workers"""
+    reference_factory, candidate_factory = CANDIDATES[reference], CANDIDATES[candidate]
+    result = {'phases': 0, 'divergences': [], 'reference_seconds': 0.0, 'candidate_seconds': 0.0}
+    for scenario in scenarios:
+        reference_trace, seconds = trace_games(reference_factory, scenario, games, max_days)
+        result['reference_seconds'] += seconds
+        candidate_trace, seconds = trace_games(candidate_factory, scenario, games, max_days)
+        result['candidate_seconds'] += seconds
+        result['phases'] += len(reference_trace)
+        divergence = first_divergence(reference_trace, candidate_trace, tolerance)
+        if divergence:
+            divergence.update(scenario=scenario['scenario'], seed=scenario['seed'], config=scenario['config'])
+            result['divergences'].append(divergence)
+    return result
+
+def compare_backends(candidate: str = 'kernel', num_scenarios: int = 1000, seed: int = 0,
+                     tolerance: float = 1e-9, reference: str = 'reference', games: int = 2, max_days: int = 20,
+                     min_players: int = 5, max_players: int = 16, workers: Optional[int] = None) -> Dict:
+    """
+    Differential check of a candidate game backend against the reference.
+
+    Both play the same randomized scenarios on the same seeds. After setup
+    and every phase the alive set, roles, logged votes, statements and night
+    actions, night results, game result and random stream position must be
+    equal, and every player's beliefs and trust must agree within tolerance.
+    Returns the number of scenarios that diverged with the first divergence
+    of each, and the candidate's speedup in time spent playing, not
+    recording. Scenarios are split over worker processes when workers > 1.
+    """
+    scenarios = random_scenarios(num_scenarios, seed, min_players, max_players)
+    executor = make_executor(workers, preload=('equivalence',))
+    try:
+        if executor:
+            chunks = [scenarios[i::workers] for i in range(workers) if scenarios[i::workers]]
+            results = list(executor.map(check_scenarios, [candidate] * len(chunks), chunks, [reference] * len(chunks),
+                                        [tolerance] * len(chunks), [games] * len(chunks), [max_days] * len(chunks)))
+        else:
+            results = [check_scenarios(candidate, scenarios, reference, tolerance, games, max_days)]
+    finally:
+        if executor:
+            executor.shutdown()
+
+    divergences = sorted((d for r in results for d in r['divergences']), key=lambda d: d['scenario'])
+    reference_seconds = sum(r['reference_seconds'] for r in results)
+    candidate_seconds = sum(r['candidate_seconds'] for r in results)
+    return {
+        'candidate': candidate,
+        'reference': reference,
+        'scenarios': num_scenarios,
+        'phases': sum(r['phases'] for r in results),
+        'tolerance': tolerance,
+        'divergent': len(divergences),
+        'divergences': divergences,
+        'reference_seconds': reference_seconds,
+        'candidate_seconds': candidate_seconds,
+        'speedup': reference_seconds / candidate_seconds if candidate_seconds > 0 else float('inf'),
+    }
+
+def format_report(report: Dict, show: int = 3) -> str:
+    """Summary of compare_backends with the first few divergences"""
+    lines = [f"{report['candidate']} vs {report['reference']}: {report['scenarios']} scenarios, "
+             f"{report['phases']} phases, {report['divergent']} divergent (tolerance {report['tolerance']:g})",
+             f"  speedup {report['speedup']:.2f}x ({report['reference_seconds']:.2f}s reference, "
+             f"{report['candidate_seconds']:.2f}s candidate)"]
+    for divergence in report['divergences'][:show]:
+        lines.append(f"  scenario {divergence['scenario']} (seed {divergence['seed']}, {divergence['config']}): "
+                     f"game {divergence['game']} day {divergence['day']} {divergence['phase']} differs in "
+                     f"{', '.join(divergence['fields'])}, max belief error {divergence['belief_error']:.3g}")
+        for field in divergence['fields']:
+            if divergence['reference'] and field in divergence['reference'] and field != 'events':
+                lines.append(f"    {field}: {divergence['reference'][field]!r} -> {divergence['candidate'][field]!r}")
+        if 'events' in divergence['fields']:
+            ref_events, cand_events = divergence['reference']['events'], divergence['candidate']['events']
+            index = next((i for i, (a, b) in enumerate(zip(ref_events, cand_events)) if a != b),
+                         min(len(ref_events), len(cand_events)))
+            lines.append(f"    events: {ref_events[index] if index < len(ref_events) else None!r} -> "
+                         f"{cand_events[index] if index < len(cand_events) else None!r}")
+    return '\n'.join(lines)
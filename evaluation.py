@@ -0,0 +1,118 @@
+from modules import random,time,List,Dict,Tuple,Optional
+from contextlib import contextmanager
+from mafia import MafiaGame
+from kernel import KernelMafiaGame
+
+@contextmanager
+def seeded_random(seed: Optional[int]):
+    """Seed the global random module for a block, restoring its state afterwards"""
+    if seed is None:
+        yield
+        return
+    state = random.getstate()
+    random.seed(seed)
+    try:
+        yield
+    finally:
+        random.setstate(state)
+
+def create_game(game_config, rng=None) -> MafiaGame:
+    """Create the game implementation selected by the config, drawing from rng if given"""
+    if getattr(game_config, 'kernel_mode', False):
+        return KernelMafiaGame(game_config, rng)
+    return MafiaGame(game_config, rng)
+
+def play_game(game_config, lineup, roles=None, max_days=20,
+              game: MafiaGame = None) -> Tuple[Optional[str], int, Dict[int, float]]:
+    """
+    Play one game and return the winning team, days played and per-seat fitness.
+    Pass the game from a previous call to reuse its pooled players.
+    """
+    if game is None:
+        game = create_game(game_config)
+    game.initialize_game(lineup, roles=roles)
+    winning_team, days_played = game.run_game(max_days)
+    return winning_team, days_played, game.get_player_fitness()
+
+def play_games(game_config, lineup, num_games: int, seed: Optional[int] = None,
+               roles=None, max_days=20) -> List[Tuple[Optional[str], int, Dict[int, float]]]:
+    """
+    Play a batch of games with the same lineup - the unit of work sent to workers.
+    A seeded batch draws from its own random.Random, so batches can run on
+    separate threads; without a seed the global random module is used.
+    """
+    game = create_game(game_config, random.Random(seed) if seed is not None else None)
+    return [play_game(game_config, lineup, roles, max_days, game) for _ in range(num_games)]
+
+def timed_play_games(*args, **kwargs) -> Tuple[float, List[Tuple[Optional[str], int, Dict[int, float]]]]:
+    """play_games that also returns the seconds the worker spent playing, for utilization telemetry"""
+    start = time.perf_counter()
+    games = play_games(*args, **kwargs)
+    return time.perf_counter() - start, games
+
+def make_executor(workers: Optional[int], preload=('evaluation',), backend: str = 'processes'):
+    """
+    Return a pool with the given number of workers, or None to run serially.
+
+    The default backend is a process pool. Where available, its workers are
+    forked from a server process that has only imported the preload modules,
+    so each worker starts with the minimal import set its tasks need rather
+    than a copy of the parent. backend='threads' returns a thread pool, which
+    avoids pickling and process startup and runs in parallel on free-threaded
+    builds; tasks must then only use seeded, per-game random generators.
+    """
+    if backend not in ('processes', 'threads'):
+        raise ValueError(f"Unknown executor backend: {backend}")
+    if not workers or workers <= 1:
+        return None
+    if backend == 'threads':
+        from concurrent.futures import ThreadPoolExecutor
+        return ThreadPoolExecutor(max_workers=workers)
+    try:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        context = None
+        if 'forkserver' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('forkserver')
+            context.set_forkserver_preload(list(preload))
+        return ProcessPoolExecutor(max_workers=workers, mp_context=context)
+    except (ImportError, NotImplementedError, OSError):
+        # Platforms without working multiprocessing fall back to serial play
+        return None
+
+def run_rollouts(snapshot, num_rollouts: int, seed: Optional[int] = None, max_days=20,
+                 forced_actions=None, workers: Optional[int] = None) -> List[Tuple[Optional[str], int, Dict[int, float]]]:
+    """
+    Play num_rollouts continuations of a game snapshot, each on its own random
+    stream, and return the winning team, days played and per-seat fitness of
+    each. forced_actions ({(day, phase, player_id): target}) replays the
+    snapshot under a counterfactual, e.g. a different doctor protection.
+    """
+    if seed is None:
+        seed = random.randrange(2**32)
+    seeds = [seed + i for i in range(num_rollouts)]
+    
+    executor = make_executor(workers)
+    if not executor:
+        return _rollout_batch(snapshot, seeds, max_days, forced_actions)
+    try:
+        chunks = [seeds[i::workers] for i in range(workers) if seeds[i::workers]]
+        batches = executor.map(_rollout_batch, [snapshot] * len(chunks), chunks,
+                               [max_days] * len(chunks), [forced_actions] * len(chunks))
+        # Put results back in seed order
+        results = dict(zip((s for chunk in chunks for s in chunk), (r for batch in batches for r in batch)))
+        return [results[s] for s in seeds]
+    finally:
+        executor.shutdown()
+
+def _rollout_batch(snapshot, seeds, max_days, forced_actions):
+    """Play one rollout per seed on a single pooled game"""
+    game = create_game(snapshot.config)
+    results = []
+    for seed in seeds:
+        game.rng = random.Random(seed)
+        game.restore(snapshot, restore_random=False)
+        game.forced_actions = dict(forced_actions or {})
+        winning_team, days_played = game.resume_game(max_days)
+        results.append((winning_team, days_played, game.get_player_fitness()))
+    return results
@@ -0,0 +1,158 @@
+from modules import np,Tuple
+from itertools import combinations
+from functools import lru_cache
+from constants import ROLES
+from belief import BeliefSystem
+
+# Log-likelihood weight of evidence that the approximate engine treats as a 0.1 belief shift
+SHIFT_LOG_WEIGHT = 0.5
+# Log-likelihood weight per unit of trust-weighted statement evidence
+NUDGE_LOG_WEIGHT = 10.0
+# Largest enumeration the exact engine will build for a table
+MAX_ASSIGNMENTS = 100000
+
+class AssignmentTable:
+    """
+    Every role assignment _assign_roles can deal for a table, shared read-only
+    by all exact belief systems for tables with the same role counts.
+    """
+    def __init__(self, num_players: int, role_counts: Tuple[int, int, int, int]):
+        num_mafia, num_detective, num_doctor, num_villager = role_counts
+        self.num_players = num_players
+
+        rows = []
+        seats = range(num_players)
+        for mafia in combinations(seats, num_mafia):
+            rest = [p for p in seats if p not in mafia]
+            for detectives in combinations(rest, num_detective):
+                rest2 = [p for p in rest if p not in detectives]
+                for doctors in combinations(rest2, num_doctor):
+                    row = [ROLES['VILLAGER']] * num_players
+                    for p in mafia:
+                        row[p] = ROLES['MAFIA']
+                    for p in detectives:
+                        row[p] = ROLES['DETECTIVE']
+                    for p in doctors:
+                        row[p] = ROLES['DOCTOR']
+                    rows.append(row)
+
+        # Compact (assignments x players) table of role indices
+        self.roles = np.array(rows, dtype=np.uint8)
+
+        # masks[player, role] selects the assignments giving player that role
+        self.masks = np.ascontiguousarray(
+            (self.roles.T[:, None, :] == np.arange(len(ROLES), dtype=np.uint8)[None, :, None]))
+
+        # One-hot (assignments x players*roles) so marginals are a single product
+        self.onehot = self.masks.reshape(num_players * len(ROLES), -1).T.astype(np.float32)
+
+    def __len__(self):
+        return len(self.roles)
+
+def count_assignments(role_counts: Tuple[int, int, int, int]) -> int:
+    """Number of distinct role assignments for the given role counts"""
+    total = 1
+    remaining = sum(role_counts)
+    for count in role_counts:
+        total *= _binomial(remaining, count)
+        remaining -= count
+    return total
+
+def _binomial(n: int, k: int) -> int:
+    result = 1
+    for i in range(k):
+        result = result * (n - i) // (i + 1)
+    return result
+
+@lru_cache(maxsize=16)
+def get_assignment_table(num_players: int, role_counts: Tuple[int, int, int, int]) -> AssignmentTable:
+    """Build, or fetch from the cache, the assignment table for a table configuration"""
+    size = count_assignments(role_counts)
+    if size > MAX_ASSIGNMENTS:
+        raise ValueError(f"Exact beliefs need {size} assignments for {num_players} players, "
+                         f"more than the limit of {MAX_ASSIGNMENTS}")
+    return AssignmentTable(num_players, role_counts)
+
+class ExactBeliefSystem(BeliefSystem):
+    """
+    Belief system that keeps log-weights over every valid role assignment.
+
+    Hard facts from deaths and investigations prune assignments, soft evidence
+    from votes and statements reweights them, and role_beliefs always holds the
+    exact marginals, so every BeliefSystem query keeps working unchanged.
+    """
+    def __init__(self, player_id: int, num_players: int, game_config):
+        self.table = get_assignment_table(num_players, tuple(game_config.get_role_counts()))
+        self.log_weights = np.zeros(len(self.table))
+        self._dirty = False
+        super().__init__(player_id, num_players)
+
+    @property
+    def role_beliefs(self):
+        # Marginals are only recomputed when someone reads them after new evidence
+        if self._dirty:
+            self._refresh_marginals()
+        return self._role_beliefs
+
+    @role_beliefs.setter
+    def role_beliefs(self, value):
+        self._role_beliefs = value
+
+    def reset(self):
+        """Return to the prior over assignments"""
+        self.log_weights.fill(0.0)
+        self._dirty = False
+        super().reset()
+
+    def get_state(self):
+        state = super().get_state()
+        state['log_weights'] = self.log_weights.copy()
+        state['log_weights'].flags.writeable = False
+        return state
+        
+    def set_state(self, state):
+        # Marginals come from the snapshot, so there is nothing to refresh
+        self._dirty = False
+        super().set_state(state)
+        self.log_weights[:] = state['log_weights']
+        
+    def _refresh_marginals(self):
+        """Write the marginal role probabilities of every player into role_beliefs"""
+        self._dirty = False
+        # float32 weights keep the product in the one-hot table's precision without a copy
+        weights = np.exp(self.log_weights - self.log_weights.max()).astype(np.float32)
+        marginals = (weights @ self.table.onehot).reshape(self.num_players, len(ROLES)) / weights.sum(dtype=np.float64)
+        for role, index in ROLES.items():
+            self._role_beliefs[role][:] = marginals[:, index]
+
+    def _prune(self, mask):
+        """Rule out the assignments where mask is True"""
+        # Contradictory evidence would leave no assignment - keep the current posterior
+        if not np.isinf(self.log_weights[~mask]).all():
+            np.copyto(self.log_weights, -np.inf, where=mask)
+            self._dirty = True
+            
+    def _reweight(self, mask, log_weight: float):
+        """Add a log-likelihood weight to the assignments where mask is True"""
+        np.add(self.log_weights, log_weight, out=self.log_weights, where=mask)
+        self._dirty = True
+
+    def update_known_role(self, player_id: int, role: str):
+        super().update_known_role(player_id, role)
+        self._prune(~self.table.masks[player_id, ROLES[role]])
+
+    def record_detective_investigation(self, target_id: int, is_mafia: bool):
+        super().record_detective_investigation(target_id, is_mafia)
+        if not is_mafia:
+            self._prune(self.table.masks[target_id, ROLES['MAFIA']])
+
+    def _shift_belief_toward(self, player_id: int, role: str, decrease: bool):
+        weight = -SHIFT_LOG_WEIGHT if decrease else SHIFT_LOG_WEIGHT
+        self._reweight(self.table.masks[player_id, ROLES[role]], weight)
+
+    def _nudge_belief(self, player_id: int, role: str, amount: float):
+        self._reweight(self.table.masks[player_id, ROLES[role]], amount * NUDGE_LOG_WEIGHT)
+
+    def _normalize_beliefs(self):
+        # Marginals over assignments are normalized by construction
+        pass
@@ -0,0 +1,437 @@
+from modules import np,Dict
+from constants import ROLES,PHASES
+from belief import BeliefSystem
+from mafia import MafiaGame
+from strategy import INVESTIGATE_SUSPICIOUS,PROTECT_SELF,PROTECT_VALUABLE
+
+MAFIA = ROLES['MAFIA']
+DETECTIVE = ROLES['DETECTIVE']
+DOCTOR = ROLES['DOCTOR']
+
+def _masked_argmax(scores, valid):
+    """
+    Row-wise argmax over the valid entries, -1 for rows with none.
+    Ties go to the lowest index, matching the stable sorts in Player.
+    """
+    masked = np.where(valid, scores, -np.inf)
+    best = masked.argmax(axis=1)
+    best_score = masked[np.arange(len(best)), best]
+    return np.where(valid.any(axis=1), best, -1), best_score
+
+class KernelMafiaGame(MafiaGame):
+    """
+    MafiaGame that owns every player's beliefs as one game-wide tensor.
+
+    belief_tensor[observer, subject, role] and trust_matrix[observer, subject]
+    back each player's BeliefSystem arrays. Votes, statements and night targets for all seats of a
+    phase are computed at once with masked argmax over these arrays, following
+    the same rules as Player.get_voting_target, make_statement and the night
+    action methods. Random draws happen per seat in the same order as Player,
+    and a seat whose beliefs changed since the batch (from earlier statements
+    or votes in the phase) is recomputed before it acts, so games play out
+    exactly as MafiaGame does under the same seed.
+    """
+    def __init__(self, config, rng=None):
+        super().__init__(config, rng)
+        n = self.num_players
+        self.belief_tensor = np.zeros((n, n, len(ROLES)))
+        self.trust_matrix = np.zeros((n, n))
+        self.role_codes = np.zeros(n, dtype=np.int64)
+
+        # accusations[observer, speaker] - times speaker accused observer in observer's hearing
+        self.accusations = np.zeros((n, n), dtype=np.int64)
+
+        # Decisions batched for the current phase
+        self._batch_key = None
+        self._batch = {}
+        self._facts_key = None
+        self._facts = {}
+
+        # Belief updates are applied to all observers at once when every seat uses BeliefSystem
+        self._vectorized_updates = False
+
+    def _make_beliefs(self, player_id: int):
+        beliefs = super()._make_beliefs(player_id) or BeliefSystem(player_id, self.num_players)
+        beliefs.bind_storage(self.belief_tensor[player_id], self.trust_matrix[player_id])
+        return beliefs
+
+    def initialize_game(self, genetic_population=None, roles=None):
+        super().initialize_game(genetic_population, roles)
+        for i, player in enumerate(self.players):
+            self.role_codes[i] = ROLES[player.role]
+        self.accusations.fill(0)
+        self._batch_key = None
+        self._facts_key = None
+        self._vectorized_updates = all(type(p.beliefs) is BeliefSystem for p in self.players)
+
+    def restore(self, snapshot, restore_random=True):
+        super().restore(snapshot, restore_random)
+        # Rebuild the accusation counts from the statements each seat has heard
+        for observer, player in enumerate(self.players):
+            for speaker, statements in player.beliefs.player_statements.items():
+                self.accusations[observer, speaker] = sum(
+                    1 for s in statements if s['type'] == 'accuse' and s['subject'] == observer)
+
+    # -- Game-wide state -------------------------------------------------
+
+    def _alive_mask(self):
+        mask = np.zeros(self.num_players, dtype=bool)
+        mask[self.alive_players] = True
+        return mask
+
+    def _known_matrix(self, fact: str, seats):
+        """Boolean (seats x subjects) matrix of a known fact for each observing seat"""
+        # Facts only change on deaths and investigations, never within a day phase,
+        # so the full matrices are built once per phase
+        key = (self.day, self.phase)
+        if self._facts_key != key:
+            self._facts_key = key
+            self._facts = {}
+        if fact not in self._facts:
+            known = np.zeros((self.num_players, self.num_players), dtype=bool)
+            for seat in self.alive_players:
+                subjects = self.players[seat].beliefs.known_facts[fact]
+                if subjects:
+                    known[seat, list(subjects)] = True
+            self._facts[fact] = known
+        return self._facts[fact][np.asarray(seats)]
+
+    def _sync_beliefs(self, seats):
+        # Belief systems that compute marginals lazily write them into the tensor on access
+        for seat in seats:
+            self.players[seat].beliefs.role_beliefs
+
+    def _others_mask(self, seats):
+        """Alive subjects other than the observing seat itself"""
+        return self._alive_mask()[None, :] & (np.arange(self.num_players)[None, :] != np.asarray(seats)[:, None])
+
+    # -- Batched decision kernels ----------------------------------------
+
+    def _vote_kernel(self, seats) -> Dict[int, int]:
+        """Belief-driven voting targets (the part of get_voting_target that uses no randomness)"""
+        seats = np.asarray(seats)
+        beliefs = self.belief_tensor[seats]
+        others = self._others_mask(seats)
+
+        # Town votes for the most likely mafia
+        town_target, _ = _masked_argmax(beliefs[:, :, MAFIA], others)
+
+        # Mafia vote for the biggest threat - a likely detective or someone who distrusts them
+        valid = others & ~self._known_matrix('is_mafia', seats)
+        detective_target, detective_score = _masked_argmax(2 * beliefs[:, :, DETECTIVE], valid)
+        distrust_target, distrust_score = _masked_argmax(1.0 - self.trust_matrix[seats], valid)
+        mafia_target = np.where(detective_score >= distrust_score, detective_target, distrust_target)
+
+        targets = np.where(self.role_codes[seats] == MAFIA, mafia_target, town_target)
+        return dict(zip(seats.tolist(), targets.tolist()))
+
+    def _statement_kernel(self, seats) -> Dict[int, Dict]:
+        """Candidate accusation and defence targets for each speaking seat"""
+        seats = np.asarray(seats)
+        beliefs = self.belief_tensor[seats]
+        trust = self.trust_matrix[seats]
+        others = self._others_mask(seats)
+        known_mafia = self._known_matrix('is_mafia', seats)
+
+        # Mafia accuse a likely detective or the most trusted non-mafia
+        mafia_valid = others & ~known_mafia
+        detective_target, _ = _masked_argmax(beliefs[:, :, DETECTIVE], mafia_valid)
+        trusted_target, _ = _masked_argmax(trust, mafia_valid)
+
+        # Town accuse the most likely mafia
+        suspect, suspect_prob = _masked_argmax(beliefs[:, :, MAFIA], others)
+
+        # Town defend the most trusted player who looks innocent
+        defended, _ = _masked_argmax(trust, others & (beliefs[:, :, MAFIA] < 0.3))
+
+        fellow_mafia = others & known_mafia
+        plans = {}
+        for row, seat in enumerate(seats.tolist()):
+            plans[seat] = {
+                'detective_target': int(detective_target[row]),
+                'trusted_target': int(trusted_target[row]),
+                'suspect': int(suspect[row]),
+                'suspect_prob': suspect_prob[row],
+                'defended': int(defended[row]),
+                'fellow_mafia': np.flatnonzero(fellow_mafia[row]).tolist()
+            }
+        return plans
+
+    def _mafia_kill_kernel(self, seats) -> Dict[int, int]:
+        """Kill targets by threat score (mafia_kill_target)"""
+        seats = np.asarray(seats)
+        beliefs = self.belief_tensor[seats]
+        valid = self._others_mask(seats) & ~self._known_matrix('is_mafia', seats)
+
+        detective = beliefs[:, :, DETECTIVE]
+        doctor = beliefs[:, :, DOCTOR]
+        scores = np.where(detective > 0.5, 3 * detective, 0.0)
+        scores += np.where(doctor > 0.5, 2 * doctor, 0.0)
+
+        # Accusations are added one at a time, as Player does, to keep float sums identical
+        accusations = self.accusations[seats]
+        for count in range(accusations.max(initial=0)):
+            scores += np.where(accusations > count, 2, 0)
+        scores += 1 - self.trust_matrix[seats]
+
+        targets, _ = _masked_argmax(scores, valid)
+        return dict(zip(seats.tolist(), targets.tolist()))
+
+    def _detective_kernel(self, seats) -> Dict[int, Dict]:
+        """Uninvestigated candidates and the most suspicious of them"""
+        seats = np.asarray(seats)
+        valid = (self._others_mask(seats) & ~self._known_matrix('is_mafia', seats)
+                 & ~self._known_matrix('is_not_mafia', seats))
+        suspect, _ = _masked_argmax(self.belief_tensor[seats][:, :, MAFIA], valid)
+        return {seat: {'suspect': int(suspect[row]), 'valid': np.flatnonzero(valid[row]).tolist()}
+                for row, seat in enumerate(seats.tolist())}
+
+    def _doctor_kernel(self, seats) -> Dict[int, Dict]:
+        """Likely detective and most trusted player for each doctor"""
+        seats = np.asarray(seats)
+        others = self._others_mask(seats)
+        detective, detective_prob = _masked_argmax(self.belief_tensor[seats][:, :, DETECTIVE], others)
+        trusted, _ = _masked_argmax(self.trust_matrix[seats], others)
+        return {seat: {'detective': int(detective[row]), 'detective_prob': detective_prob[row],
+                       'trusted': int(trusted[row])}
+                for row, seat in enumerate(seats.tolist())}
+
+    def _phase_kernel(self, seats):
+        """Run the batched kernel for the current phase"""
+        if self.phase == PHASES['DAY_DISCUSSION']:
+            return self._statement_kernel(seats)
+        if self.phase == PHASES['DAY_VOTING']:
+            return self._vote_kernel(seats)
+        if self.phase == PHASES['NIGHT_MAFIA']:
+            return self._mafia_kill_kernel(seats)
+        if self.phase == PHASES['NIGHT_DETECTIVE']:
+            return self._detective_kernel(seats)
+        return self._doctor_kernel(seats)
+
+    def _phase_seats(self):
+        """Seats that act in the current phase"""
+        if self.phase in (PHASES['DAY_DISCUSSION'], PHASES['DAY_VOTING']):
+            return list(self.alive_players)
+        role = {PHASES['NIGHT_MAFIA']: 'MAFIA', PHASES['NIGHT_DETECTIVE']: 'DETECTIVE',
+                PHASES['NIGHT_DOCTOR']: 'DOCTOR'}[self.phase]
+        return [p for p in self.alive_players if self.players[p].role == role]
+
+    def _decision(self, player_id: int):
+        """Batched decision data for a seat, recomputed if its beliefs moved since the batch"""
+        key = (self.day, self.phase)
+        if self._batch_key != key:
+            seats = self._phase_seats()
+            self._sync_beliefs(seats)
+            self._batch_key = key
+            self._batch = self._phase_kernel(seats)
+            self._batch_inputs = {seat: (self.belief_tensor[seat].copy(), self.trust_matrix[seat].copy())
+                              for seat in seats}
+            return self._batch[player_id]
+
+        self._sync_beliefs([player_id])
+        beliefs, trust = self._batch_inputs[player_id]
+        if not (np.array_equal(beliefs, self.belief_tensor[player_id])
+                and np.array_equal(trust, self.trust_matrix[player_id])):
+            self._batch[player_id] = self._phase_kernel([player_id])[player_id]
+        return self._batch[player_id]
+
+    # -- Vectorized observation --------------------------------------------
+
+    def _normalize_observers(self, observers):
+        """BeliefSystem._normalize_beliefs for several observers at once"""
+        beliefs = self.belief_tensor[observers]
+        total = np.zeros(beliefs.shape[:2])
+        for index in ROLES.values():
+            total += beliefs[:, :, index]
+        np.divide(beliefs, total[:, :, None], out=beliefs, where=(total > 0)[:, :, None])
+        self.belief_tensor[observers] = beliefs
+
+    def _shift_observers(self, observers, subject: int, decrease: bool):
+        """BeliefSystem._shift_belief_toward on the MAFIA belief for several observers"""
+        if not len(observers):
+            return
+        current = self.belief_tensor[observers, subject, MAFIA]
+        if decrease:
+            self.belief_tensor[observers, subject, MAFIA] = np.maximum(0.05, current - 0.1)
+        else:
+            self.belief_tensor[observers, subject, MAFIA] = np.minimum(0.95, current + 0.1)
+        self._normalize_observers(observers)
+
+    def _nudge_observers(self, observers, subject: int, amounts):
+        """BeliefSystem._nudge_belief on the MAFIA belief for several observers"""
+        if not len(observers):
+            return
+        current = self.belief_tensor[observers, subject, MAFIA]
+        moved = current + amounts
+        self.belief_tensor[observers, subject, MAFIA] = np.where(
+            amounts >= 0, np.minimum(0.95, moved), np.maximum(0.05, moved))
+        self._normalize_observers(observers)
+
+    def _adjust_trust(self, observers, subject: int, change: float):
+        """Clamped trust change towards subject for several observers"""
+        if not len(observers):
+            return
+        trust = self.trust_matrix[observers, subject] + change
+        self.trust_matrix[observers, subject] = np.minimum(1.0, trust) if change > 0 else np.maximum(0.0, trust)
+
+    def _broadcast_statement(self, statement):
+        if not self._vectorized_updates:
+            return super()._broadcast_statement(statement)
+
+        speaker = statement['speaker']
+        subject = statement.get('subject')
+        kind = statement['type']
+        observers = np.array([p for p in self.alive_players if p != speaker], dtype=np.int64)
+        record = {'day': statement['day'], 'type': kind, 'subject': subject}
+        for observer in observers.tolist():
+            self.players[observer].beliefs.player_statements[speaker].append(dict(record))
+
+        if kind not in ('accuse', 'defend') or not len(observers):
+            return
+
+        # The same three cases as BeliefSystem.record_statement, for every observer at once
+        # (accusations check the mafia fact first, defences the innocent fact first)
+        known_mafia = self._known_matrix('is_mafia', observers)[:, subject]
+        known_innocent = self._known_matrix('is_not_mafia', observers)[:, subject]
+        unknown = ~known_mafia & ~known_innocent
+
+        if kind == 'accuse':
+            correct, wrong = observers[known_mafia], observers[known_innocent & ~known_mafia]
+            self._adjust_trust(correct, speaker, 0.15)
+            self._shift_observers(correct, speaker, decrease=True)
+            self._adjust_trust(wrong, speaker, -0.1)
+            self._shift_observers(wrong, speaker, decrease=False)
+            sign = 1.0
+        else:
+            correct, wrong = observers[known_innocent], observers[known_mafia & ~known_innocent]
+            self._adjust_trust(correct, speaker, 0.1)
+            self._shift_observers(correct, speaker, decrease=True)
+            self._adjust_trust(wrong, speaker, -0.15)
+            self._shift_observers(wrong, speaker, decrease=False)
+            sign = -1.0
+
+        undecided = observers[unknown]
+        self._nudge_observers(undecided, subject, sign * (self.trust_matrix[undecided, speaker] * 0.05))
+
+    def _broadcast_vote(self, voter_id: int, target: int):
+        if not self._vectorized_updates:
+            return super()._broadcast_vote(voter_id, target)
+
+        observers = np.array(self.alive_players, dtype=np.int64)
+        for observer in self.alive_players:
+            self.players[observer].beliefs.voting_history.append((self.day, voter_id, target))
+        if target == -1:
+            return
+
+        # The same cases as BeliefSystem.update_beliefs_from_vote, for every observer at once
+        judging = (observers != voter_id) & ~self._known_matrix('is_mafia', observers)[:, voter_id]
+        target_mafia = self._known_matrix('is_mafia', observers)[:, target]
+        target_innocent = self._known_matrix('is_not_mafia', observers)[:, target]
+
+        approving = observers[judging & target_mafia]
+        self._adjust_trust(approving, voter_id, 0.1)
+        self._shift_observers(approving, voter_id, decrease=True)
+
+        suspicious = observers[judging & ~target_mafia & target_innocent]
+        self._adjust_trust(suspicious, voter_id, -0.1)
+        self._shift_observers(suspicious, voter_id, decrease=False)
+
+    # -- Decision hooks --------------------------------------------------
+
+    def _get_vote(self, player_id: int) -> int:
+        alive_players = self.alive_players
+        if len(alive_players) <= 1:
+            return -1
+
+        # Random vote - drawn exactly as in Player.get_voting_target
+        if self.rng.random() < self.players[player_id].strategy.vote_randomness:
+            valid_targets = [p for p in alive_players if p != player_id]
+            if valid_targets:
+                return self.rng.choice(valid_targets)
+            return -1
+
+        return self._decision(player_id)
+
+    def _get_statement(self, player_id: int):
+        player = self.players[player_id]
+        day = self.day
+        statement = {'day': day, 'speaker': player_id, 'type': None, 'subject': None, 'content': None}
+        plan = self._decision(player_id)
+        is_mafia = self.role_codes[player_id] == MAFIA
+        strategy = player.strategy
+
+        if self.rng.random() < strategy.accusation_threshold:
+            if is_mafia:
+                if plan['trusted_target'] != -1:
+                    if self.rng.random() < 0.7:
+                        target = plan['detective_target']
+                    else:
+                        target = plan['trusted_target']
+                    statement['type'] = 'accuse'
+                    statement['subject'] = target
+                    statement['content'] = f"Player {target} is acting suspiciously and might be mafia."
+            elif plan['suspect'] != -1:
+                target = plan['suspect']
+                if plan['suspect_prob'] > 0.5 or self.rng.random() < strategy.false_accusation_rate:
+                    statement['type'] = 'accuse'
+                    statement['subject'] = target
+                    statement['content'] = f"I suspect Player {target} is mafia based on their behavior."
+
+        if not statement['type'] and self.rng.random() < 0.4:
+            if is_mafia:
+                fellow_mafia = plan['fellow_mafia']
+                if fellow_mafia and self.rng.random() < strategy.deception_skill:
+                    target = self.rng.choice(fellow_mafia)
+                    statement['type'] = 'defend'
+                    statement['subject'] = target
+                    statement['content'] = f"I think Player {target} is innocent and being unfairly accused."
+            elif plan['defended'] != -1:
+                target = plan['defended']
+                statement['type'] = 'defend'
+                statement['subject'] = target
+                statement['content'] = f"I believe Player {target} is innocent."
+
+        if not statement['type']:
+            statement['type'] = 'comment'
+            statement['content'] = "I'm observing everyone's behavior closely."
+
+        if statement['type'] == 'accuse':
+            self.accusations[statement['subject'], player_id] += 1
+
+        player.statements_made.append(statement)
+        player.last_statement = statement
+        return statement
+
+    def _get_night_action(self, player_id: int) -> int:
+        alive_players = self.alive_players
+        if len(alive_players) <= 1:
+            return -1
+
+        player = self.players[player_id]
+        role = player.role
+        if role == 'MAFIA':
+            return self._decision(player_id)
+
+        if role == 'DETECTIVE':
+            plan = self._decision(player_id)
+            if not plan['valid']:
+                return -1
+            if player.strategy.investigation == INVESTIGATE_SUSPICIOUS:
+                return plan['suspect']
+            return self.rng.choice(plan['valid'])
+
+        if role == 'DOCTOR':
+            protection = player.strategy.protection
+            if protection == PROTECT_SELF:
+                return player_id
+            if protection == PROTECT_VALUABLE:
+                plan = self._decision(player_id)
+                if plan['detective'] != -1 and plan['detective_prob'] > 0.6:
+                    return plan['detective']
+                if plan['trusted'] != -1:
+                    return plan['trusted']
+                return self.rng.choice(list(alive_players))
+            # Protecting whoever mafia seem to be after depends on statement history
+            return player.doctor_protect_target(alive_players)
+
+        return -1
@@ -1,12 +1,43 @@
 from config import GameConfig
 from player import Player
+from exact_belief import ExactBeliefSystem
+from compact_belief import CompactBeliefSystem
 from constants import PHASES
-from modules import random,Counter
+from modules import random,time,Counter
+
+class GameSnapshot:
+    """
+    Minimal state needed to resume a game from a phase boundary.
+    
+    Player traits and the config are shared with the game they came from, and
+    belief and trust arrays are read-only copies, so one snapshot can seed
+    any number of forks or rollouts.
+    """
+    def __init__(self, game):
+        self.config = game.config
+        self.players = tuple(player.get_state() for player in game.players)
+        self.alive_players = tuple(game.alive_players)
+        self.day = game.day
+        self.phase = game.phase
+        self.game_over = game.game_over
+        self.winning_team = game.winning_team
+        self.night_kill_target = game.night_kill_target
+        self.night_kill_succeeded = game.night_kill_succeeded
+        self.protected_player = game.protected_player
+        self.log = tuple(game.log)
+        self.random_state = game.rng.getstate()
+        
+class DeadlineExceeded(Exception):
+    """Raised by a game, or an evaluation, still running at its deadline"""
 
 class MafiaGame:
     """Main game controller that simulates the Mafia game"""
-    def __init__(self, config: GameConfig):
+    def __init__(self, config: GameConfig, rng=None):
         self.config = config
+        
+        # Source of every random draw in the game - a private random.Random keeps
+        # games on different threads independent, None uses the global random module
+        self.rng = rng if rng is not None else random
         self.num_players = config.num_players
         self.players = []
         self.alive_players = []
@@ -19,9 +50,32 @@ class MafiaGame:
         self.protected_player = None
         self.log = []
         
-    def initialize_game(self, genetic_population=None):
-        """Initialize game with players and roles"""
+        # Targets forced on players for counterfactuals, keyed by (day, phase, player_id)
+        self.forced_actions = {}
+        
+        # Players from the previous game, reset in place when the game is reinitialized
+        self._player_pool = []
+        
+        # Optional BeliefRecorder told about every new game and finished day
+        self.recorder = None
+        
+        # Optional RunTelemetry told about every finished game
+        self.telemetry = None
+        
+        # Optional time.perf_counter() time after which the game raises DeadlineExceeded
+        self.deadline = None
+        
+    def initialize_game(self, genetic_population=None, roles=None):
+        """Initialize game with players and roles
+        
+        If roles is given, roles[i] is dealt to seat i instead of shuffling.
+        Calling this again on the same game reuses the previous game's players.
+        """
         self.players = []
+        self.log = []
+        
+        # Reuse pooled players if a previous game had the same table size
+        pool = self._player_pool if len(self._player_pool) == self.num_players else None
         
         # Create players with genetic traits if provided
         for i in range(self.num_players):
@@ -29,9 +83,15 @@ class MafiaGame:
             if genetic_population and i < len(genetic_population):
                 genetic_traits = genetic_population[i]
                 
-            player = Player(i, self.num_players, genetic_traits)
+            if pool:
+                player = pool[i]
+                player.rng = self.rng
+                player.reset(genetic_traits=genetic_traits)
+            else:
+                player = Player(i, self.num_players, genetic_traits, self._make_beliefs(i), self.rng)
             self.players.append(player)
             
+        self._player_pool = self.players
         self.alive_players = list(range(self.num_players))
         self.day = 0
         self.phase = PHASES['DAY_DISCUSSION']
@@ -39,75 +99,123 @@ class MafiaGame:
         self.winning_team = None
         
         # Assign roles
-        self._assign_roles()
+        self._assign_roles(roles)
         
-    def _assign_roles(self):
-        """Randomly assign roles to players"""
-        num_mafia = max(1, int(self.num_players * self.config.mafia_ratio))
-        num_detective = int(self.num_players * self.config.detective_prob)
-        num_doctor = int(self.num_players * self.config.doctor_prob)
+        if self.recorder is not None:
+            self.recorder.begin_game(self)
         
-        # Ensure at least one special role if probability > 0
-        if self.config.detective_prob > 0 and num_detective == 0:
-            num_detective = 1
-        if self.config.doctor_prob > 0 and num_doctor == 0:
-            num_doctor = 1
+    def snapshot(self) -> GameSnapshot:
+        """Capture the game state, including the random state, between phases"""
+        return GameSnapshot(self)
+    
+    def restore(self, snapshot: GameSnapshot, restore_random=True):
+        """
+        Put this game into the state captured by a snapshot, reusing its pooled
+        players. With restore_random the game's random state is rewound too, so
+        resume_game replays exactly what followed the snapshot. A recorder
+        keeps its current recording rather than starting a new game.
+        """
+        if snapshot.config.num_players != self.num_players:
+            raise ValueError(f"Snapshot has {snapshot.config.num_players} players, game has {self.num_players}")
             
-        # Limit number of special roles
-        total_special = num_mafia + num_detective + num_doctor
-        if total_special > self.num_players:
-            # Reduce detective and doctor count if needed
-            while total_special > self.num_players and (num_detective > 0 or num_doctor > 0):
-                if num_detective > 0:
-                    num_detective -= 1
-                    total_special -= 1
-                if total_special > self.num_players and num_doctor > 0:
-                    num_doctor -= 1
-                    total_special -= 1
+        recorder, self.recorder = self.recorder, None
+        try:
+            self.initialize_game([state['genetic_traits'] for state in snapshot.players],
+                                 roles=[state['role'] for state in snapshot.players])
+        finally:
+            self.recorder = recorder
+        for player, state in zip(self.players, snapshot.players):
+            player.set_state(state)
             
-            # As a last resort, reduce mafia count
-            while total_special > self.num_players:
-                num_mafia -= 1
-                total_special -= 1
-                
-            # Ensure at least one mafia
-            num_mafia = max(1, num_mafia)
+        self.alive_players = list(snapshot.alive_players)
+        self.day = snapshot.day
+        self.phase = snapshot.phase
+        self.game_over = snapshot.game_over
+        self.winning_team = snapshot.winning_team
+        self.night_kill_target = snapshot.night_kill_target
+        self.night_kill_succeeded = snapshot.night_kill_succeeded
+        self.protected_player = snapshot.protected_player
+        self.log = list(snapshot.log)
+        
+        if restore_random:
+            self.rng.setstate(snapshot.random_state)
+            
+    def fork(self) -> 'MafiaGame':
+        """A new game in the current state of this one, which this game does not affect"""
+        # The fork gets a private generator in the same state, even when this game
+        # draws from the global random module, so neither game moves the other's stream
+        rng = random.Random()
+        rng.setstate(self.rng.getstate())
+        game = type(self)(self.config, rng)
+        game.restore(self.snapshot(), restore_random=False)
+        game.forced_actions = dict(self.forced_actions)
+        return game
         
-        # Create role assignments
-        roles = ['MAFIA'] * num_mafia + ['DETECTIVE'] * num_detective + ['DOCTOR'] * num_doctor
-        remaining = self.num_players - len(roles)
-        roles += ['VILLAGER'] * remaining
+    def _make_beliefs(self, player_id: int):
+        """Create a seat's belief system - None leaves Player to use the default"""
+        if self.config.exact_beliefs:
+            return ExactBeliefSystem(player_id, self.num_players, self.config)
+        if self.config.compact_beliefs:
+            return CompactBeliefSystem(player_id, self.num_players)
+        return None
         
-        # Shuffle and assign
-        random.shuffle(roles)
+    def _assign_roles(self, roles=None):
+        """Randomly assign roles to players, or deal a fixed seating of roles"""
+        if roles is None:
+            roles = self.config.get_roles()
+            # Shuffle and assign
+            self.rng.shuffle(roles)
+        elif len(roles) != self.num_players:
+            raise ValueError(f"Expected {self.num_players} roles, got {len(roles)}")
+            
         for i, player in enumerate(self.players):
             player.assign_role(roles[i])
             
         # Log assignment
+        num_mafia = roles.count('MAFIA')
+        num_detective = roles.count('DETECTIVE')
+        num_doctor = roles.count('DOCTOR')
+        remaining = roles.count('VILLAGER')
         self.log.append(f"Roles assigned: {num_mafia} Mafia, {num_detective} Detective, {num_doctor} Doctor, {remaining} Villagers")
     
-    def run_game(self, max_days=20):
+    def run_game(self, max_days=20, stop_at=None):
         """Run the complete game simulation"""
         self.day = 1
+        self.phase = PHASES['DAY_DISCUSSION']
+        return self.resume_game(max_days, stop_at)
+    
+    def resume_game(self, max_days=20, stop_at=None):
+        """
+        Play on from the current day and phase until the game ends or max_days pass.
         
+        If stop_at is a (day, phase) pair, play pauses just before that phase
+        runs, so the game can be snapshotted or forked at that point.
+        """
         while not self.game_over and self.day <= max_days:
-            self.log.append(f"-- Day {self.day} --")
+            if stop_at == (self.day, self.phase):
+                break
+            if self.deadline is not None and time.perf_counter() >= self.deadline:
+                raise DeadlineExceeded(f"Game passed its deadline on day {self.day}")
+            self._run_phase()
             
-            # Day Discussion Phase
-            self.phase = PHASES['DAY_DISCUSSION']
+        if self.telemetry is not None and (self.game_over or self.day > max_days):
+            self.telemetry.record_game(self.day)
+        return self.winning_team, self.day
+    
+    def _run_phase(self):
+        """Run the current phase and advance to the next one"""
+        if self.phase == PHASES['DAY_DISCUSSION']:
+            self.log.append(f"-- Day {self.day} --")
             self._run_day_discussion()
-            
-            if self.game_over:
-                break
-                
-            # Day Voting Phase
             self.phase = PHASES['DAY_VOTING']
-            self._run_day_voting()
             
+        elif self.phase == PHASES['DAY_VOTING']:
+            self._run_day_voting()
+            self.phase = PHASES['NIGHT_MAFIA']
             if self.game_over:
-                break
-                
-            # Night Phases
+                self._record_day()
+            
+        elif self.phase == PHASES['NIGHT_MAFIA']:
             self.log.append(f"-- Night {self.day} --")
             
             # Reset night action results
@@ -115,16 +223,14 @@ class MafiaGame:
             self.night_kill_succeeded = False
             self.protected_player = None
             
-            # Mafia Phase
-            self.phase = PHASES['NIGHT_MAFIA']
             self._run_night_mafia()
-            
-            # Detective Phase
             self.phase = PHASES['NIGHT_DETECTIVE']
-            self._run_night_detective()
             
-            # Doctor Phase
+        elif self.phase == PHASES['NIGHT_DETECTIVE']:
+            self._run_night_detective()
             self.phase = PHASES['NIGHT_DOCTOR']
+            
+        else:
             self._run_night_doctor()
             
             # Execute night actions
@@ -132,11 +238,33 @@ class MafiaGame:
             
             # Check game over condition
             self._check_game_over()
+            self._record_day()
             
             # Next day
             self.day += 1
-            
-        return self.winning_team, self.day
+            self.phase = PHASES['DAY_DISCUSSION']
+    
+    def _record_day(self):
+        """Hand the end-of-day beliefs to the recorder, if one is attached"""
+        if self.recorder is not None:
+            self.recorder.record_day(self)
+    
+    def _get_statement(self, player_id: int):
+        """Ask a player for their day statement"""
+        return self.players[player_id].make_statement(self.alive_players, self.day)
+    
+    def _get_vote(self, player_id: int) -> int:
+        """Ask a player who they vote for"""
+        return self.players[player_id].get_voting_target(self.alive_players)
+    
+    def _get_night_action(self, player_id: int) -> int:
+        """Ask a player for their night action target"""
+        return self.players[player_id].night_action(self.alive_players)
+    
+    def _choose_target(self, player_id: int, decide) -> int:
+        """A target forced on this player for the current phase, otherwise their own decision"""
+        forced = self.forced_actions.get((self.day, self.phase, player_id))
+        return decide(player_id) if forced is None else forced
     
     def _run_day_discussion(self):
         """Run the day discussion phase"""
@@ -145,17 +273,22 @@ class MafiaGame:
         # Each alive player makes a statement
         for player_id in self.alive_players:
             player = self.players[player_id]
-            statement = player.make_statement(self.alive_players, self.day)
+            statement = self._get_statement(player_id)
             
             # Log the statement
             self.log.append(f"Player {player_id} ({player.role}): {statement['content']}")
             
             # Broadcast statement to all players
-            for observer_id in self.alive_players:
-                if observer_id != player_id:  # Don't need to broadcast to self
-                    observer = self.players[observer_id]
-                    observer.observe_statement(statement['speaker'], statement['type'], 
-                                           statement.get('subject'), statement['day'])
+            self._broadcast_statement(statement)
+    
+    def _broadcast_statement(self, statement):
+        """Let every other alive player observe a statement, all holding one record of it"""
+        record = {'day': statement['day'], 'type': statement['type'], 'subject': statement.get('subject')}
+        for observer_id in self.alive_players:
+            if observer_id != statement['speaker']:  # Don't need to broadcast to self
+                observer = self.players[observer_id]
+                observer.observe_statement(statement['speaker'], statement['type'], 
+                                       statement.get('subject'), statement['day'], record)
     
     def _run_day_voting(self):
         """Run the day voting phase"""
@@ -165,7 +298,7 @@ class MafiaGame:
         votes = {}
         for player_id in self.alive_players:
             player = self.players[player_id]
-            target = player.get_voting_target(self.alive_players)
+            target = self._choose_target(player_id, self._get_vote)
             votes[player_id] = target
             
             # Log the vote
@@ -175,9 +308,7 @@ class MafiaGame:
                 self.log.append(f"Player {player_id} abstains from voting")
             
             # Broadcast vote to all players
-            for observer_id in self.alive_players:
-                observer = self.players[observer_id]
-                observer.observe_vote(player_id, target, self.day)
+            self._broadcast_vote(player_id, target)
                 
         # Count votes
         vote_count = Counter([v for v in votes.values() if v != -1])
@@ -190,7 +321,7 @@ class MafiaGame:
             
             if players_with_max_votes:
                 # In case of tie, randomly choose one
-                eliminated_player = random.choice(players_with_max_votes)
+                eliminated_player = self.rng.choice(players_with_max_votes)
                 self._eliminate_player(eliminated_player, False)
                 self.log.append(f"Player {eliminated_player} ({self.players[eliminated_player].role}) was eliminated by town vote")
                 
@@ -199,6 +330,13 @@ class MafiaGame:
         else:
             self.log.append("No one was eliminated in the vote")
     
+    def _broadcast_vote(self, voter_id: int, target: int):
+        """Let every alive player observe a vote, all holding one record of it"""
+        record = (self.day, voter_id, target)
+        for observer_id in self.alive_players:
+            observer = self.players[observer_id]
+            observer.observe_vote(voter_id, target, self.day, record)
+    
     def _run_night_mafia(self):
         """Run the night mafia phase"""
         # Find alive mafia members
@@ -211,14 +349,13 @@ class MafiaGame:
         # Each mafia member selects a target
         targets = {}
         for mafia_id in alive_mafia:
-            mafia_player = self.players[mafia_id]
-            target = mafia_player.night_action(self.alive_players)
+            target = self._choose_target(mafia_id, self._get_night_action)
             targets[mafia_id] = target
             
         # Combine mafia decisions - simplistic for now (random selection)
         valid_targets = [t for t in targets.values() if t != -1]
         if valid_targets:
-            self.night_kill_target = random.choice(valid_targets)
+            self.night_kill_target = self.rng.choice(valid_targets)
             self.log.append(f"Mafia chose to target Player {self.night_kill_target} for elimination")
     
     def _run_night_detective(self):
@@ -232,7 +369,7 @@ class MafiaGame:
         # Each detective investigates a player
         for detective_id in alive_detectives:
             detective = self.players[detective_id]
-            target = detective.night_action(self.alive_players)
+            target = self._choose_target(detective_id, self._get_night_action)
             
             if target != -1:
                 # Perform investigation
@@ -253,8 +390,7 @@ class MafiaGame:
             
         # Each doctor protects a player
         for doctor_id in alive_doctors:
-            doctor = self.players[doctor_id]
-            target = doctor.night_action(self.alive_players)
+            target = self._choose_target(doctor_id, self._get_night_action)
             
             if target != -1:
                 # Record protection
@@ -0,0 +1,92 @@
+from modules import np,random,List,Optional
+from config import GameConfig
+from evaluation import play_games,make_executor
+from stats import wilson_interval
+
+class MatchupResult:
+    """Outcome of a Monte Carlo matchup estimate"""
+    def __init__(self, team: str, wins: int, games: int, draws: int, confidence: float,
+                 mean_days: float, seat_fitness: List[float], converged: bool):
+        self.team = team
+        self.wins = wins
+        self.games = games
+        self.draws = draws  # Games that hit max_days without a winner
+        self.confidence = confidence
+        self.win_probability = wins / games if games else 0.0
+        self.ci = wilson_interval(wins, games, confidence)
+        self.mean_days = mean_days
+        self.seat_fitness = seat_fitness
+        self.converged = converged
+
+    def __repr__(self):
+        low, high = self.ci
+        return (f"MatchupResult(team={self.team}, p={self.win_probability:.3f}, "
+                f"ci=({low:.3f}, {high:.3f}), games={self.games}, converged={self.converged})")
+
+def estimate_matchup(lineup, game_config: GameConfig = None, team: str = 'TOWN',
+                     tolerance: float = 0.03, confidence: float = 0.95, batch_size: int = 50,
+                     max_games: int = 5000, workers: Optional[int] = None, roles=None,
+                     seed: Optional[int] = None, max_days: int = 20) -> MatchupResult:
+    """
+    Estimate how likely team is to win with the given lineup of trait sets.
+
+    Games are played in batches (one batch per worker process when workers > 1)
+    until the half-width of the win-rate confidence interval drops to tolerance
+    or max_games have been played. Seats keep their lineup position; roles are
+    shuffled every game unless a fixed roles seating is given.
+    """
+    if team not in ('TOWN', 'MAFIA'):
+        raise ValueError(f"Unknown team: {team}")
+    if not game_config:
+        game_config = GameConfig(num_players=len(lineup))
+    if seed is None:
+        seed = random.randrange(2**32)
+
+    executor = make_executor(workers)
+    batches_per_round = workers if executor else 1
+
+    wins = draws = games = 0
+    total_days = 0
+    seat_totals = np.zeros(game_config.num_players)
+    batch_index = 0
+    converged = False
+
+    try:
+        while games < max_games:
+            # Size this round's batches so the budget is never exceeded
+            round_games = min(batch_size * batches_per_round, max_games - games)
+            sizes = [round_games // batches_per_round] * batches_per_round
+            for i in range(round_games % batches_per_round):
+                sizes[i] += 1
+            args = [(game_config, lineup, size, seed + batch_index + i, roles, max_days)
+                    for i, size in enumerate(sizes) if size]
+            batch_index += len(sizes)
+
+            if executor:
+                batches = list(executor.map(play_games, *zip(*args)))
+            else:
+                batches = [play_games(*a) for a in args]
+
+            for batch in batches:
+                for winning_team, days_played, fitness in batch:
+                    games += 1
+                    total_days += days_played
+                    if winning_team == team:
+                        wins += 1
+                    elif winning_team is None:
+                        draws += 1
+                    for seat, score in fitness.items():
+                        seat_totals[seat] += score
+
+            # Sequential stopping on the confidence interval width
+            low, high = wilson_interval(wins, games, confidence)
+            if (high - low) / 2 <= tolerance:
+                converged = True
+                break
+    finally:
+        if executor:
+            executor.shutdown()
+
+    return MatchupResult(team, wins, games, draws, confidence,
+                         total_days / games if games else 0.0,
+                         [float(x) for x in seat_totals / max(games, 1)], converged)
@@ -1,7 +1,20 @@
 import random
-import numpy as np
 from collections import Counter, defaultdict
 from typing import List, Dict, Set, Tuple, Optional
-import copy
-import math
-import time
\ No newline at end of file
+import importlib
+
+# Heavier modules are only imported the first time something asks for them,
+# so light entry points and worker processes don't pay for what they don't use
+_LAZY_MODULES = {
+    'np': 'numpy',
+    'copy': 'copy',
+    'math': 'math',
+    'time': 'time'
+}
+
+def __getattr__(name):
+    if name in _LAZY_MODULES:
+        module = importlib.import_module(_LAZY_MODULES[name])
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
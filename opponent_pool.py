@@ -0,0 +1,179 @@
+from modules import random,np,List,Dict,Optional
+import hashlib
+import json
+import sqlite3
+from traits import GeneticTraits,TRAIT_NAMES
+from evaluation import play_game,create_game
+
+# Bump when the way pool games are seated or scored changes, so stored results expire
+POOL_FORMAT_VERSION = 3
+
+def genome_hash(genome: GeneticTraits) -> str:
+    """Stable hash of a genome's trait values"""
+    return hashlib.sha256(np.asarray(genome.to_vector(), dtype='<f8').tobytes()).hexdigest()[:32]
+
+class OpponentPool:
+    """
+    A fixed, versioned set of reference opponents.
+
+    A genome is scored by playing blocks of seeded games against opponents
+    drawn from the pool. Each block has one game per seat of the table, with
+    the genome dealt each of the table's roles once, so a genome's pool score
+    only depends on its traits and can be compared across generations and runs.
+    """
+    def __init__(self, opponents: List[GeneticTraits], seed: int = 0, name: str = 'pool'):
+        self.opponents = list(opponents)
+        self.seed = seed
+        self.name = name
+
+    @classmethod
+    def generate(cls, size: int = 32, seed: int = 0, name: str = 'random') -> 'OpponentPool':
+        """A pool of random genomes, reproducible from the seed"""
+        rng = random.Random(seed)
+        opponents = [GeneticTraits(rng) for _ in range(size)]
+        return cls(opponents, seed=seed, name=name)
+
+    @classmethod
+    def load(cls, path: str) -> 'OpponentPool':
+        """Load a pool from save, or a population from `evolve --save`"""
+        with open(path) as f:
+            data = json.load(f)
+        if isinstance(data, list):
+            data = {'opponents': data}
+        opponents = [GeneticTraits.from_vector([entry[name] for name in TRAIT_NAMES])
+                     for entry in data['opponents']]
+        return cls(opponents, seed=data.get('seed', 0), name=data.get('name', 'pool'))
+
+    def save(self, path: str):
+        with open(path, 'w') as f:
+            json.dump({'name': self.name, 'seed': self.seed,
+                       'opponents': [vars(genome) for genome in self.opponents]}, f, indent=1)
+
+    def pool_id(self, game_config) -> str:
+        """Identifier of this pool under a game configuration - results are only shared within one id"""
+        digest = hashlib.sha256()
+        for genome in self.opponents:
+            digest.update(genome_hash(genome).encode())
+        # kernel_mode plays identical games, so it is left out
+        rules = [game_config.num_players, game_config.mafia_ratio, game_config.detective_prob,
+                 game_config.doctor_prob, game_config.exact_beliefs]
+        # float32 compact beliefs can play differently, so they get their own results
+        if getattr(game_config, 'compact_beliefs', False):
+            rules.append('compact')
+        digest.update(json.dumps([POOL_FORMAT_VERSION, self.seed, rules]).encode())
+        return f"{self.name}-{digest.hexdigest()[:16]}"
+
+    def play_block(self, genome: GeneticTraits, game_config, block: int, game=None,
+                   max_days: int = 20) -> float:
+        """Mean fitness of the genome over one block of seeded pool games"""
+        num_players = game_config.num_players
+        if len(self.opponents) < num_players - 1:
+            raise ValueError(f"Pool has {len(self.opponents)} opponents, a table needs {num_players - 1}")
+        if game is None:
+            game = create_game(game_config)
+        return sum(self.play_seat(genome, game_config, block, seat, game, max_days)
+                   for seat in range(num_players)) / num_players
+
+    @staticmethod
+    def seat_order(game_config) -> List[int]:
+        """
+        Order the seats of a block are played in: one seat of each role in
+        turn, so the first few games of a block already cover every role
+        rather than the mafia seats dealt first
+        """
+        table_roles = game_config.get_roles()
+        seen = {}
+        ranks = []
+        for seat, role in enumerate(table_roles):
+            ranks.append((seen.get(role, 0), table_roles.index(role), seat))
+            seen[role] = seen.get(role, 0) + 1
+        return [seat for _, _, seat in sorted(ranks)]
+
+    def play_seat(self, genome: GeneticTraits, game_config, block: int, seat: int, game,
+                  max_days: int = 20) -> float:
+        """
+        Fitness of the genome in the seat'th game of a block, where it is dealt
+        the seat'th role of the table. Playing a role specialist per seat gives
+        a score directly comparable to play_block.
+        """
+        num_players = game_config.num_players
+        table_roles = game_config.get_roles()
+        seed = self.seed + block * num_players + seat
+        # A private generator picks opponents and roles and plays the game
+        # without touching the global stream
+        rng = random.Random(seed)
+        lineup = [genome] + rng.sample(self.opponents, num_players - 1)
+        others = table_roles[:seat] + table_roles[seat + 1:]
+        rng.shuffle(others)
+        roles = [table_roles[seat]] + others
+
+        game.rng = rng
+        _, _, fitness = play_game(game_config, lineup, roles, max_days, game)
+        return fitness[0]
+
+class EvaluationStore:
+    """SQLite store of pool game scores keyed by (genome hash, pool id, game number)"""
+    def __init__(self, path: str = ':memory:'):
+        self.connection = sqlite3.connect(path)
+        self.connection.execute('CREATE TABLE IF NOT EXISTS pool_games (genome TEXT, pool TEXT, game INTEGER, '
+                                'fitness REAL, PRIMARY KEY (genome, pool, game))')
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, genome: str, pool: str, game: int) -> Optional[float]:
+        row = self.connection.execute('SELECT fitness FROM pool_games WHERE genome = ? AND pool = ? AND game = ?',
+                                      (genome, pool, game)).fetchone()
+        if row:
+            self.hits += 1
+            return row[0]
+        self.misses += 1
+        return None
+
+    def put_many(self, rows):
+        """Store (genome hash, pool id, game number, fitness) rows in one transaction"""
+        self.connection.executemany('INSERT OR REPLACE INTO pool_games VALUES (?, ?, ?, ?)', rows)
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+def evaluate_against_pool(genomes: List[GeneticTraits], pool: OpponentPool, game_config,
+                          games_per_individual: int, store: Optional[EvaluationStore] = None,
+                          telemetry=None, deadline: Optional[float] = None) -> Dict[int, float]:
+    """
+    Score genomes on their first games_per_individual pool games, reading
+    finished games from the store and saving new ones to it. Games run
+    through each block's seats in seat_order, so every genome plays the same
+    games and a whole block covers every seat once. Simulated games are
+    reported to telemetry, if given, and raise DeadlineExceeded once
+    time.perf_counter() passes the deadline.
+    """
+    num_games = max(1, games_per_individual)
+    num_players = game_config.num_players
+    seats = pool.seat_order(game_config)
+    pool_id = pool.pool_id(game_config)
+    game = create_game(game_config)
+    game.telemetry = telemetry
+    game.deadline = deadline
+    scores = {}
+    new_rows = []
+    # Genomes repeated within a population, such as copied elites, are only played once
+    done = {}
+
+    for i, genome in enumerate(genomes):
+        key = genome_hash(genome)
+        if key not in done:
+            total = 0.0
+            for number in range(num_games):
+                fitness = store.get(key, pool_id, number) if store else None
+                if fitness is None:
+                    block, seat = divmod(number, num_players)
+                    fitness = pool.play_seat(genome, game_config, block, seats[seat], game)
+                    new_rows.append((key, pool_id, number, fitness))
+                total += fitness
+            done[key] = total / num_games
+        scores[i] = done[key]
+
+    if store and new_rows:
+        store.put_many(new_rows)
+    return scores
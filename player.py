@@ -1,18 +1,22 @@
 from modules import random,List,Tuple,Dict,Counter
 from traits import GeneticTraits    
 from belief import BeliefSystem
+from strategy import CompiledStrategy,INVESTIGATE_SUSPICIOUS,PROTECT_SELF,PROTECT_VALUABLE
 
 class Player:
     """Base class for all players in the game"""
-    def __init__(self, player_id: int, num_players: int, genetic_traits: GeneticTraits = None):
+    def __init__(self, player_id: int, num_players: int, genetic_traits: GeneticTraits = None,
+                 beliefs: BeliefSystem = None, rng=None):
         self.player_id = player_id
+        # Source of the player's random decisions - the game's rng, or the global random module
+        self.rng = rng if rng is not None else random
         self.num_players = num_players
         self.role = None
         self.alive = True
-        self.beliefs = BeliefSystem(player_id, num_players)
+        self.beliefs = beliefs if beliefs else BeliefSystem(player_id, num_players)
         
         # Genetic traits - initialize random if not provided
-        self.genetic_traits = genetic_traits if genetic_traits else GeneticTraits()
+        self.genetic_traits = genetic_traits if genetic_traits else GeneticTraits(self.rng)
         
         # Game state tracking
         self.day = 0
@@ -21,9 +25,77 @@ class Player:
         self.statements_made = []
         self.protected_by_doctor = False
         
+        self.compile_strategy()
+        
+    def reset(self, role: str = None, genetic_traits: GeneticTraits = None):
+        """Reinitialize the player in place for a new game, reusing its belief system"""
+        self.role = None
+        self.alive = True
+        self.beliefs.reset()
+        self.genetic_traits = genetic_traits if genetic_traits else GeneticTraits(self.rng)
+        
+        self.day = 0
+        self.last_statement = None
+        self.game_history.clear()
+        self.statements_made.clear()
+        self.protected_by_doctor = False
+        
+        self.compile_strategy()
+        if role is not None:
+            self.assign_role(role)
+            
+    def compile_strategy(self):
+        """Compile the genetic traits and role into the tables the decision methods branch on"""
+        self.strategy = CompiledStrategy(self.genetic_traits)
+        self._bind_role()
+        
+    def _bind_role(self):
+        """Point the role-dependent decision steps at this role's methods"""
+        if self.role == 'MAFIA':
+            self._vote = self._mafia_vote
+            self._accuse = self._mafia_accusation
+            self._defend = self._mafia_defense
+        else:
+            self._vote = self._town_vote
+            self._accuse = self._town_accusation
+            self._defend = self._town_defense
+        self._night_action = {
+            'MAFIA': self.mafia_kill_target,
+            'DETECTIVE': self.detective_investigate_target,
+            'DOCTOR': self.doctor_protect_target,
+        }.get(self.role)
+        
+    def get_state(self):
+        """Copy of the player's mutable state, for game snapshots - traits are shared"""
+        return {
+            'role': self.role,
+            'alive': self.alive,
+            'genetic_traits': self.genetic_traits,
+            'day': self.day,
+            'last_statement': self.last_statement,
+            'game_history': tuple(self.game_history),
+            'statements_made': tuple(self.statements_made),
+            'protected_by_doctor': self.protected_by_doctor,
+            'beliefs': self.beliefs.get_state()
+        }
+        
+    def set_state(self, state):
+        """Load a state from get_state in place"""
+        self.role = state['role']
+        self.alive = state['alive']
+        self.genetic_traits = state['genetic_traits']
+        self.day = state['day']
+        self.last_statement = state['last_statement']
+        self.game_history[:] = state['game_history']
+        self.statements_made[:] = state['statements_made']
+        self.protected_by_doctor = state['protected_by_doctor']
+        self.beliefs.set_state(state['beliefs'])
+        self.compile_strategy()
+        
     def assign_role(self, role: str):
         """Assign a role to the player"""
         self.role = role
+        self._bind_role()
         # Update belief system with knowledge of own role
         self.beliefs.update_known_role(self.player_id, role)
         
@@ -31,13 +103,14 @@ class Player:
         """Observe another player's death and update beliefs"""
         self.beliefs.update_from_death(player_id, was_killed_at_night, revealed_role)
         
-    def observe_vote(self, voter_id: int, target_id: int, day: int):
+    def observe_vote(self, voter_id: int, target_id: int, day: int, record: Tuple = None):
         """Observe a vote and update beliefs"""
-        self.beliefs.update_beliefs_from_vote(voter_id, target_id, day)
+        self.beliefs.update_beliefs_from_vote(voter_id, target_id, day, record)
         
-    def observe_statement(self, speaker_id: int, statement_type: str, subject_id: int, day: int):
+    def observe_statement(self, speaker_id: int, statement_type: str, subject_id: int, day: int,
+                          record: Dict = None):
         """Observe a statement made by another player"""
-        self.beliefs.record_statement(speaker_id, statement_type, subject_id, day)
+        self.beliefs.record_statement(speaker_id, statement_type, subject_id, day, record)
         
     def get_voting_target(self, alive_players: List[int]) -> int:
         """Decide who to vote for during the day"""
@@ -45,129 +118,72 @@ class Player:
             return -1
             
         # Check if we should vote randomly based on genetic traits
-        if random.random() < self.genetic_traits.vote_randomness:
+        if self.rng.random() < self.strategy.vote_randomness:
             valid_targets = [p for p in alive_players if p != self.player_id]
             if valid_targets:
-                return random.choice(valid_targets)
+                return self.rng.choice(valid_targets)
             return -1
             
-        # Get mafia probability rankings
-        mafia_probs = self.beliefs.get_most_likely_mafia(alive_players)
-        
         # Different voting strategies based on role
-        if self.role == 'MAFIA':
-            # As mafia, avoid voting for other mafia and try to eliminate threats
-            # Get known mafia
-            known_mafia = list(self.beliefs.known_facts['is_mafia'])
+        return self._vote(alive_players)
+        
+    def _mafia_vote(self, alive_players: List[int]) -> int:
+        """As mafia, avoid voting for other mafia and try to eliminate threats"""
+        # Get known mafia
+        known_mafia = list(self.beliefs.known_facts['is_mafia'])
+        
+        # Identify most threatening non-mafia players
+        threats = []
+        for player_id, probability in self.beliefs.get_most_likely_detective(alive_players):
+            if player_id not in known_mafia and player_id != self.player_id:
+                threats.append((player_id, 2 * probability))  # Detectives are high-priority targets
             
-            # Identify most threatening non-mafia players
-            threats = []
-            for player_id, probability in self.beliefs.get_most_likely_detective(alive_players):
-                if player_id not in known_mafia and player_id != self.player_id:
-                    threats.append((player_id, 2 * probability))  # Detectives are high-priority targets
+        # Add untrusted players who might suspect us
+        for player_id, trust in self.beliefs.get_most_trusted(alive_players):
+            if player_id not in known_mafia and player_id != self.player_id:
+                inverse_trust = 1.0 - trust
+                threats.append((player_id, inverse_trust))
                 
-            # Add untrusted players who might suspect us
-            for player_id, trust in self.beliefs.get_most_trusted(alive_players):
-                if player_id not in known_mafia and player_id != self.player_id:
-                    inverse_trust = 1.0 - trust
-                    threats.append((player_id, inverse_trust))
-                    
-            # Sort threats by priority
-            threats.sort(key=lambda x: x[1], reverse=True)
-            
-            if threats:
-                return threats[0][0]
-            
-            # Fall back to random non-mafia
-            valid_targets = [p for p in alive_players if p not in known_mafia and p != self.player_id]
-            if valid_targets:
-                return random.choice(valid_targets)
-            return -1
+        # Sort threats by priority
+        threats.sort(key=lambda x: x[1], reverse=True)
         
-        else:
-            # As villager/detective/doctor, vote for most likely mafia
-            if mafia_probs:
-                return mafia_probs[0][0]  # Vote for player with highest mafia probability
-            
-            # If no clear target, vote for least trusted player
-            trusted_players = self.beliefs.get_most_trusted(alive_players)
-            if trusted_players:
-                return trusted_players[-1][0]  # Vote for least trusted
-            
-            # Fall back to random vote
-            valid_targets = [p for p in alive_players if p != self.player_id]
-            if valid_targets:
-                return random.choice(valid_targets)
-            return -1
+        if threats:
+            return threats[0][0]
+        
+        # Fall back to random non-mafia
+        valid_targets = [p for p in alive_players if p not in known_mafia and p != self.player_id]
+        if valid_targets:
+            return self.rng.choice(valid_targets)
+        return -1
+        
+    def _town_vote(self, alive_players: List[int]) -> int:
+        """As villager/detective/doctor, vote for most likely mafia"""
+        mafia_probs = self.beliefs.get_most_likely_mafia(alive_players)
+        if mafia_probs:
+            return mafia_probs[0][0]  # Vote for player with highest mafia probability
+        
+        # If no clear target, vote for least trusted player
+        trusted_players = self.beliefs.get_most_trusted(alive_players)
+        if trusted_players:
+            return trusted_players[-1][0]  # Vote for least trusted
+        
+        # Fall back to random vote
+        valid_targets = [p for p in alive_players if p != self.player_id]
+        if valid_targets:
+            return self.rng.choice(valid_targets)
+        return -1
             
     def make_statement(self, alive_players: List[int], day: int) -> Dict:
         """Generate a statement during day discussion phase"""
         statement = {'day': day, 'speaker': self.player_id, 'type': None, 'subject': None, 'content': None}
         
         # Base probability of making an accusation on genetic traits
-        if random.random() < self.genetic_traits.accusation_threshold:
-            # Make an accusation
-            if self.role == 'MAFIA':
-                # As mafia, strategically accuse non-mafia players
-                # Try to avoid accusing other mafia
-                known_mafia = list(self.beliefs.known_facts['is_mafia'])
-                valid_targets = [p for p in alive_players if p != self.player_id and p not in known_mafia]
-                
-                if valid_targets:
-                    # Prioritize suspicion on detectives or those who might suspect us
-                    detective_probs = self.beliefs.get_most_likely_detective(valid_targets)
-                    
-                    if detective_probs and random.random() < 0.7:
-                        target = detective_probs[0][0]
-                    else:
-                        # Accuse someone who seems trusted
-                        trusted_players = self.beliefs.get_most_trusted(valid_targets)
-                        if trusted_players:
-                            # Target the most trusted non-mafia player
-                            target = trusted_players[0][0]
-                        else:
-                            target = random.choice(valid_targets)
-                            
-                    statement['type'] = 'accuse'
-                    statement['subject'] = target
-                    statement['content'] = f"Player {target} is acting suspiciously and might be mafia."
-            else:
-                # As non-mafia, accuse based on beliefs
-                mafia_probs = self.beliefs.get_most_likely_mafia(alive_players)
-                
-                if mafia_probs:
-                    # Only accuse if we have a reasonable suspicion
-                    target, prob = mafia_probs[0]
-                    
-                    if prob > 0.5 or random.random() < self.genetic_traits.false_accusation_rate:
-                        statement['type'] = 'accuse'
-                        statement['subject'] = target
-                        statement['content'] = f"I suspect Player {target} is mafia based on their behavior."
+        if self.rng.random() < self.strategy.accusation_threshold:
+            self._accuse(statement, alive_players)
         
         # If we didn't make an accusation, consider defending someone
-        if not statement['type'] and random.random() < 0.4:
-            if self.role == 'MAFIA':
-                # As mafia, occasionally defend fellow mafia
-                known_mafia = list(self.beliefs.known_facts['is_mafia'])
-                fellow_mafia = [p for p in alive_players if p != self.player_id and p in known_mafia]
-                
-                if fellow_mafia and random.random() < self.genetic_traits.deception_skill:
-                    target = random.choice(fellow_mafia)
-                    statement['type'] = 'defend'
-                    statement['subject'] = target
-                    statement['content'] = f"I think Player {target} is innocent and being unfairly accused."
-            else:
-                # As non-mafia, defend those we believe are innocent
-                trusted_players = self.beliefs.get_most_trusted(alive_players)
-                
-                if trusted_players:
-                    # Find a trusted player with low mafia probability
-                    for player_id, trust in trusted_players:
-                        if player_id != self.player_id and self.beliefs.role_beliefs['MAFIA'][player_id] < 0.3:
-                            statement['type'] = 'defend'
-                            statement['subject'] = player_id
-                            statement['content'] = f"I believe Player {player_id} is innocent."
-                            break
+        if not statement['type'] and self.rng.random() < 0.4:
+            self._defend(statement, alive_players)
         
         # If still no statement type, make a generic comment
         if not statement['type']:
@@ -179,20 +195,77 @@ class Player:
         self.last_statement = statement
         
         return statement
+        
+    def _mafia_accusation(self, statement: Dict, alive_players: List[int]):
+        """As mafia, strategically accuse non-mafia players"""
+        # Try to avoid accusing other mafia
+        known_mafia = list(self.beliefs.known_facts['is_mafia'])
+        valid_targets = [p for p in alive_players if p != self.player_id and p not in known_mafia]
+        
+        if valid_targets:
+            # Prioritize suspicion on detectives or those who might suspect us
+            detective_probs = self.beliefs.get_most_likely_detective(valid_targets)
+            
+            if detective_probs and self.rng.random() < 0.7:
+                target = detective_probs[0][0]
+            else:
+                # Accuse someone who seems trusted
+                trusted_players = self.beliefs.get_most_trusted(valid_targets)
+                if trusted_players:
+                    # Target the most trusted non-mafia player
+                    target = trusted_players[0][0]
+                else:
+                    target = self.rng.choice(valid_targets)
+                    
+            statement['type'] = 'accuse'
+            statement['subject'] = target
+            statement['content'] = f"Player {target} is acting suspiciously and might be mafia."
+            
+    def _town_accusation(self, statement: Dict, alive_players: List[int]):
+        """As non-mafia, accuse based on beliefs"""
+        mafia_probs = self.beliefs.get_most_likely_mafia(alive_players)
+        
+        if mafia_probs:
+            # Only accuse if we have a reasonable suspicion
+            target, prob = mafia_probs[0]
+            
+            if prob > 0.5 or self.rng.random() < self.strategy.false_accusation_rate:
+                statement['type'] = 'accuse'
+                statement['subject'] = target
+                statement['content'] = f"I suspect Player {target} is mafia based on their behavior."
+                
+    def _mafia_defense(self, statement: Dict, alive_players: List[int]):
+        """As mafia, occasionally defend fellow mafia"""
+        known_mafia = list(self.beliefs.known_facts['is_mafia'])
+        fellow_mafia = [p for p in alive_players if p != self.player_id and p in known_mafia]
+        
+        if fellow_mafia and self.rng.random() < self.strategy.deception_skill:
+            target = self.rng.choice(fellow_mafia)
+            statement['type'] = 'defend'
+            statement['subject'] = target
+            statement['content'] = f"I think Player {target} is innocent and being unfairly accused."
+            
+    def _town_defense(self, statement: Dict, alive_players: List[int]):
+        """As non-mafia, defend those we believe are innocent"""
+        trusted_players = self.beliefs.get_most_trusted(alive_players)
+        
+        if trusted_players:
+            # Find a trusted player with low mafia probability
+            for player_id, trust in trusted_players:
+                if player_id != self.player_id and self.beliefs.role_beliefs['MAFIA'][player_id] < 0.3:
+                    statement['type'] = 'defend'
+                    statement['subject'] = player_id
+                    statement['content'] = f"I believe Player {player_id} is innocent."
+                    break
 
     def night_action(self, alive_players: List[int]) -> int:
         """Perform a night action based on role"""
         if not alive_players or len(alive_players) <= 1:
             return -1
             
-        if self.role == 'MAFIA':
-            return self.mafia_kill_target(alive_players)
-        elif self.role == 'DETECTIVE':
-            return self.detective_investigate_target(alive_players)
-        elif self.role == 'DOCTOR':
-            return self.doctor_protect_target(alive_players)
-        else:
+        if self._night_action is None:
             return -1  # Villagers have no night action
+        return self._night_action(alive_players)
             
     def mafia_kill_target(self, alive_players: List[int]) -> int:
         """Select a player to kill during the night (mafia only)"""
@@ -237,7 +310,7 @@ class Player:
             return target
             
         # Fall back to random selection
-        return random.choice(valid_targets)
+        return self.rng.choice(valid_targets)
     
     def detective_investigate_target(self, alive_players: List[int]) -> int:
         """Select a player to investigate (detective only)"""
@@ -251,17 +324,17 @@ class Player:
             return -1
             
         # Use genetic trait to determine investigation strategy
-        if self.genetic_traits.detective_investigation_strategy < 0.5:
+        if self.strategy.investigation == INVESTIGATE_SUSPICIOUS:
             # Strategy: Focus on most suspicious first
             mafia_probs = self.beliefs.get_most_likely_mafia(valid_targets)
             if mafia_probs:
                 return mafia_probs[0][0]
         else:
             # Strategy: Random investigation (information gathering)
-            return random.choice(valid_targets)
+            return self.rng.choice(valid_targets)
             
         # Fall back to random selection
-        return random.choice(valid_targets)
+        return self.rng.choice(valid_targets)
     
     def doctor_protect_target(self, alive_players: List[int]) -> int:
         """Select a player to protect (doctor only)"""
@@ -271,10 +344,11 @@ class Player:
             return -1
             
         # Determine protection strategy based on genetic traits
-        if self.genetic_traits.doctor_protection_strategy < 0.3:
+        protection = self.strategy.protection
+        if protection == PROTECT_SELF:
             # Strategy: Protect self
             return self.player_id
-        elif self.genetic_traits.doctor_protection_strategy < 0.7:
+        elif protection == PROTECT_VALUABLE:
             # Strategy: Protect most valuable players (detectives or trusted)
             detective_probs = self.beliefs.get_most_likely_detective(alive_players)
             if detective_probs and detective_probs[0][1] > 0.6:
@@ -310,7 +384,7 @@ class Player:
                 return most_likely_target
                 
         # Fall back to random protection
-        return random.choice(valid_targets)
+        return self.rng.choice(valid_targets)
     
     def update_from_detective_result(self, player_id: int, is_mafia: bool):
         """Update beliefs based on detective investigation results"""
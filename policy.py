@@ -0,0 +1,320 @@
+"""
+External decision policies
+--------------------------
+Lets agents other than the genetic Player, such as a learned policy served
+by a separate model process, play seats in MafiaGame.
+
+Decisions are requested a phase at a time: when a phase starts, every
+policy-controlled seat that acts in it is asked for its vote, statement or
+night target from the state at the start of the phase. PolicyRunner
+interleaves many games on one asyncio loop and sends the pending requests
+of all of them to the policy in a single batch.
+"""
+
+from modules import np,random,time,List,Dict,Optional
+import asyncio
+import json
+from constants import PHASES
+from mafia import MafiaGame
+
+# Largest JSON line accepted on a policy connection
+STREAM_LIMIT = 64 * 2**20
+
+# Phases in which seats of each role make a decision
+_ACTING_ROLES = {
+    PHASES['NIGHT_MAFIA']: 'MAFIA',
+    PHASES['NIGHT_DETECTIVE']: 'DETECTIVE',
+    PHASES['NIGHT_DOCTOR']: 'DOCTOR',
+}
+_DECISION_KINDS = {
+    PHASES['DAY_DISCUSSION']: 'statement',
+    PHASES['DAY_VOTING']: 'vote',
+}
+
+class Policy:
+    """
+    Interface for a batched decision policy.
+
+    decide_batch receives a list of JSON-ready request dicts with keys game,
+    seat, kind ('statement', 'vote' or 'night_action'), role, day, alive,
+    valid_targets, mafia_beliefs and trust, and returns one decision per
+    request: a target seat (-1 to abstain) for votes and night actions, or a
+    {'type': 'accuse' | 'defend' | 'comment', 'subject': seat or None} dict
+    for statements.
+    """
+    async def decide_batch(self, requests: List[Dict]) -> List:
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+class HeuristicPolicy(Policy):
+    """
+    In-process stand-in for a learned policy: town seats act on their most
+    suspected player, mafia seats pick at random among valid targets
+    """
+    def __init__(self, seed: Optional[int] = None, delay: float = 0.0):
+        self.rng = random.Random(seed)
+        self.delay = delay  # Simulated per-batch inference latency in seconds
+        self._lock = None
+
+    async def decide_batch(self, requests: List[Dict]) -> List:
+        if self.delay:
+            # Like a single model worker, overlapping calls wait their turn
+            if self._lock is None:
+                self._lock = asyncio.Lock()
+            async with self._lock:
+                await asyncio.sleep(self.delay)
+        return [decide_heuristic(request, self.rng) for request in requests]
+
+def decide_heuristic(request: Dict, rng) -> object:
+    """Decision of the stub policy for one request"""
+    targets = request['valid_targets']
+    suspects = sorted(targets, key=lambda p: -request['mafia_beliefs'][p])
+    if request['kind'] == 'statement':
+        if request['role'] != 'MAFIA' and suspects and request['mafia_beliefs'][suspects[0]] > 0.3:
+            return {'type': 'accuse', 'subject': suspects[0]}
+        return {'type': 'comment', 'subject': None}
+    if not targets:
+        return -1
+    if request['role'] == 'MAFIA':
+        return rng.choice(targets)
+    if request['role'] == 'DOCTOR':
+        # Protect whoever this seat trusts most
+        return max(targets, key=lambda p: request['trust'][p])
+    return suspects[0]
+
+class RemotePolicy(Policy):
+    """
+    Policy served by another process over TCP. Each batch is one line of JSON
+    {"requests": [...]} answered by one line {"decisions": [...]}.
+    """
+    def __init__(self, host: str = '127.0.0.1', port: int = 8765):
+        self.host = host
+        self.port = port
+        self._reader = None
+        self._writer = None
+        self._lock = None
+
+    async def decide_batch(self, requests: List[Dict]) -> List:
+        # Replies are matched to requests by order, so one batch is in flight at a time
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._writer is None:
+                self._reader, self._writer = await asyncio.open_connection(self.host, self.port,
+                                                                               limit=STREAM_LIMIT)
+            self._writer.write(json.dumps({'requests': requests}).encode() + b'\n')
+            await self._writer.drain()
+            return json.loads(await self._reader.readline())['decisions']
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            await self._writer.wait_closed()
+            self._writer = None
+
+async def start_stub_server(host: str = '127.0.0.1', port: int = 0, policy: Optional[Policy] = None):
+    """
+    Start a local policy server answering batches with the given policy
+    (HeuristicPolicy by default). Returns the asyncio server; port 0 picks a
+    free port, available as server.sockets[0].getsockname()[1].
+    """
+    policy = policy or HeuristicPolicy(seed=0)
+
+    async def handle(reader, writer):
+        while line := await reader.readline():
+            decisions = await policy.decide_batch(json.loads(line)['requests'])
+            writer.write(json.dumps({'decisions': decisions}).encode() + b'\n')
+            await writer.drain()
+        writer.close()
+
+    return await asyncio.start_server(handle, host, port, limit=STREAM_LIMIT)
+
+def serve_stub_policy(host: str = '127.0.0.1', port: int = 8765, delay: float = 0.0):
+    """Run the stub policy server until interrupted"""
+    async def main():
+        server = await start_stub_server(host, port, HeuristicPolicy(seed=0, delay=delay))
+        print(f"Stub policy server listening on {host}:{server.sockets[0].getsockname()[1]}")
+        async with server:
+            await server.serve_forever()
+    asyncio.run(main())
+
+class BatchMetrics:
+    """Batch sizes and policy call latencies of a PolicyRunner"""
+    def __init__(self):
+        self.batch_sizes = []
+        self.latencies = []
+        self.started = time.perf_counter()
+
+    def record(self, size: int, latency: float):
+        self.batch_sizes.append(size)
+        self.latencies.append(latency)
+
+    def summary(self) -> Dict:
+        elapsed = time.perf_counter() - self.started
+        sizes = np.array(self.batch_sizes or [0])
+        latencies = np.array(self.latencies or [0.0]) * 1000
+        return {
+            'batches': len(self.batch_sizes),
+            'decisions': int(sizes.sum()),
+            'mean_batch_size': float(sizes.mean()),
+            'max_batch_size': int(sizes.max()),
+            'latency_p50_ms': float(np.percentile(latencies, 50)),
+            'latency_p95_ms': float(np.percentile(latencies, 95)),
+            'decisions_per_second': float(sizes.sum() / elapsed) if elapsed > 0 else 0.0,
+        }
+
+class PolicyMafiaGame(MafiaGame):
+    """MafiaGame whose policy_seats take the decisions set for the current phase"""
+    def __init__(self, config, rng=None, policy_seats=()):
+        super().__init__(config, rng)
+        self.policy_seats = set(policy_seats)
+        self.decisions = {}
+        self._valid_targets = {}
+
+    def pending_requests(self, game_id: int = 0) -> List[Dict]:
+        """Decision requests for the policy seats that act in the current phase"""
+        kind = _DECISION_KINDS.get(self.phase, 'night_action')
+        acting_role = _ACTING_ROLES.get(self.phase)
+        requests = []
+        self._valid_targets = {}
+        for seat in self.alive_players:
+            player = self.players[seat]
+            if seat not in self.policy_seats or (acting_role and player.role != acting_role):
+                continue
+            # Only a doctor's night protection may target its own seat
+            valid = [p for p in self.alive_players
+                     if p != seat or (player.role == 'DOCTOR' and kind == 'night_action')]
+            if player.role == 'MAFIA' and kind == 'night_action':
+                valid = [p for p in valid if self.players[p].role != 'MAFIA']
+            self._valid_targets[seat] = valid
+            requests.append({
+                'game': game_id,
+                'seat': seat,
+                'kind': kind,
+                'role': player.role,
+                'day': self.day,
+                'alive': list(self.alive_players),
+                'valid_targets': valid,
+                'mafia_beliefs': player.beliefs.role_beliefs['MAFIA'].tolist(),
+                'trust': player.beliefs.trust_levels.tolist(),
+            })
+        return requests
+
+    def _get_statement(self, player_id: int):
+        if player_id not in self.policy_seats:
+            return super()._get_statement(player_id)
+        decision = self.decisions.get(player_id) or {}
+        kind, subject = decision.get('type'), decision.get('subject')
+        if kind not in ('accuse', 'defend') or subject not in self._valid_targets.get(player_id, ()):
+            kind, subject = 'comment', None
+        content = {
+            'accuse': f"I suspect Player {subject} is mafia.",
+            'defend': f"I believe Player {subject} is innocent.",
+            'comment': "I'm observing everyone's behavior closely.",
+        }[kind]
+        statement = {'day': self.day, 'speaker': player_id, 'type': kind, 'subject': subject, 'content': content}
+        player = self.players[player_id]
+        player.statements_made.append(statement)
+        player.last_statement = statement
+        return statement
+
+    def _get_vote(self, player_id: int) -> int:
+        if player_id not in self.policy_seats:
+            return super()._get_vote(player_id)
+        return self._valid_target(player_id)
+
+    def _get_night_action(self, player_id: int) -> int:
+        if player_id not in self.policy_seats:
+            return super()._get_night_action(player_id)
+        return self._valid_target(player_id)
+
+    def _valid_target(self, player_id: int) -> int:
+        # Missing or invalid decisions become abstentions
+        target = self.decisions.get(player_id, -1)
+        return target if target in self._valid_targets.get(player_id, ()) else -1
+
+class PolicyRunner:
+    """
+    Plays many PolicyMafiaGames concurrently on one asyncio loop. Each game
+    runs until its policy seats need decisions, and once every unfinished game
+    is waiting (or max_batch requests are queued) the queued requests go to
+    the policy as one batch.
+    """
+    def __init__(self, policy: Policy, max_batch: Optional[int] = None):
+        self.policy = policy
+        self.max_batch = max_batch
+        self.metrics = BatchMetrics()
+        self._queue = []
+        self._active = 0
+        self._flush_lock = None
+
+    async def _request(self, requests: List[Dict]) -> List:
+        future = asyncio.get_running_loop().create_future()
+        self._queue.append((requests, future))
+        queued = sum(len(r) for r, _ in self._queue)
+        if len(self._queue) >= self._active or (self.max_batch and queued >= self.max_batch):
+            await self._flush()
+        return await future
+
+    async def _flush(self):
+        # Only one batch goes to the policy at a time; a flush started meanwhile
+        # sends whatever has queued up once the earlier batch is answered
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            batch, self._queue = self._queue, []
+            if not batch:
+                return
+            requests = [request for group, _ in batch for request in group]
+            start = time.perf_counter()
+            decisions = await self.policy.decide_batch(requests)
+            self.metrics.record(len(requests), time.perf_counter() - start)
+
+        offset = 0
+        for group, future in batch:
+            future.set_result(decisions[offset:offset + len(group)])
+            offset += len(group)
+
+    async def play(self, game: PolicyMafiaGame, game_id: int, lineup, max_days: int = 20):
+        """Play one game, awaiting the policy whenever its seats act"""
+        game.initialize_game(lineup)
+        game.day = 1
+        game.phase = PHASES['DAY_DISCUSSION']
+        try:
+            while not game.game_over and game.day <= max_days:
+                requests = game.pending_requests(game_id)
+                game.decisions = {}
+                if requests:
+                    decisions = await self._request(requests)
+                    game.decisions = {r['seat']: d for r, d in zip(requests, decisions)}
+                game._run_phase()
+        finally:
+            # A finished game no longer holds back the batch
+            self._active -= 1
+            if self._queue and len(self._queue) >= self._active:
+                await self._flush()
+        return game.winning_team, game.day, game.get_player_fitness()
+
+    async def run(self, game_config, lineups, policy_seats, max_days: int = 20, seed: Optional[int] = None):
+        """Play one game per lineup concurrently and return their (winning team, days, fitness)"""
+        seed = random.randrange(2**32) if seed is None else seed
+        games = [PolicyMafiaGame(game_config, random.Random(seed + i), policy_seats) for i in range(len(lineups))]
+        self._active = len(games)
+        return await asyncio.gather(*(self.play(game, i, lineup, max_days)
+                                      for i, (game, lineup) in enumerate(zip(games, lineups))))
+
+def run_policy_games(game_config, lineups, policy: Policy, policy_seats, max_days: int = 20,
+                     seed: Optional[int] = None, max_batch: Optional[int] = None):
+    """Play the lineups with policy_seats driven by the policy; returns results and batch metrics"""
+    runner = PolicyRunner(policy, max_batch)
+
+    async def main():
+        try:
+            return await runner.run(game_config, lineups, policy_seats, max_days, seed)
+        finally:
+            await policy.close()
+
+    results = asyncio.run(main())
+    return results, runner.metrics.summary()
@@ -0,0 +1,114 @@
+from modules import random,math,List,Dict,Tuple,Optional
+from statistics import NormalDist
+from constants import ROLES
+from opponent_pool import genome_hash
+
+_NORMAL = NormalDist()
+
+class RatingSystem:
+    """
+    TrueSkill-style skill ratings for genomes, kept separately for each role.
+
+    Each (genome, role) pair has a Gaussian skill estimate (mu, sigma) that is
+    updated after every game from the two-team outcome, town against mafia.
+    Ratings are keyed by genome hash, so elites and other surviving genomes
+    keep theirs across generations while new children start at the prior.
+    """
+    def __init__(self, mu: float = 25.0, sigma: float = 25.0 / 3, beta: float = 25.0 / 6,
+                 tau: float = 25.0 / 300, conservative_k: float = 3.0, select_on_rating: bool = True):
+        self.mu = mu                            # Prior mean skill
+        self.sigma = sigma                      # Prior skill uncertainty
+        self.beta = beta                        # Per-game performance noise
+        self.tau = tau                          # Skill drift added before every game
+        self.conservative_k = conservative_k    # Conservative estimate is mu - k * sigma
+        self.select_on_rating = select_on_rating
+
+        self.ratings = {}  # (genome hash, role) -> (mu, sigma)
+        self.games_rated = 0
+
+    def rating(self, genome, role: str) -> Tuple[float, float]:
+        return self.ratings.get((genome_hash(genome), role), (self.mu, self.sigma))
+
+    def conservative(self, genome, role_weights: Dict[str, float]) -> float:
+        """Conservative skill estimate, averaged over roles by how often each is dealt"""
+        total = 0.0
+        for role, weight in role_weights.items():
+            mu, sigma = self.rating(genome, role)
+            total += weight * (mu - self.conservative_k * sigma)
+        return total
+
+    def update(self, lineup, roles: List[str], winning_team: Optional[str], rated_seats=None):
+        """
+        Update the ratings of a finished game's seats. Games without a winner
+        leave ratings unchanged. rated_seats limits which seats are stored,
+        e.g. to skip random filler genomes.
+        """
+        if winning_team is None:
+            return
+        if rated_seats is None:
+            rated_seats = range(len(lineup))
+
+        keys = [(genome_hash(genome), role) for genome, role in zip(lineup, roles)]
+        current = [self.ratings.get(key, (self.mu, self.sigma)) for key in keys]
+        variances = [sigma * sigma + self.tau * self.tau for _, sigma in current]
+        won = [(role == 'MAFIA') == (winning_team == 'MAFIA') for role in roles]
+
+        # Two-team TrueSkill update with team performance as the sum of its members
+        winner_mu = sum(mu for (mu, _), w in zip(current, won) if w)
+        loser_mu = sum(mu for (mu, _), w in zip(current, won) if not w)
+        c = math.sqrt(sum(variances) + len(lineup) * self.beta * self.beta)
+        t = (winner_mu - loser_mu) / c
+        v = _NORMAL.pdf(t) / max(_NORMAL.cdf(t), 1e-12)
+        w = v * (v + t)
+
+        for seat in rated_seats:
+            (mu, _), variance = current[seat], variances[seat]
+            sign = 1 if won[seat] else -1
+            mu += sign * variance / c * v
+            variance *= max(1 - variance / (c * c) * w, 1e-6)
+            self.ratings[keys[seat]] = (mu, math.sqrt(variance))
+        self.games_rated += 1
+
+    def matchmake(self, population, game_config) -> List[List[Tuple[Optional[int], str]]]:
+        """
+        Seat the population at tables for one round of games, as lists of
+        (population index, role) seats like RoleStratifiedScheduler.
+
+        The most uncertain genomes are grouped together, and within a table
+        roles are dealt rarest first to the seat whose rating for that role is
+        most uncertain, so each game spends its information where it is
+        needed most. Ties in uncertainty are broken at random, and each table
+        is shuffled so seat positions carry no information about roles. Seats
+        the population cannot fill hold None.
+        """
+        num_players = game_config.num_players
+        table_roles = game_config.get_roles()
+        role_order = sorted(dict.fromkeys(table_roles), key=table_roles.count)
+
+        def uncertainty(idx, role):
+            return self.rating(population[idx], role)[1]
+
+        # Shuffled first, so the stable sort breaks ties at random
+        order = list(range(len(population)))
+        random.shuffle(order)
+        order.sort(key=lambda i: -sum(uncertainty(i, role) ** 2 for role in ROLES))
+        tables = []
+        for start in range(0, len(order), num_players):
+            seats = order[start:start + num_players]
+            table = []
+            for role in role_order:
+                for _ in range(table_roles.count(role)):
+                    if seats:
+                        pick = max(seats, key=lambda i: uncertainty(i, role))
+                        seats.remove(pick)
+                        table.append((pick, role))
+                    else:
+                        table.append((None, role))
+            random.shuffle(table)
+            tables.append(table)
+        return tables
+
+    def role_weights(self, game_config) -> Dict[str, float]:
+        """Share of seats holding each role at a table"""
+        table_roles = game_config.get_roles()
+        return {role: table_roles.count(role) / len(table_roles) for role in dict.fromkeys(table_roles)}
@@ -0,0 +1,124 @@
+from modules import np,List,Tuple
+from constants import ROLES
+
+# Beliefs and trust are probabilities, stored as uint16 steps of 1/QUANT_SCALE
+QUANT_SCALE = 65535
+
+class BeliefRecording:
+    """
+    Per-day belief and trust history of one game.
+
+    Day k is stored as the entries of the quantized (observer, subject, role)
+    belief tensor and (observer, subject) trust matrix that changed since day
+    k - 1 - the first recorded day against zeros. day() rebuilds a full
+    tensor on request, continuing from the last rebuilt day when reading
+    forward, so stepping through a game costs one delta per day.
+    """
+    def __init__(self, num_players: int, roles: List[str], days: List[int], alive: List[np.ndarray],
+                 deltas: List[Tuple[np.ndarray, np.ndarray]]):
+        self.num_players = num_players
+        self.roles = roles
+        self.days = days          # Day number of each recorded day
+        self.alive = alive        # Alive mask at the end of each recorded day
+        self.deltas = deltas      # (flat indices, quantized values) of the entries changed that day
+        self._cached = None       # (position in days, quantized flat state)
+
+    def __len__(self):
+        return len(self.days)
+
+    def day(self, day: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Beliefs (observer x subject x role) and trust (observer x subject) at the end of a day"""
+        position = self.days.index(day)
+        if self._cached is not None and self._cached[0] <= position:
+            start, state = self._cached[0] + 1, self._cached[1]
+        else:
+            start, state = 0, np.zeros(5 * self.num_players ** 2, dtype=np.uint16)
+        for indices, values in self.deltas[start:position + 1]:
+            state[indices] = values
+        self._cached = (position, state)
+
+        n = self.num_players
+        values = state.astype(np.float32) / QUANT_SCALE
+        beliefs = values[:n * n * len(ROLES)].reshape(n, n, len(ROLES))
+        trust = values[n * n * len(ROLES):].reshape(n, n)
+        return beliefs, trust
+
+    def stored_bytes(self) -> int:
+        return sum(indices.nbytes + values.nbytes for indices, values in self.deltas)
+
+class BeliefRecorder:
+    """
+    Opt-in recorder of every player's beliefs and trust at the end of each day.
+
+    Attach it with game.recorder = BeliefRecorder(); the game then reports
+    each new game and each finished day. Only alive players are read, and
+    only changed entries are kept, quantized to uint16, so memory grows with
+    what players learned rather than with the table size times the days.
+    """
+    def __init__(self):
+        self.recordings = []
+        self._previous = None  # Quantized flat state of the current game's last recorded day
+
+    def begin_game(self, game):
+        self.recordings.append(BeliefRecording(game.num_players, [p.role for p in game.players], [], [], []))
+        self._previous = np.zeros(5 * game.num_players ** 2, dtype=np.uint16)
+
+    def record_day(self, game):
+        recording = self.recordings[-1]
+        n = game.num_players
+        state = self._previous.copy()
+        beliefs = state[:n * n * len(ROLES)].reshape(n, n, len(ROLES))
+        trust = state[n * n * len(ROLES):].reshape(n, n)
+        # Dead players' beliefs no longer change, so their rows carry over
+        for observer in game.alive_players:
+            player_beliefs = game.players[observer].beliefs
+            for role, index in ROLES.items():
+                beliefs[observer, :, index] = _quantize(player_beliefs.role_beliefs[role])
+            trust[observer] = _quantize(player_beliefs.trust_levels)
+
+        changed = np.flatnonzero(state != self._previous).astype(np.uint32)
+        recording.days.append(game.day)
+        recording.alive.append(np.isin(np.arange(n), game.alive_players))
+        recording.deltas.append((changed, state[changed]))
+        self._previous = state
+
+    def save(self, path: str):
+        """Write every recording to one compressed .npz file"""
+        deltas = [delta for recording in self.recordings for delta in recording.deltas]
+        np.savez_compressed(
+            path,
+            num_players=np.array([r.num_players for r in self.recordings], dtype=np.int32),
+            roles=np.array([ROLES[role] for r in self.recordings for role in r.roles], dtype=np.uint8),
+            days_per_game=np.array([len(r) for r in self.recordings], dtype=np.int32),
+            days=np.array([day for r in self.recordings for day in r.days], dtype=np.int32),
+            alive=np.concatenate([mask for r in self.recordings for mask in r.alive] or [np.zeros(0, bool)]),
+            delta_sizes=np.array([len(indices) for indices, _ in deltas], dtype=np.int64),
+            delta_indices=np.concatenate([indices for indices, _ in deltas] or [np.zeros(0, np.uint32)]),
+            delta_values=np.concatenate([values for _, values in deltas] or [np.zeros(0, np.uint16)]),
+        )
+
+def _quantize(values) -> np.ndarray:
+    return np.rint(np.clip(np.asarray(values, dtype=np.float64), 0.0, 1.0) * QUANT_SCALE).astype(np.uint16)
+
+def load_recordings(path: str) -> List[BeliefRecording]:
+    """Read the recordings saved by BeliefRecorder.save; tensors are rebuilt only when a day is read"""
+    role_names = {index: role for role, index in ROLES.items()}
+    with np.load(path) as data:
+        arrays = {key: data[key] for key in data.files}
+
+    delta_offsets = np.concatenate([[0], np.cumsum(arrays['delta_sizes'])])
+    recordings = []
+    role_start = day_start = alive_start = 0
+    for num_players, num_days in zip(arrays['num_players'].tolist(), arrays['days_per_game'].tolist()):
+        roles = [role_names[code] for code in arrays['roles'][role_start:role_start + num_players].tolist()]
+        days = arrays['days'][day_start:day_start + num_days].tolist()
+        alive = [arrays['alive'][alive_start + k * num_players:alive_start + (k + 1) * num_players]
+                 for k in range(num_days)]
+        deltas = [(arrays['delta_indices'][delta_offsets[k]:delta_offsets[k + 1]],
+                   arrays['delta_values'][delta_offsets[k]:delta_offsets[k + 1]])
+                  for k in range(day_start, day_start + num_days)]
+        recordings.append(BeliefRecording(num_players, roles, days, alive, deltas))
+        role_start += num_players
+        day_start += num_days
+        alive_start += num_days * num_players
+    return recordings
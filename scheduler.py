@@ -0,0 +1,93 @@
+from modules import random,math,np,List,Dict,Tuple,Optional
+from constants import ROLES
+
+class RoleStratifiedScheduler:
+    """
+    Seats the population at freshly shuffled tables for every round of games,
+    dealing roles so each genome plays mafia, detective, doctor and villager
+    in proportion to how often those roles appear at a table.
+    """
+    def __init__(self, num_players: int, normalize_fitness: bool = True):
+        self.num_players = num_players
+        self.normalize_fitness = normalize_fitness
+
+    def schedule(self, population_size: int, game_config, num_rounds: int) -> List[List[List[Tuple[Optional[int], str]]]]:
+        """
+        Build seating plans for num_rounds rounds of games.
+
+        Each round is a list of tables and each table is a list of
+        (population index, role) seats. Seats that the population cannot fill
+        hold None and are played by a fresh random genome.
+        """
+        table_roles = game_config.get_roles()
+        num_tables = math.ceil(population_size / self.num_players)
+
+        # How many times each individual has been dealt each role so far
+        exposure = {role: [0] * population_size for role in ROLES}
+
+        # Deal the rarest roles first so they go to whoever lacks them most
+        role_order = sorted(dict.fromkeys(table_roles), key=table_roles.count)
+
+        rounds = []
+        for _ in range(num_rounds):
+            unseated = list(range(population_size))
+            tables = [[] for _ in range(num_tables)]
+
+            for role in role_order:
+                # Every table has the same role slots
+                slots = [t for t in range(num_tables) for _ in range(table_roles.count(role))]
+
+                # Least exposed to this role first, ties broken randomly
+                random.shuffle(unseated)
+                unseated.sort(key=lambda i: exposure[role][i])
+                chosen, unseated = unseated[:len(slots)], unseated[len(slots):]
+                chosen += [None] * (len(slots) - len(chosen))
+
+                # Spread the chosen individuals over the tables at random
+                random.shuffle(chosen)
+                for table, individual in zip(slots, chosen):
+                    tables[table].append((individual, role))
+                    if individual is not None:
+                        exposure[role][individual] += 1
+
+            # Seat positions should carry no information about roles
+            for table in tables:
+                random.shuffle(table)
+            rounds.append(tables)
+
+        return rounds
+
+    def aggregate(self, results: List[Tuple[int, str, float]], population_size: int) -> Dict[int, float]:
+        """
+        Turn (population index, role, score) game results into fitness scores.
+
+        With normalize_fitness, each score is standardized against the other
+        scores for the same role and mapped back onto the overall score scale,
+        so a genome is not rewarded or punished for the roles it was dealt.
+        """
+        scores = np.array([score for _, _, score in results], dtype=float)
+
+        if self.normalize_fitness and len(scores) > 1:
+            overall_mean = scores.mean()
+            overall_std = scores.std()
+            roles = np.array([role for _, role, _ in results])
+            normalized = scores.copy()
+
+            for role in ROLES:
+                mask = roles == role
+                if not mask.any():
+                    continue
+                role_mean = scores[mask].mean()
+                role_std = scores[mask].std()
+                scale = overall_std / role_std if role_std > 0 else 1.0
+                normalized[mask] = overall_mean + (scores[mask] - role_mean) * scale
+            scores = normalized
+
+        totals = np.zeros(population_size)
+        counts = np.zeros(population_size)
+        for (individual, _, _), score in zip(results, scores):
+            totals[individual] += score
+            counts[individual] += 1
+
+        # Average scores across games
+        return {i: float(totals[i] / counts[i]) if counts[i] else 0.0 for i in range(population_size)}
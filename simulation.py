@@ -1,29 +1,100 @@
 from GeneticAlgorithm import GeneticAlgorithm
 from config import GameConfig
-from mafia import MafiaGame
+from evaluation import create_game
+from scheduler import RoleStratifiedScheduler
+from surrogate import SurrogateModel
+from diversity import EarlyStopping
+from opponent_pool import OpponentPool,EvaluationStore
+from ratings import RatingSystem
+from archive import GenomeArchive
+from telemetry import RunTelemetry
+from budget import TimeBudget
 from modules import time
+import os
 
-def run_simulation(generations=20, population_size=40, num_players=8, games_per_individual=3):
+def run_simulation(generations=20, population_size=40, num_players=8, games_per_individual=3,
+                   balanced_seating=False, surrogate_method=None, surrogate_oversample=4,
+                   surrogate_exploration=0.2, exact_beliefs=False, kernel_mode=False, compact_beliefs=False,
+                   steady_state=False, workers=None, patience=None, min_diversity=None,
+                   inject_diversity=False, opponent_pool_path=None, evaluation_store_path=None,
+                   skill_ratings=False, backend='serial', archive_path=None, telemetry_path=None,
+                   telemetry_interval=5.0, time_budget=None):
     """Run a complete simulation with visualization"""
     print("Initializing Genetic Algorithm for Mafia AI Agent...")
     
+    # Reshuffle tables and balance roles between games if requested
+    scheduler = RoleStratifiedScheduler(num_players) if balanced_seating else None
+    
+    # Pre-screen offspring with a surrogate fitness model if requested
+    surrogate = None
+    if surrogate_method:
+        surrogate = SurrogateModel(method=surrogate_method, oversample=surrogate_oversample,
+                                   exploration=surrogate_exploration)
+    
+    # Stop, or inject fresh genomes, once the population has converged
+    if inject_diversity and patience is None and min_diversity is None:
+        raise ValueError("inject_diversity needs patience or min_diversity to decide when to inject")
+    early_stopping = None
+    if patience is not None or min_diversity is not None:
+        early_stopping = EarlyStopping(patience=patience, min_diversity=min_diversity,
+                                       action='inject' if inject_diversity else 'stop')
+    
+    # Score against a fixed opponent pool, created on first use, with stored results
+    opponent_pool = evaluation_store = None
+    if opponent_pool_path:
+        if os.path.exists(opponent_pool_path):
+            opponent_pool = OpponentPool.load(opponent_pool_path)
+        else:
+            opponent_pool = OpponentPool.generate(max(32, num_players))
+            opponent_pool.save(opponent_pool_path)
+        evaluation_store = EvaluationStore(evaluation_store_path or ':memory:')
+    
+    # Export live progress to a directory if requested
+    telemetry = RunTelemetry(telemetry_path, interval=telemetry_interval) if telemetry_path else None
+    
     # Initialize genetic algorithm
-    ga = GeneticAlgorithm(population_size=population_size, num_players=num_players)
+    ga = GeneticAlgorithm(population_size=population_size, num_players=num_players,
+                          scheduler=scheduler, surrogate=surrogate, early_stopping=early_stopping,
+                          opponent_pool=opponent_pool, evaluation_store=evaluation_store,
+                          rating_system=RatingSystem() if skill_ratings else None,
+                          backend=backend, workers=workers,
+                          archive=GenomeArchive(archive_path) if archive_path else None,
+                          telemetry=telemetry,
+                          time_budget=TimeBudget(time_budget) if time_budget else None)
     
     # Set up game configuration
-    game_config = GameConfig(num_players=num_players)
+    game_config = GameConfig(num_players=num_players, exact_beliefs=exact_beliefs,
+                             kernel_mode=kernel_mode, compact_beliefs=compact_beliefs)
     
     # Evolve population
     start_time = time.time()
-    best_population, best_fitness, avg_fitness = ga.evolve(
-        num_generations=generations, 
-        games_per_individual=games_per_individual,
-        game_config=game_config
-    )
+    try:
+        if steady_state:
+            # Same evaluation budget as the generational run, without generation barriers
+            best_population, best_fitness, avg_fitness = ga.evolve_async(
+                num_evaluations=generations * population_size,
+                games_per_individual=games_per_individual,
+                game_config=game_config,
+                workers=workers
+            )
+        else:
+            best_population, best_fitness, avg_fitness = ga.evolve(
+                num_generations=generations, 
+                games_per_individual=games_per_individual,
+                game_config=game_config
+            )
+    finally:
+        if telemetry:
+            telemetry.close()
     end_time = time.time()
     
     print(f"Evolution completed in {end_time - start_time:.2f} seconds")
     
+    if not best_fitness:
+        # A time budget can run out before the first generation is evaluated
+        print("No generation was completed, so there is no evolved population to report")
+        return best_population, best_fitness, avg_fitness, []
+    
     # Display resulting traits of best individual
     best_idx = best_fitness.index(max(best_fitness))
     best_individual = best_population[0]  # First individual due to elitism
@@ -34,7 +105,7 @@ def run_simulation(generations=20, population_size=40, num_players=8, games_per_
     
     # Run a showcase game with some of the best evolved agents
     print("\nRunning showcase game with evolved agents...")
-    showcase_game = MafiaGame(game_config)
+    showcase_game = create_game(game_config)
     showcase_game.initialize_game(best_population[:num_players])
     winning_team, days_played = showcase_game.run_game()
     
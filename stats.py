@@ -0,0 +1,21 @@
+from modules import np,math
+from statistics import NormalDist
+
+def rank_correlation(a, b) -> float:
+    """Spearman rank correlation between two score vectors"""
+    rank_a = np.argsort(np.argsort(a))
+    rank_b = np.argsort(np.argsort(b))
+    if len(rank_a) < 2 or rank_a.std() == 0 or rank_b.std() == 0:
+        return 0.0
+    return float(np.corrcoef(rank_a, rank_b)[0, 1])
+
+def wilson_interval(successes: int, trials: int, confidence: float = 0.95):
+    """Wilson score confidence interval for a binomial proportion"""
+    if trials == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    centre = (p + z * z / (2 * trials)) / denominator
+    half_width = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(0.0, centre - half_width), min(1.0, centre + half_width)
@@ -0,0 +1,39 @@
+from traits import GeneticTraits
+
+# Investigation strategies of a detective
+INVESTIGATE_SUSPICIOUS, INVESTIGATE_RANDOM = range(2)
+
+# Protection strategies of a doctor
+PROTECT_SELF, PROTECT_VALUABLE, PROTECT_AT_RISK = range(3)
+
+class CompiledStrategy:
+    """
+    Decision table compiled from a genome when a player is seated.
+
+    The continuous strategy traits become integer buckets, and the traits
+    compared against random draws are kept as plain floats, so the decision
+    methods branch on small ints instead of re-reading and re-comparing
+    traits on every call. Draws still happen where Player makes them, which
+    keeps games identical to the uncompiled rules under a fixed seed.
+    """
+    __slots__ = ('vote_randomness', 'accusation_threshold', 'false_accusation_rate',
+                 'deception_skill', 'investigation', 'protection')
+
+    def __init__(self, traits: GeneticTraits):
+        self.vote_randomness = traits.vote_randomness
+        self.accusation_threshold = traits.accusation_threshold
+        self.false_accusation_rate = traits.false_accusation_rate
+        self.deception_skill = traits.deception_skill
+
+        # detective_investigation_strategy: 0 = suspicious first, 1 = random
+        self.investigation = (INVESTIGATE_SUSPICIOUS if traits.detective_investigation_strategy < 0.5
+                              else INVESTIGATE_RANDOM)
+
+        # doctor_protection_strategy: self below 0.3, valuable players below 0.7, else whoever is at risk
+        strategy = traits.doctor_protection_strategy
+        if strategy < 0.3:
+            self.protection = PROTECT_SELF
+        elif strategy < 0.7:
+            self.protection = PROTECT_VALUABLE
+        else:
+            self.protection = PROTECT_AT_RISK
@@ -0,0 +1,93 @@
+from modules import np,random,List,Tuple
+from stats import rank_correlation
+
+class SurrogateModel:
+    """
+    Cheap fitness predictor over the trait vector, trained online on genomes
+    that have already been simulated. Used by GeneticAlgorithm to pre-screen
+    an oversampled pool of offspring so only the most promising are simulated.
+    """
+    def __init__(self, method='ridge', alpha=1.0, k=5, oversample=4, exploration=0.2,
+                 min_samples=20, max_history=5000):
+        if method not in ('ridge', 'knn'):
+            raise ValueError(f"Unknown surrogate method: {method}")
+        self.method = method
+        self.alpha = alpha                # Ridge regularization strength
+        self.k = k                        # Neighbours averaged by k-NN
+        self.oversample = oversample      # Candidates generated per simulated child
+        self.exploration = exploration    # Fraction of children picked at random
+        self.min_samples = min_samples    # Samples needed before screening starts
+        self.max_history = max_history    # Oldest samples are dropped past this
+
+        self.samples = np.empty((0, 0))
+        self.targets = np.empty(0)
+        self._mean = None
+        self._scale = None
+        self._weights = None
+        self._bias = 0.0
+
+    @property
+    def ready(self) -> bool:
+        """Whether enough samples have been seen to make useful predictions"""
+        return len(self.targets) >= self.min_samples
+
+    def add(self, genomes, fitness: List[float]):
+        """Add evaluated genomes and refit the model"""
+        vectors = np.array([g.to_vector() for g in genomes], dtype=float)
+        if self.samples.size:
+            vectors = np.vstack([self.samples, vectors])
+        self.samples = vectors[-self.max_history:]
+        self.targets = np.concatenate([self.targets, np.asarray(fitness, dtype=float)])[-self.max_history:]
+        self._fit()
+
+    def _fit(self):
+        """Standardize the samples and fit the ridge weights"""
+        self._mean = self.samples.mean(axis=0)
+        self._scale = self.samples.std(axis=0)
+        self._scale[self._scale == 0] = 1.0
+
+        if self.method == 'ridge':
+            x = (self.samples - self._mean) / self._scale
+            self._bias = self.targets.mean()
+            y = self.targets - self._bias
+            gram = x.T @ x + self.alpha * np.eye(x.shape[1])
+            self._weights = np.linalg.solve(gram, x.T @ y)
+
+    def predict(self, genomes) -> np.ndarray:
+        """Predict the fitness of each genome"""
+        x = (np.array([g.to_vector() for g in genomes], dtype=float) - self._mean) / self._scale
+
+        if self.method == 'ridge':
+            return x @ self._weights + self._bias
+
+        # k-NN - average fitness of the closest evaluated genomes
+        known = (self.samples - self._mean) / self._scale
+        distances = ((x[:, None, :] - known[None, :, :]) ** 2).sum(axis=2)
+        k = min(self.k, len(known))
+        nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        return self.targets[nearest].mean(axis=1)
+
+    def screen(self, candidates, count: int) -> Tuple[list, List[float]]:
+        """
+        Pick count candidates to simulate - the top predicted ones plus an
+        exploration share drawn at random from the rest.
+        Returns the picked candidates and their predicted fitness.
+        """
+        predictions = self.predict(candidates)
+        order = list(np.argsort(-predictions))
+
+        explore_count = min(int(round(count * self.exploration)), count)
+        picked = order[:count - explore_count]
+        rest = order[count - explore_count:]
+        picked += random.sample(rest, min(explore_count, len(rest)))
+
+        return [candidates[i] for i in picked], [float(predictions[i]) for i in picked]
+
+    @staticmethod
+    def accuracy(predicted: List[float], actual: List[float]) -> Tuple[float, float]:
+        """Return the rank correlation and mean absolute error of predictions"""
+        predicted = np.asarray(predicted, dtype=float)
+        actual = np.asarray(actual, dtype=float)
+        if not len(predicted):
+            return 0.0, 0.0
+        return rank_correlation(predicted, actual), float(np.abs(predicted - actual).mean())
@@ -0,0 +1,166 @@
+from modules import List,Dict,Optional
+from itertools import product
+import hashlib
+import json
+import os
+import sqlite3
+from concurrent.futures import as_completed
+from GeneticAlgorithm import GeneticAlgorithm
+from config import GameConfig
+from evaluation import play_games,make_executor,seeded_random
+
+# Grid keys routed to each part of a sweep point - anything else goes to GeneticAlgorithm
+GAME_CONFIG_KEYS = ('num_players', 'mafia_ratio', 'detective_prob', 'doctor_prob', 'exact_beliefs',
+                    'kernel_mode', 'compact_beliefs')
+EVOLVE_KEYS = ('generations', 'games_per_individual')
+
+DEFAULT_POINT = {
+    'num_players': 8,
+    'population_size': 32,
+    'generations': 10,
+    'games_per_individual': 3,
+}
+
+_code_version = None
+
+def code_version() -> str:
+    """Hash of every module in the package, so cached results expire when the code changes"""
+    global _code_version
+    if _code_version is None:
+        digest = hashlib.sha256()
+        package_dir = os.path.dirname(os.path.abspath(__file__))
+        for name in sorted(os.listdir(package_dir)):
+            if name.endswith('.py'):
+                with open(os.path.join(package_dir, name), 'rb') as f:
+                    digest.update(name.encode())
+                    digest.update(f.read())
+        _code_version = digest.hexdigest()[:16]
+    return _code_version
+
+def expand_grid(grid: Dict[str, list], base: Optional[Dict] = None) -> List[Dict]:
+    """Expand a parameter grid into the list of points it spans, on top of base parameters"""
+    point_base = dict(DEFAULT_POINT, **(base or {}))
+    keys = sorted(grid)
+    return [dict(point_base, **dict(zip(keys, values))) for values in product(*(grid[k] for k in keys))]
+
+def point_key(point: Dict, seed: int, balance_games: int) -> str:
+    """Cache key for a sweep point"""
+    payload = json.dumps({'point': point, 'seed': seed, 'balance_games': balance_games,
+                          'code': code_version()}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def run_point(point: Dict, seed: int, balance_games: int) -> Dict:
+    """Evolve a population for one sweep point and measure win balance with the result"""
+    config_params = {k: v for k, v in point.items() if k in GAME_CONFIG_KEYS}
+    ga_params = {k: v for k, v in point.items() if k not in GAME_CONFIG_KEYS and k not in EVOLVE_KEYS}
+    game_config = GameConfig(**config_params)
+
+    with seeded_random(seed):
+        ga = GeneticAlgorithm(num_players=game_config.num_players, verbose=False, **ga_params)
+        population, best_history, avg_history = ga.evolve(
+            num_generations=point['generations'],
+            games_per_individual=point['games_per_individual'],
+            game_config=game_config
+        )
+
+    # Win balance of the evolved agents under this config
+    games = play_games(game_config, population[:game_config.num_players], balance_games, seed=seed)
+    winners = [winning_team for winning_team, _, _ in games]
+
+    return {
+        'point': point,
+        'seed': seed,
+        'mafia_win_rate': winners.count('MAFIA') / balance_games,
+        'town_win_rate': winners.count('TOWN') / balance_games,
+        'draw_rate': winners.count(None) / balance_games,
+        'mean_days': sum(days for _, days, _ in games) / balance_games,
+        'best_fitness': best_history,
+        'avg_fitness': avg_history,
+    }
+
+class SweepCache:
+    """SQLite store of finished sweep points keyed by point_key"""
+    def __init__(self, path: str):
+        self.connection = sqlite3.connect(path)
+        self.connection.execute('CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, result TEXT)')
+
+    def get(self, key: str) -> Optional[Dict]:
+        row = self.connection.execute('SELECT result FROM results WHERE key = ?', (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key: str, result: Dict):
+        self.connection.execute('INSERT OR REPLACE INTO results VALUES (?, ?)', (key, json.dumps(result)))
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+def run_sweep(grid: Dict[str, list], base: Optional[Dict] = None, seeds=(0,), balance_games: int = 200,
+              workers: Optional[int] = None, cache_path: str = 'sweep_cache.sqlite') -> List[Dict]:
+    """
+    Run every point of a parameter grid for every seed, across a process pool
+    when workers > 1. Finished points are cached on disk, so repeating or
+    extending a sweep only runs the new points.
+    """
+    cache = SweepCache(cache_path)
+    jobs = [(point, seed) for point in expand_grid(grid, base) for seed in seeds]
+    results = [None] * len(jobs)
+    pending = []
+
+    for i, (point, seed) in enumerate(jobs):
+        cached = cache.get(point_key(point, seed, balance_games))
+        if cached:
+            results[i] = cached
+        else:
+            pending.append(i)
+
+    print(f"Sweep: {len(jobs)} points, {len(jobs) - len(pending)} cached, {len(pending)} to run")
+
+    executor = make_executor(workers, preload=('sweep',))
+    try:
+        if executor:
+            futures = {executor.submit(run_point, jobs[i][0], jobs[i][1], balance_games): i for i in pending}
+            finished = ((futures[f], f.result()) for f in as_completed(futures))
+        else:
+            finished = ((i, run_point(jobs[i][0], jobs[i][1], balance_games)) for i in pending)
+
+        for done, (i, result) in enumerate(finished, 1):
+            point, seed = jobs[i]
+            cache.put(point_key(point, seed, balance_games), result)
+            results[i] = result
+            print(f"  [{done}/{len(pending)}] finished {point} seed={seed}")
+    finally:
+        if executor:
+            executor.shutdown()
+        cache.close()
+
+    return results
+
+def sparkline(values: List[float]) -> str:
+    """Render a fitness curve as a row of block characters"""
+    blocks = ' ▁▂▃▄▅▆▇█'
+    if not values:
+        return ''
+    low, high = min(values), max(values)
+    if high == low:
+        return blocks[4] * len(values)
+    return ''.join(blocks[1 + int((v - low) / (high - low) * 7)] for v in values)
+
+def format_summary(results: List[Dict], grid_keys: Optional[List[str]] = None) -> str:
+    """Format sweep results as a table of win balance and best-fitness curves"""
+    if not results:
+        return "No sweep results"
+    if grid_keys is None:
+        # Show only the parameters that vary across the sweep
+        grid_keys = sorted(k for k in results[0]['point']
+                           if len({json.dumps(r['point'][k]) for r in results}) > 1)
+
+    header = ''.join(f"{k:>16}" for k in grid_keys)
+    lines = [f"{header}{'seed':>6}{'mafia%':>8}{'town%':>8}{'draw%':>8}{'days':>6}{'best':>8}  curve"]
+    for r in results:
+        params = ''.join(f"{r['point'][k]!s:>16}" for k in grid_keys)
+        best = f"{r['best_fitness'][-1]:>8.1f}" if r['best_fitness'] else f"{'-':>8}"
+        lines.append(f"{params}{r['seed']:>6}{100 * r['mafia_win_rate']:>8.1f}{100 * r['town_win_rate']:>8.1f}"
+                     f"{100 * r['draw_rate']:>8.1f}{r['mean_days']:>6.1f}{best}"
+                     f"  {sparkline(r['best_fitness'])}")
+    return '\n'.join(lines)
@@ -0,0 +1,186 @@
+from modules import time,Dict,Optional
+import json
+import os
+import sys
+import threading
+
+# Prometheus metric name, type and help text of each snapshot field
+METRICS = {
+    'games': ('mafia_games_total', 'counter', "Games completed"),
+    'games_per_second': ('mafia_games_per_second', 'gauge', "Games completed per second since the last snapshot"),
+    'mean_days': ('mafia_mean_days_per_game', 'gauge', "Mean days played per completed game"),
+    'completed': ('mafia_progress_completed', 'gauge', "Generations, or steady-state evaluations, completed"),
+    'total': ('mafia_progress_total', 'gauge', "Generations, or steady-state evaluations, planned"),
+    'generation_seconds': ('mafia_generation_seconds', 'gauge', "Wall time of the last generation"),
+    'eta_seconds': ('mafia_eta_seconds', 'gauge', "Estimated seconds until the run completes"),
+    'worker_utilization': ('mafia_worker_utilization', 'gauge', "Share of worker time spent playing games since the last snapshot"),
+    'best_fitness': ('mafia_best_fitness', 'gauge', "Best fitness of the last generation"),
+    'avg_fitness': ('mafia_avg_fitness', 'gauge', "Average fitness of the last generation"),
+    'rss_bytes': ('mafia_rss_bytes', 'gauge', "Resident memory of the evolving process"),
+    'elapsed_seconds': ('mafia_elapsed_seconds', 'gauge', "Seconds since the run started"),
+}
+
+class RunTelemetry:
+    """
+    Live progress of an evolution run, exported to a directory.
+
+    GeneticAlgorithm and MafiaGame report finished games, worker busy time
+    and run progress by bumping counters. At most once per interval the
+    counters are copied into a snapshot, which a background thread appends
+    to telemetry.jsonl and writes to metrics.prom in the Prometheus text
+    format, so file writes never hold up the games. If the writer falls
+    behind, only the newest snapshot is kept.
+    """
+    def __init__(self, path: str, interval: float = 5.0, workers: int = 1):
+        self.path = path
+        self.interval = interval
+        self.workers = workers
+        os.makedirs(path, exist_ok=True)
+        self.jsonl_path = os.path.join(path, 'telemetry.jsonl')
+        self.prom_path = os.path.join(path, 'metrics.prom')
+
+        self.games = 0
+        self.days = 0
+        self.busy_seconds = 0.0   # Time workers spent playing games
+        self.completed = 0
+        self.total = None
+        self.generation_seconds = None
+        self.best_fitness = None
+        self.avg_fitness = None
+
+        self.start_time = time.perf_counter()
+        self._last = (self.start_time, 0, 0.0)  # Time, games and busy seconds of the last snapshot
+        self._last_completed = 0
+        self._next_snapshot = self.start_time + interval
+
+        self._pending = None
+        self._closed = False
+        self._condition = threading.Condition()
+        self._writer = threading.Thread(target=self._write_loop, name='telemetry-writer', daemon=True)
+        self._writer.start()
+
+    # -- Reporting ---------------------------------------------------------
+
+    def record_game(self, days: int):
+        """One game finished after the given number of days"""
+        self.games += 1
+        self.days += days
+        if time.perf_counter() >= self._next_snapshot:
+            self.publish()
+
+    def record_games(self, count: int, days: int, busy_seconds: float = 0.0):
+        """A batch of games played elsewhere, e.g. on a worker, finished"""
+        self.games += count
+        self.days += days
+        self.busy_seconds += busy_seconds
+        if time.perf_counter() >= self._next_snapshot:
+            self.publish()
+
+    def record_busy(self, seconds: float):
+        self.busy_seconds += seconds
+
+    def record_progress(self, completed: int, total: Optional[int], best_fitness: float, avg_fitness: float,
+                        generation_seconds: Optional[float] = None):
+        """Progress through the run - generations, or evaluations of a steady-state run"""
+        self.completed = completed
+        self.total = total
+        self.best_fitness = best_fitness
+        self.avg_fitness = avg_fitness
+        if generation_seconds is not None:
+            self.generation_seconds = generation_seconds
+        if time.perf_counter() >= self._next_snapshot:
+            self.publish()
+
+    # -- Snapshots ---------------------------------------------------------
+
+    def snapshot(self) -> Dict:
+        """Current values of every metric except memory, which the writer reads"""
+        now = time.perf_counter()
+        last_time, last_games, last_busy = self._last
+        window = now - last_time
+        elapsed = now - self.start_time
+
+        eta = None
+        if self.total is not None and self.completed:
+            eta = elapsed / self.completed * max(self.total - self.completed, 0)
+        return {
+            'time': time.time(),
+            'elapsed_seconds': elapsed,
+            'games': self.games,
+            'games_per_second': (self.games - last_games) / window if window > 0 else None,
+            'mean_days': self.days / self.games if self.games else None,
+            'completed': self.completed,
+            'total': self.total,
+            'generation_seconds': self.generation_seconds,
+            'eta_seconds': eta,
+            'worker_utilization': (min(1.0, (self.busy_seconds - last_busy) / (window * self.workers))
+                                   if window > 0 and self.workers else None),
+            'best_fitness': self.best_fitness,
+            'avg_fitness': self.avg_fitness,
+        }
+
+    def publish(self):
+        """Take a snapshot now and hand it to the writer, unless nothing happened since the last one"""
+        _, last_games, last_busy = self._last
+        if (self.games, self.busy_seconds, self.completed) == (last_games, last_busy,
+                                                                              self._last_completed):
+            return
+        snapshot = self.snapshot()
+        now = time.perf_counter()
+        self._last = (now, self.games, self.busy_seconds)
+        self._last_completed = self.completed
+        self._next_snapshot = now + self.interval
+        with self._condition:
+            self._pending = snapshot
+            self._condition.notify()
+
+    def close(self):
+        """Publish a final snapshot and wait for it to be written"""
+        if self._closed:
+            return
+        self.publish()
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._writer.join()
+
+    # -- Writing -----------------------------------------------------------
+
+    def _write_loop(self):
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                snapshot, self._pending = self._pending, None
+                if snapshot is None:
+                    return
+            snapshot['rss_bytes'] = resident_memory()
+            self._write(snapshot)
+
+    def _write(self, snapshot: Dict):
+        with open(self.jsonl_path, 'a') as f:
+            f.write(json.dumps(snapshot) + '\n')
+
+        lines = []
+        for key, (name, kind, help_text) in METRICS.items():
+            if snapshot.get(key) is not None:
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {snapshot[key]}"]
+        # Written aside and renamed, so scrapers never read a partial file
+        temporary = self.prom_path + '.tmp'
+        with open(temporary, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(temporary, self.prom_path)
+
+def resident_memory() -> int:
+    """Resident set size of this process in bytes, or its peak where the current size is unavailable"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except ImportError:
+        return 0
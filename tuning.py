@@ -0,0 +1,185 @@
+from modules import random,List,Dict,Optional
+from concurrent.futures import as_completed
+from GeneticAlgorithm import GeneticAlgorithm
+from config import GameConfig
+from evaluation import make_executor
+from opponent_pool import OpponentPool,evaluate_against_pool
+from sweep import sparkline
+
+# Ranges the hyperparameters are drawn from - tournament_size is an integer range
+SEARCH_SPACE = {
+    'elitism_rate': (0.05, 0.4),
+    'mutation_rate': (0.02, 0.4),
+    'mutation_strength': (0.05, 0.5),
+    'tournament_size': (2, 8),
+}
+
+def sample_params(rng, population_size: int, space: Dict = SEARCH_SPACE) -> Dict:
+    """Draw one hyperparameter setting from the search space"""
+    params = {}
+    for name, (low, high) in space.items():
+        if isinstance(low, int) and isinstance(high, int):
+            params[name] = rng.randint(low, high)
+        else:
+            if name == 'elitism_rate':
+                # Trials are scored by their elites, so keep at least one
+                low = max(low, 1 / population_size)
+            params[name] = rng.uniform(low, high)
+    return params
+
+def rung_generations(min_generations: int, max_generations: int, eta: int) -> List[int]:
+    """Generation checkpoints of successive halving, growing by eta up to max_generations"""
+    rungs = [min_generations]
+    while rungs[-1] < max_generations:
+        rungs.append(min(rungs[-1] * eta, max_generations))
+    return rungs
+
+def planned_cost(num_trials: int, rungs: List[int], eta: int) -> int:
+    """Generations run by successive halving over num_trials trials"""
+    cost = 0
+    survivors = num_trials
+    previous = 0
+    for generations in rungs:
+        cost += survivors * (generations - previous)
+        previous = generations
+        survivors = max(1, survivors // eta)
+    return cost
+
+def run_trial_segment(params: Dict, population_size: int, game_config: GameConfig, games_per_individual: int,
+                      seed: int, state: Optional[Dict], generations: int, pool: OpponentPool,
+                      pool_games: int) -> Dict:
+    """
+    Continue one trial's GA run for a number of generations and score its elites
+    against the opponent pool. The global random state is carried in the trial
+    state, so a run split over rungs evolves exactly as one uninterrupted run.
+    """
+    saved = random.getstate()
+    try:
+        # Only the first segment keeps the initial population drawn from the trial's seed
+        random.seed(seed)
+        ga = GeneticAlgorithm(population_size=population_size, num_players=game_config.num_players,
+                              verbose=False, **params)
+        if state is not None:
+            ga.population = state['population']
+            ga.best_fitness_history = list(state['best_fitness'])
+            ga.avg_fitness_history = list(state['avg_fitness'])
+            random.setstate(state['random_state'])
+
+        ga.evolve(generations, games_per_individual, game_config)
+        random_state = random.getstate()
+    finally:
+        random.setstate(saved)
+
+    # Elites lead the next population, ranked by the last generation's fitness
+    elite_count = max(1, int(population_size * params['elitism_rate']))
+    elites = ga.population[:min(elite_count, 2)]
+    scores = evaluate_against_pool(elites, pool, game_config, pool_games)
+    return {
+        'population': ga.population,
+        'best_fitness': ga.best_fitness_history,
+        'avg_fitness': ga.avg_fitness_history,
+        'random_state': random_state,
+        'pool_score': sum(scores.values()) / len(scores),
+    }
+
+def run_search(budget: int = 240, min_generations: int = 3, max_generations: int = 27, eta: int = 3,
+               num_trials: Optional[int] = None, population_size: int = 16, games_per_individual: int = 3,
+               game_config: Optional[GameConfig] = None, pool_size: int = 32, pool_games: int = 16,
+               workers: Optional[int] = None, seed: int = 0, space: Dict = SEARCH_SPACE,
+               verbose: bool = True) -> List[Dict]:
+    """
+    Successive-halving search over GA hyperparameters.
+
+    Every trial runs min_generations, then only the best 1/eta of the trials
+    by pool score continue to the next checkpoint, eta times further on, up to
+    max_generations. budget is the total number of GA generations the search
+    may run; the number of trials is the most that fit it, unless given.
+    Scores come from each trial's elites playing a fixed seeded opponent pool,
+    so they are comparable between trials. Segments of a rung run in parallel
+    processes when workers > 1. Returns the trials best first.
+    """
+    game_config = game_config or GameConfig()
+    rungs = rung_generations(min_generations, max_generations, eta)
+    if num_trials is None:
+        num_trials = 1
+        while planned_cost(num_trials + 1, rungs, eta) <= budget:
+            num_trials += 1
+    if planned_cost(num_trials, rungs, eta) > budget:
+        raise ValueError(f"{num_trials} trials need {planned_cost(num_trials, rungs, eta)} generations, "
+                         f"more than the budget of {budget}")
+
+    rng = random.Random(seed)
+    pool = OpponentPool.generate(pool_size, seed=seed, name='tuning')
+    trials = [{'trial': i, 'params': sample_params(rng, population_size, space), 'seed': rng.randrange(2**32),
+               'state': None, 'generations': 0, 'pool_scores': [], 'pruned_at': None}
+              for i in range(num_trials)]
+
+    def log(message):
+        if verbose:
+            print(message)
+
+    log(f"Search: {num_trials} trials, checkpoints at {rungs} generations, "
+        f"{planned_cost(num_trials, rungs, eta)} of {budget} generations budgeted")
+
+    active = list(trials)
+    executor = make_executor(workers, preload=('tuning',))
+    try:
+        for rung, generations in enumerate(rungs):
+            def segment_args(trial):
+                return (trial['params'], population_size, game_config, games_per_individual, trial['seed'],
+                        trial['state'], generations - trial['generations'], pool, pool_games)
+
+            if executor:
+                futures = {executor.submit(run_trial_segment, *segment_args(trial)): trial for trial in active}
+                finished = ((futures[f], f.result()) for f in as_completed(futures))
+            else:
+                finished = ((trial, run_trial_segment(*segment_args(trial))) for trial in active)
+
+            for trial, state in finished:
+                trial['state'] = state
+                trial['generations'] = generations
+                trial['pool_scores'].append(state['pool_score'])
+
+            active.sort(key=lambda t: t['pool_scores'][-1], reverse=True)
+            log(f"  Rung {rung + 1}: {len(active)} trials at {generations} generations, "
+                f"best pool score {active[0]['pool_scores'][-1]:.2f}")
+            if rung < len(rungs) - 1:
+                keep = max(1, len(active) // eta)
+                for trial in active[keep:]:
+                    trial['pruned_at'] = generations
+                active = active[:keep]
+    finally:
+        if executor:
+            executor.shutdown()
+
+    results = []
+    for trial in trials:
+        state = trial['state']
+        results.append({
+            'trial': trial['trial'],
+            'params': trial['params'],
+            'seed': trial['seed'],
+            'generations': trial['generations'],
+            'pruned_at': trial['pruned_at'],
+            'pool_score': trial['pool_scores'][-1],
+            'pool_scores': trial['pool_scores'],
+            'best_fitness': state['best_fitness'],
+            'avg_fitness': state['avg_fitness'],
+        })
+    # Trials that went further rank first, then by their last pool score
+    results.sort(key=lambda r: (r['generations'], r['pool_score']), reverse=True)
+    return results
+
+def format_search(results: List[Dict]) -> str:
+    """Format search results as a ranked table with best-fitness learning curves"""
+    if not results:
+        return "No search results"
+    names = list(results[0]['params'])
+    header = ''.join(f"{name:>19}" for name in names)
+    lines = [f"{'rank':>4}{'trial':>6}{header}{'gens':>6}{'pool':>8}  curve"]
+    for rank, r in enumerate(results, 1):
+        params = ''.join(f"{r['params'][name]:>19.3f}" if isinstance(r['params'][name], float)
+                         else f"{r['params'][name]:>19}" for name in names)
+        lines.append(f"{rank:>4}{r['trial']:>6}{params}{r['generations']:>6}{r['pool_score']:>8.2f}"
+                     f"  {sparkline(r['best_fitness'])}")
+    return '\n'.join(lines)